@@ -0,0 +1,59 @@
+"""複数のPOファイルの並列読み込みのベンチマーク
+
+複数のロケールファイルについて、読み込み・check_duplicates・format・統計を
+1ファイルずつ順に行う場合と、summarize_filesで並列に行う場合の実行時間を
+比較します。
+
+使い方:
+    python benchmarks/bench_batch.py [ファイル数] [1ファイルのエントリ数]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from po_samples import write_po_file  # noqa: E402
+
+from sgpo import fast_pofile, summarize_files  # noqa: E402
+
+DEFAULT_FILES = 32
+DEFAULT_ENTRIES = 20_000
+
+
+def run_sequential(paths):
+    for path in paths:
+        po = fast_pofile(path)
+        po.check_duplicates()
+        po.translated_entries()
+        po.fuzzy_entries()
+        po.format()
+
+
+def main() -> None:
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FILES
+    entries = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ENTRIES
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = [os.path.join(tmpdir, f"locale_{i}.po") for i in range(files)]
+        for path in paths:
+            write_po_file(path, entries)
+
+        start = time.perf_counter()
+        run_sequential(paths)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        summaries = list(summarize_files(paths))
+        parallel = time.perf_counter() - start
+
+    print(f"{files}ファイル x {entries}件 (CPU {os.cpu_count()})")
+    print(f"  順次処理        {sequential:.3f}秒")
+    print(f"  summarize_files {parallel:.3f}秒 ({len(summaries)}件の集計)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""エントリの一括追加（InMemoryEntryStore）のベンチマーク
+
+索引とトリガーを有効にしたまま追加するadd_entries_bulkと、
+索引の作成などを読み込みの後にまとめて行うbulk_loadの実行時間を比較します。
+
+使い方:
+    python benchmarks/bench_bulk_load.py [エントリ数 ...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from sgpo_editor.models.database import InMemoryEntryStore  # noqa: E402
+
+DEFAULT_SIZES = (100_000,)
+
+
+def generate_entries(count):
+    """POファイルを読み込んだときと同じ形式のエントリを生成する"""
+    for i in range(count):
+        yield {
+            "key": str(i),
+            "msgctxt": f"dlg{i // 50}.item{i}",
+            "msgid": f"Source text {i}",
+            "msgstr": f"翻訳 {i}" if i % 3 else "",
+            "flags": ["fuzzy"] if i % 7 == 0 else [],
+            "references": [f"src/dialogs/dialog{i // 50}.java:{i % 500}"],
+            "position": i,
+        }
+
+
+def measure(method_name: str, count: int) -> float:
+    """空のデータベースにエントリを追加する時間（秒）を返す"""
+    store = InMemoryEntryStore()
+    start = time.perf_counter()
+    getattr(store, method_name)(generate_entries(count))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for count in sizes:
+        print(f"{count}件のエントリ")
+        for method_name in ("add_entries_bulk", "bulk_load"):
+            print(f"  {method_name:<16} {measure(method_name, count):6.2f}秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""POファイル差分のベンチマーク
+
+SGPOFile.diff（DiffResultを生成）、iter_diff（軽量レコード）、
+diff_summary（件数のみ）の実行時間を比較します。
+
+使い方:
+    python benchmarks/bench_diff.py [エントリ数 ...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from po_samples import make_po_text  # noqa: E402
+
+from sgpo import fast_pofile_from_text  # noqa: E402
+
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+def measure(func, *args, repeat: int = 3) -> float:
+    """関数の実行時間（最小値）を秒単位で返す"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        text = make_po_text(size)
+        old = fast_pofile_from_text(text)
+        new = fast_pofile_from_text(text)
+        # 約3割のエントリの翻訳を変更する
+        for i, entry in enumerate(new):
+            if i % 3 == 0:
+                entry.msgstr += " (changed)"
+
+        diff_time = measure(old.diff, new)
+        iter_time = measure(lambda: sum(1 for _ in old.iter_diff(new)))
+        summary_time = measure(old.diff_summary, new)
+        print(
+            f"{size:>8}件: diff {diff_time:.3f}秒, iter_diff {iter_time:.3f}秒, "
+            f"diff_summary {summary_time:.3f}秒"
+        )
+
+
+if __name__ == "__main__":
+    main()
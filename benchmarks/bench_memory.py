@@ -0,0 +1,58 @@
+"""POファイルを読み込んだときのメモリ使用量のベンチマーク
+
+polibによる読み込み、高速パーサー、高速パーサー（CompactEntry）のそれぞれで
+SGPOFileを作成し、読み込み後に保持されているメモリ量をtracemallocで計測します。
+
+使い方:
+    python benchmarks/bench_memory.py [エントリ数 ...]
+"""
+
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from po_samples import make_po_text  # noqa: E402
+
+from sgpo import fast_pofile_from_text, pofile_from_text  # noqa: E402
+
+DEFAULT_SIZES = (100_000,)
+
+LOADERS = (
+    ("polib", pofile_from_text),
+    ("高速パーサー", fast_pofile_from_text),
+    ("CompactEntry", lambda text: fast_pofile_from_text(text, compact=True)),
+)
+
+
+def measure(loader, text: str) -> int:
+    """読み込み後に保持されているメモリ量（バイト）を返す"""
+    gc.collect()
+    tracemalloc.start()
+    po = loader(text)
+    po.find_by_key("", "")  # キー索引を作成する
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del po
+    return size
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        text = make_po_text(size)
+        print(f"{size:>8}件:")
+        for name, loader in LOADERS:
+            used = measure(loader, text)
+            print(
+                f"  {name:<14} {used / 1024 / 1024:8.1f} MB"
+                f" ({used / size:6.0f} バイト/エントリ)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""POファイルの3方向マージのベンチマーク
+
+SGPOFile.merge3の実行時間を計測します。oursとtheirsでは、それぞれ一部の
+エントリの翻訳とフラグを変更し、一部は同じエントリを変更して競合させます。
+
+使い方:
+    python benchmarks/bench_merge.py [エントリ数 ...]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from po_samples import make_po_text  # noqa: E402
+
+from sgpo import SGPOFile, fast_pofile_from_text  # noqa: E402
+
+DEFAULT_SIZES = (50_000,)
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    for size in sizes:
+        text = make_po_text(size)
+        base = fast_pofile_from_text(text)
+        ours = fast_pofile_from_text(text)
+        theirs = fast_pofile_from_text(text)
+        for i, entry in enumerate(ours):
+            if i % 4 == 0:
+                entry.msgstr += " (ours)"
+        for i, entry in enumerate(theirs):
+            if i % 3 == 0:
+                entry.msgstr += " (theirs)"
+            if i % 5 == 0:
+                entry.flags = []
+
+        start = time.perf_counter()
+        merged, conflicts = SGPOFile.merge3(base, ours, theirs)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>8}件: merge3 {elapsed:.3f}秒 (競合 {len(conflicts)}件)")
+
+
+if __name__ == "__main__":
+    main()
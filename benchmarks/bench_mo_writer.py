@@ -0,0 +1,76 @@
+"""MOファイル保存のベンチマーク
+
+polib.POFile.save_as_mofileとSGPOFile.save_moの実行時間を比較します。
+SmartGitのロケールファイル（またはそのディレクトリ）を指定した場合は
+それらのファイル全体で、指定しない場合は生成したPOファイルで計測します。
+
+使い方:
+    python benchmarks/bench_mo_writer.py [POファイルまたはディレクトリ ...]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import polib  # noqa: E402
+from po_samples import write_po_file  # noqa: E402
+
+from sgpo import fast_pofile  # noqa: E402
+
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+def collect_paths(args, tmp_dir: Path):
+    """引数のファイルとディレクトリ内のPOファイル（なければ生成したファイル）"""
+    paths = []
+    for arg in args:
+        path = Path(arg)
+        if path.is_dir():
+            paths.extend(sorted(path.glob("*.po")))
+        else:
+            paths.append(path)
+    if not paths:
+        for size in DEFAULT_SIZES:
+            paths.append(write_po_file(tmp_dir / f"sample_{size}.po", size))
+    return paths
+
+
+def measure(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        polib_mo = tmp_dir / "polib.mo"
+        sgpo_mo = tmp_dir / "sgpo.mo"
+        totals = [0.0, 0.0, 0.0]
+        for path in collect_paths(sys.argv[1:], tmp_dir):
+            po = fast_pofile(str(path))
+            times = (
+                measure(lambda: polib.POFile.save_as_mofile(po, str(polib_mo))),
+                measure(lambda: po.save_mo(str(sgpo_mo), hash_table=False)),
+                measure(lambda: po.save_mo(str(sgpo_mo))),
+            )
+            po.save_mo(str(sgpo_mo), hash_table=False)
+            identical = polib_mo.read_bytes() == sgpo_mo.read_bytes()
+            totals = [total + t for total, t in zip(totals, times)]
+            print(
+                f"{path.name} ({len(po)}件): polib {times[0]:.3f}秒, "
+                f"save_mo {times[2]:.3f}秒 (ハッシュ表なし {times[1]:.3f}秒), "
+                f"polibとの出力一致: {identical}"
+            )
+        print(
+            f"合計: polib {totals[0]:.3f}秒, save_mo {totals[2]:.3f}秒 "
+            f"(ハッシュ表なし {totals[1]:.3f}秒)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""POファイル読み込みのベンチマーク
+
+SGPOFile.from_file（polibのパーサー）とsgpo.fast_parserの読み込み時間を比較します。
+
+使い方:
+    python benchmarks/bench_po_parser.py [エントリ数 ...]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from po_samples import write_po_file  # noqa: E402
+
+from sgpo import fast_parser  # noqa: E402
+from sgpo.core import SGPOFile  # noqa: E402
+
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+def measure(func, *args, repeat: int = 3) -> float:
+    """関数の実行時間（最小値）を秒単位で返す"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            path = str(write_po_file(Path(tmp_dir) / f"bench_{size}.po", size))
+            polib_time = measure(SGPOFile.from_file, path)
+            fast_time = measure(fast_parser.parse_file, path)
+            print(
+                f"{size:>8}件: polib {polib_time:.3f}秒, "
+                f"fast_parser {fast_time:.3f}秒 ({polib_time / fast_time:.1f}倍)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""POファイル保存のベンチマーク
+
+polib.POFile.save（ファイル全体の文字列を組み立ててから書き込む）と
+SGPOFile.save（エントリ単位のストリーミング書き出し）の時間と
+ピークメモリ使用量を比較します。
+
+使い方:
+    python benchmarks/bench_po_writer.py [エントリ数 ...]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import polib  # noqa: E402
+from po_samples import make_po_text  # noqa: E402
+
+from sgpo import fast_pofile_from_text  # noqa: E402
+
+DEFAULT_SIZES = (10_000, 100_000)
+
+
+def measure(func, *args):
+    """関数の実行時間（秒）とピークメモリ使用量（MB）を返す"""
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            po = fast_pofile_from_text(make_po_text(size))
+            polib_path = str(Path(tmp_dir) / "polib.po")
+            sgpo_path = str(Path(tmp_dir) / "sgpo.po")
+
+            polib_time, polib_peak = measure(
+                lambda: polib.POFile.save(po, polib_path, newline="\n")
+            )
+            sgpo_time, sgpo_peak = measure(lambda: po.save(sgpo_path))
+            identical = Path(polib_path).read_bytes() == Path(sgpo_path).read_bytes()
+
+            print(
+                f"{size:>8}件: polib {polib_time:.3f}秒 ({polib_peak:.1f}MB), "
+                f"sgpo {sgpo_time:.3f}秒 ({sgpo_peak:.1f}MB), 出力一致: {identical}"
+            )
+
+
+if __name__ == "__main__":
+    main()
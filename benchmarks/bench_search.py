@@ -0,0 +1,103 @@
+"""エントリ検索（DatabaseAccessor.advanced_search）のベンチマーク
+
+インメモリデータベースにエントリを登録し、部分一致検索について
+trigramの全文検索テーブルを使うadvanced_searchと、従来のLIKEによる
+全件走査の実行時間を比較します（3文字未満の検索テキストは両方とも走査）。
+advanced_searchの時間には結果のエントリを辞書に変換する時間を含むため、
+該当件数が多い検索ではその時間が大部分を占めます。
+
+使い方:
+    python benchmarks/bench_search.py [エントリ数]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from sgpo_editor.core.database_accessor import DatabaseAccessor  # noqa: E402
+from sgpo_editor.models.database import InMemoryEntryStore  # noqa: E402
+
+DEFAULT_ENTRIES = 100_000
+QUERIES = ("ファイルを123", "message 4242", "dialog77.", "リポジトリ", "開く", "ok")
+SEARCH_FIELDS = ["msgid", "msgstr", "reference", "tcomment", "comment"]
+REPEAT = 5
+
+WORDS = (
+    ("Open", "開く"),
+    ("File", "ファイル"),
+    ("Repository", "リポジトリ"),
+    ("Commit", "コミット"),
+    ("Branch", "ブランチ"),
+    ("Push", "プッシュ"),
+)
+
+# 変更前のadvanced_searchと同じ条件（LIKEによる全件走査）
+LIKE_QUERY = """
+    SELECT e.id
+    FROM entries e
+    LEFT JOIN display_order d ON e.id = d.entry_id
+    WHERE (
+        LOWER(e.msgid) LIKE LOWER(?) OR LOWER(e.msgstr) LIKE LOWER(?)
+        OR EXISTS (
+            SELECT 1 FROM entry_references r
+            WHERE r.entry_id = e.id AND LOWER(r.reference) LIKE LOWER(?)
+        )
+        OR LOWER(e.tcomment) LIKE LOWER(?) OR LOWER(e.comment) LIKE LOWER(?)
+    )
+    ORDER BY d.position ASC
+"""
+
+
+def make_entries(count):
+    entries = []
+    for i in range(count):
+        english, japanese = WORDS[i % len(WORDS)]
+        entries.append(
+            {
+                "key": f"dlg{i // 50}.item{i}",
+                "msgctxt": f"dlg{i // 50}.item{i}",
+                "msgid": f"{english} message {i}",
+                "msgstr": f"{japanese}を{i}件の対象に適用します",
+                "references": [f"src/dialogs/dialog{i // 50}.java:{i % 500}"],
+                "position": i,
+            }
+        )
+    return entries
+
+
+def measure(func):
+    """REPEAT回実行した平均時間（秒）と最後の結果を返す"""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func()
+    return (time.perf_counter() - start) / REPEAT, result
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ENTRIES
+    store = InMemoryEntryStore()
+    store.bulk_load(make_entries(count))
+    accessor = DatabaseAccessor(store)
+
+    print(f"{count}件のエントリ（{REPEAT}回の平均）")
+    for text in QUERIES:
+        fts_time, results = measure(
+            lambda: accessor.advanced_search(
+                search_text=text, search_fields=SEARCH_FIELDS
+            )
+        )
+        pattern = f"%{text}%"
+        like_time, rows = measure(
+            lambda: list(store._conn.execute(LIKE_QUERY, [pattern] * 5))
+        )
+        print(
+            f"  {text!r:<16} advanced_search {fts_time * 1000:8.1f}ms, "
+            f"LIKE走査 {like_time * 1000:8.1f}ms ({len(results)}件, "
+            f"結果一致: {len(results) == len(rows)})"
+        )
+
+
+if __name__ == "__main__":
+    main()
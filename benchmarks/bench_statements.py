@@ -0,0 +1,125 @@
+"""SQL文の再利用（sgpo_editor.models.statements）のベンチマーク
+
+表示中のエントリをキーでまとめて取得する問い合わせ（get_entries_by_keys）を、
+キーの数を変えながら繰り返し実行し、1回あたりの時間を比較します。
+
+- 従来: 既定の設定の接続で、キーの数だけプレースホルダーを並べたSQLを実行
+  （キーの数ごとに別の文字列になり、種類がapswの文キャッシュの件数を超えると効かない）
+- 現在: 接続の設定（_connect）を適用した接続で、statementsのSQL文を実行
+  （キーの数をIN_LIST_BUCKETSに揃えるため、同じ文を再利用する）
+
+使い方:
+    python benchmarks/bench_statements.py [エントリ数] [問い合わせ回数]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import apsw  # noqa: E402
+
+from sgpo_editor.models.database import InMemoryEntryStore  # noqa: E402
+from sgpo_editor.models.statements import (  # noqa: E402
+    ENTRY_DETAIL_COLUMNS,
+    in_list_chunks,
+    statement,
+)
+
+DEFAULT_ENTRIES = 20_000
+DEFAULT_QUERIES = 3_000
+# 1回の問い合わせで取得するキーの最大数（数件の参照と、表示する行数程度）
+MAX_KEYS = (10, 200)
+
+
+def generate_entries(count):
+    """POファイルを読み込んだときと同じ形式のエントリを生成する"""
+    for i in range(count):
+        yield {
+            "key": str(i),
+            "msgid": f"Source text {i}",
+            "msgstr": f"翻訳 {i}" if i % 3 else "",
+            "flags": ["fuzzy"] if i % 7 == 0 else [],
+            "references": [f"src/dialogs/dialog{i // 50}.java:{i % 500}"],
+            "position": i,
+        }
+
+
+def run_previous(conn, key_lists):
+    """従来の方法（キーの数ごとに異なるSQL）で問い合わせる"""
+    cur = conn.cursor()
+    for keys in key_lists:
+        placeholders = ", ".join(["?"] * len(keys))
+        cur.execute(
+            f"""
+            SELECT
+                e.*,
+                d.position,
+                {ENTRY_DETAIL_COLUMNS}
+            FROM entries e
+            LEFT JOIN display_order d ON e.id = d.entry_id
+            WHERE e.key IN ({placeholders})
+            """,
+            keys,
+        ).fetchall()
+
+
+def run_current(conn, key_lists):
+    """statementsのSQL文で問い合わせる"""
+    cur = conn.cursor()
+    for keys in key_lists:
+        for chunk in in_list_chunks(keys):
+            cur.execute(statement("entries_by_keys", keys=len(chunk)), chunk).fetchall()
+
+
+def measure(conn, run, key_lists):
+    """問い合わせ1回あたりの時間（マイクロ秒）と文キャッシュの統計を返す"""
+    start = time.perf_counter()
+    run(conn, key_lists)
+    elapsed = time.perf_counter() - start
+    stats = conn.cache_stats()
+    return elapsed / len(key_lists) * 1_000_000, stats
+
+
+def main() -> None:
+    entry_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ENTRIES
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_QUERIES
+
+    store = InMemoryEntryStore()
+    store.bulk_load(generate_entries(entry_count))
+    rng = random.Random(0)
+
+    print(f"{entry_count}件のエントリ、{query_count}回の問い合わせ")
+    for max_keys in MAX_KEYS:
+        key_lists = []
+        for _ in range(query_count):
+            start = rng.randrange(entry_count)
+            size = rng.randint(1, max_keys)
+            key_lists.append([str((start + i) % entry_count) for i in range(size)])
+
+        # 既定の設定（文キャッシュ100件、ページキャッシュなどは既定値）の接続
+        previous = apsw.Connection(
+            store._uri, flags=apsw.SQLITE_OPEN_READONLY | apsw.SQLITE_OPEN_URI
+        )
+        current = store._connect(apsw.SQLITE_OPEN_READONLY)
+
+        print(f"  キー1〜{max_keys}個")
+        for label, conn, run in (
+            ("従来", previous, run_previous),
+            ("現在", current, run_current),
+        ):
+            per_query, stats = measure(conn, run, key_lists)
+            print(
+                f"    {label}  {per_query:8.1f}マイクロ秒/回"
+                f"  （文キャッシュ: 再利用 {stats['hits']}回、解析 {stats['misses']}回）"
+            )
+        previous.close()
+        current.close()
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""ベンチマーク用のPOファイル生成ユーティリティ"""
+
+from pathlib import Path
+from typing import Union
+
+HEADER = '''#
+msgid ""
+msgstr ""
+"Project-Id-Version: SmartGit\\n"
+"Language: ja\\n"
+"MIME-Version: 1.0\\n"
+"Content-Type: text/plain; charset=UTF-8\\n"
+"Content-Transfer-Encoding: 8bit\\n"
+"Plural-Forms: nplurals=1; plural=0;\\n"
+'''
+
+
+def make_po_text(num_entries: int) -> str:
+    """SmartGitのロケールファイルに近い構成のPOファイルの内容を生成する
+
+    Args:
+        num_entries: 生成するエントリ数
+
+    Returns:
+        POファイルの内容
+    """
+    parts = [HEADER]
+    for i in range(num_entries):
+        flags = "#, fuzzy\n" if i % 7 == 0 else ""
+        if i % 5 == 0:
+            # キーの末尾が':'のエントリ（msgidもキーの一部）
+            msgctxt = f"dlg{i // 50}.Message{i % 50}:"
+        else:
+            msgctxt = f"dlg{i // 50}.(Ok|Cancel|Apply{i % 50}).text"
+        msgstr = f"翻訳 {i}" if i % 3 else ""
+        parts.append(
+            f'{flags}msgctxt "{msgctxt}"\nmsgid "Source text {i}"\nmsgstr "{msgstr}"\n'
+        )
+    return "\n".join(parts)
+
+
+def write_po_file(path: Union[str, Path], num_entries: int) -> Path:
+    """ベンチマーク用のPOファイルを書き出す
+
+    Args:
+        path: 出力先のパス
+        num_entries: 生成するエントリ数
+
+    Returns:
+        出力したファイルのパス
+    """
+    path = Path(path)
+    path.write_text(make_po_text(num_entries), encoding="utf-8", newline="\n")
+    return path
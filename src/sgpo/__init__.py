@@ -1,22 +1,52 @@
+from .batch import (
+    EntryBatch,
+    EntryRecord,
+    FileSummary,
+    load_entry_batches,
+    summarize_files,
+)
+from .compact import CompactEntry
 from .core import (
     DiffEntry,
+    DiffRecord,
     DiffResult,
     DiffStatus,
+    DiffSummary,
+    ImportRecord,
+    ImportReport,
     KeyTuple,
+    MergeConflict,
+    MergeResult,
     SGPOFile,
     pofile,
     pofile_from_text,
 )
+from .fast_parser import parse_file as fast_pofile
+from .fast_parser import parse_text as fast_pofile_from_text
 
 SgPo = SGPOFile  # Alias for backward compatibility
 
 __all__ = [
+    "CompactEntry",
     "DiffEntry",
+    "DiffRecord",
     "DiffResult",
     "DiffStatus",
+    "DiffSummary",
+    "EntryBatch",
+    "EntryRecord",
+    "FileSummary",
+    "ImportRecord",
+    "ImportReport",
     "KeyTuple",
+    "MergeConflict",
+    "MergeResult",
     "SGPOFile",
     "SgPo",
+    "fast_pofile",
+    "fast_pofile_from_text",
+    "load_entry_batches",
     "pofile",
     "pofile_from_text",
+    "summarize_files",
 ]
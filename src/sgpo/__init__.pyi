@@ -1,3 +1,29 @@
+from .batch import (
+    EntryBatch,
+    EntryRecord,
+    FileSummary,
+    load_entry_batches,
+    summarize_files,
+)
+from .compact import CompactEntry
 from .core import KeyTuple, SGPOFile, pofile, pofile_from_text
+from .fast_parser import parse_file as fast_pofile
+from .fast_parser import parse_text as fast_pofile_from_text
+from .import_report import ImportRecord, ImportReport
 
-__all__ = ["SGPOFile", "KeyTuple", "pofile", "pofile_from_text"]
+__all__ = [
+    "CompactEntry",
+    "SGPOFile",
+    "KeyTuple",
+    "pofile",
+    "pofile_from_text",
+    "fast_pofile",
+    "fast_pofile_from_text",
+    "EntryBatch",
+    "EntryRecord",
+    "FileSummary",
+    "ImportRecord",
+    "ImportReport",
+    "load_entry_batches",
+    "summarize_files",
+]
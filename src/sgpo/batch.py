@@ -0,0 +1,274 @@
+"""複数のPOファイルの並列読み込み
+
+複数のロケールファイルをProcessPoolExecutorで並列に解析します。
+
+ワーカープロセスからはpolibのオブジェクトではなく、タプルだけで構成された
+小さな結果（ファイルごとの集計、またはエントリのバッチ）を返すため、
+プロセス間の転送コストを抑えられます。
+同時に処理中のファイル数を制限するため、ファイル数が多くてもメモリ使用量は
+一定の範囲に収まります。
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+import polib
+
+from .core import SGPOFile
+from .duplicate_checker import DuplicateEntry
+from .fast_parser import parse_file
+
+# load_entry_batchesの既定のバッチサイズ（エントリ数）
+DEFAULT_BATCH_SIZE = 5000
+
+
+class EntryRecord(NamedTuple):
+    """プロセス間で受け渡すための、エントリの主要なフィールド"""
+
+    msgctxt: Optional[str]
+    msgid: str
+    msgstr: str
+    msgid_plural: str
+    msgstr_plural: Tuple[Tuple[int, str], ...]
+    flags: Tuple[str, ...]
+    obsolete: bool
+    comment: str
+    tcomment: str
+    occurrences: Tuple[Tuple[str, str], ...]
+    linenum: Optional[int]
+
+    def to_poentry(self) -> polib.POEntry:
+        """polib.POEntryに戻します。
+
+        Returns:
+            同じ内容のエントリ
+        """
+        return polib.POEntry(
+            msgctxt=self.msgctxt,
+            msgid=self.msgid,
+            msgstr=self.msgstr,
+            msgid_plural=self.msgid_plural,
+            msgstr_plural=dict(self.msgstr_plural),
+            flags=list(self.flags),
+            obsolete=self.obsolete,
+            comment=self.comment,
+            tcomment=self.tcomment,
+            occurrences=list(self.occurrences),
+            linenum=self.linenum,
+        )
+
+
+class EntryBatch(NamedTuple):
+    """1つのファイルから読み込んだエントリのバッチ"""
+
+    path: str
+    start: int  # バッチの先頭のエントリのファイル内での位置
+    total: int  # ファイル全体のエントリ数
+    entries: List[EntryRecord]
+
+
+class FileSummary(NamedTuple):
+    """1つのファイルの集計結果
+
+    読み込みに失敗した場合は、errorにエラーメッセージが格納され、
+    そのほかの値は空になります。
+    """
+
+    path: str
+    total: int = 0
+    translated: int = 0
+    untranslated: int = 0
+    fuzzy: int = 0
+    obsolete: int = 0
+    duplicates: Tuple[DuplicateEntry, ...] = ()
+    needs_format: bool = False  # format()で内容が変わるかどうか
+    formatted: bool = False  # フォーマットして保存したかどうか
+    fingerprint: str = ""  # フォーマット前のSGPOFile.content_fingerprint()
+    error: Optional[str] = None
+
+    @property
+    def percent_translated(self) -> int:
+        """翻訳済みの割合（polib.POFile.percent_translatedと同じ計算）"""
+        total = self.total - self.obsolete
+        if total == 0:
+            return 100
+        return int(self.translated * 100 / float(total))
+
+
+def summarize_files(
+    paths: Iterable[str],
+    max_workers: Optional[int] = None,
+    write_formatted: bool = False,
+    fast: bool = True,
+) -> Iterator[FileSummary]:
+    """複数のPOファイルを並列に読み込み、ファイルごとの集計を返します。
+
+    Args:
+        paths: POファイルのパス
+        max_workers: ワーカープロセス数（省略時はCPU数）
+        write_formatted: Trueの場合、format()で内容が変わるファイルを
+            フォーマットして保存します
+        fast: Trueの場合は高速パーサー（fast_pofile）で読み込みます
+
+    Yields:
+        ファイルごとの集計（pathsと同じ順序）
+
+    Note:
+        - 読み込みに失敗したファイルは例外を送出せず、errorを設定した
+          集計を返します
+        - 集計には統計、check_duplicatesの結果、フォーマットの要否が含まれます
+    """
+    args = ((os.fspath(path), write_formatted, fast) for path in paths)
+    return _map_bounded(_summarize_file, args, max_workers)
+
+
+def load_entry_batches(
+    paths: Iterable[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: Optional[int] = None,
+    fast: bool = True,
+) -> Iterator[EntryBatch]:
+    """複数のPOファイルを並列に読み込み、エントリをバッチ単位で返します。
+
+    Args:
+        paths: POファイルのパス
+        batch_size: 1つのバッチに含めるエントリ数の上限
+        max_workers: ワーカープロセス数（省略時はCPU数）
+        fast: Trueの場合は高速パーサー（fast_pofile）で読み込みます
+
+    Yields:
+        エントリのバッチ（pathsと同じ順序、ファイル内ではエントリの順序）
+
+    Raises:
+        ValueError: batch_sizeが1未満の場合
+        OSError, ValueError: ファイルの読み込みに失敗した場合
+            （SGPOFile.from_fileと同じ例外）
+
+    Note:
+        エントリのないファイルは、エントリが空のバッチを1つ返します。
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive: {batch_size}")
+
+    args = ((os.fspath(path), fast) for path in paths)
+    for path, rows in _map_bounded(_load_entry_rows, args, max_workers):
+        total = len(rows)
+        if not rows:
+            yield EntryBatch(path, 0, 0, [])
+            continue
+        for start in range(0, total, batch_size):
+            records = list(map(EntryRecord._make, rows[start : start + batch_size]))
+            yield EntryBatch(path, start, total, records)
+
+
+def _map_bounded(
+    func: Callable, args_iter: Iterable[tuple], max_workers: Optional[int]
+) -> Iterator:
+    """funcを並列に実行し、結果を入力の順序で返す
+
+    未取得の結果はワーカー数の2倍までに制限し、それ以上は投入しない。
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_pending = max_workers * 2
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[Future] = deque()
+        try:
+            for args in args_iter:
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(func, *args))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # 途中で打ち切られた場合、未着手の処理は実行しない
+            for future in pending:
+                future.cancel()
+
+
+def _read(path: str, fast: bool) -> SGPOFile:
+    if fast:
+        return parse_file(path)
+    return SGPOFile.from_file(path)
+
+
+def _load_entry_rows(path: str, fast: bool) -> Tuple[str, List[tuple]]:
+    """ワーカープロセスでファイルを読み込み、エントリをタプルのリストにする"""
+    po = _read(path, fast)
+    rows = [
+        (
+            entry.msgctxt,
+            entry.msgid,
+            entry.msgstr,
+            entry.msgid_plural,
+            tuple(entry.msgstr_plural.items()),
+            tuple(entry.flags),
+            entry.obsolete,
+            entry.comment,
+            entry.tcomment,
+            tuple(entry.occurrences),
+            entry.linenum,
+        )
+        for entry in po
+    ]
+    return path, rows
+
+
+def _summarize_file(path: str, write_formatted: bool, fast: bool) -> FileSummary:
+    """ワーカープロセスでファイルを読み込み、集計する"""
+    try:
+        po = _read(path, fast)
+        counts: Dict[str, int] = {"translated": 0, "fuzzy": 0, "obsolete": 0}
+        for entry in po:
+            if entry.obsolete:
+                counts["obsolete"] += 1
+            elif entry.translated():
+                counts["translated"] += 1
+            elif entry.fuzzy:
+                counts["fuzzy"] += 1
+        total = len(po)
+        duplicates = tuple(po.check_duplicates())
+        fingerprint = po.content_fingerprint()
+
+        # format()の前後でメタデータとエントリの順序を比較する
+        metadata = list(po.metadata.items())
+        order = list(map(id, po))
+        po.format()
+        needs_format = list(po.metadata.items()) != metadata or order != list(
+            map(id, po)
+        )
+        formatted = False
+        if write_formatted and needs_format:
+            po.save(path)
+            formatted = True
+    except Exception as e:
+        return FileSummary(path, error=f"{type(e).__name__}: {e}")
+
+    return FileSummary(
+        path,
+        total=total,
+        translated=counts["translated"],
+        untranslated=total - sum(counts.values()),
+        fuzzy=counts["fuzzy"],
+        obsolete=counts["obsolete"],
+        duplicates=duplicates,
+        needs_format=needs_format,
+        formatted=formatted,
+        fingerprint=fingerprint,
+    )
+
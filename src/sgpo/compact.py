@@ -0,0 +1,161 @@
+"""省メモリのエントリ表現
+
+CompactEntryは__slots__で属性を保持するSGPOEntryです。
+エントリごとの属性辞書を持たないため、大きなPOファイルを読み込んだときの
+メモリ使用量を減らせます。
+
+また、多くのエントリで同じ値が繰り返される文字列（msgctxt、フラグ、
+参照元のファイル名）はsys.internで共有します。SmartGitのロケールファイルを
+複数読み込む場合、msgctxtは全ファイルで同じ文字列オブジェクトになります。
+"""
+
+from __future__ import annotations
+
+import operator
+import sys
+from typing import Any, Dict
+
+import polib
+
+from .key_index import SGPOEntry
+
+# polib.POEntryの属性
+ENTRY_FIELDS = (
+    "msgid",
+    "msgstr",
+    "msgid_plural",
+    "msgstr_plural",
+    "msgctxt",
+    "obsolete",
+    "encoding",
+    "comment",
+    "tcomment",
+    "occurrences",
+    "flags",
+    "previous_msgctxt",
+    "previous_msgid",
+    "previous_msgid_plural",
+    "linenum",
+)
+
+_intern = sys.intern
+
+
+class CompactEntry(SGPOEntry):
+    """__slots__で属性を保持するSGPOEntry
+
+    polib.POEntryと同じ属性とメソッドを持ち、SGPOFileのエントリとして
+    そのまま使用できます。polib.POEntryにない属性を設定した場合に限り、
+    そのエントリに属性辞書が作成されます。
+    """
+
+    __slots__ = ENTRY_FIELDS + (
+        "_sgpo_key_indexes",
+        "_sgpo_fingerprint",
+        "_sgpo_sort_key",
+    )
+
+    def __init__(self, *args, **kwargs) -> None:
+        _init_private(self)
+        super().__init__(*args, **kwargs)
+        _intern_fields(self)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 索引への参照やキャッシュはコピーやpickleに含めない
+        return {name: getattr(self, name) for name in ENTRY_FIELDS}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        _init_private(self)
+        for name in ENTRY_FIELDS:
+            object.__setattr__(self, name, state[name])
+
+    @classmethod
+    def from_fields(cls, fields: Dict[str, Any]) -> CompactEntry:
+        """polib.POEntryと同じ属性の辞書からエントリを作成します。
+
+        Args:
+            fields: 属性名と値の辞書（ENTRY_FIELDSのすべての属性を含むこと）
+
+        Returns:
+            作成したエントリ（文字列は共有され、リストと辞書はそのまま使われます）
+        """
+        entry = object.__new__(cls)
+        for set_field, value in zip(_SETTERS, _get_fields(fields) + _PRIVATE_DEFAULTS):
+            set_field(entry, value)
+        _intern_fields(entry)
+        return entry
+
+    @classmethod
+    def from_entry(cls, entry: polib.POEntry) -> CompactEntry:
+        """既存のエントリと同じ内容のエントリを作成します。
+
+        Args:
+            entry: 元のエントリ
+
+        Returns:
+            作成したエントリ（リストと辞書は元のエントリと共有されます）
+        """
+        compact = cls.__new__(cls)
+        _init_private(compact)
+        setattr_ = object.__setattr__
+        for name in ENTRY_FIELDS:
+            setattr_(compact, name, getattr(entry, name))
+        _intern_fields(compact)
+        # 内容が同じため、計算済みのキャッシュは引き継げる
+        for name in ("_sgpo_fingerprint", "_sgpo_sort_key"):
+            value = getattr(entry, name, None)
+            if value is not None:
+                setattr_(compact, name, value)
+        return compact
+
+    def clone(self) -> CompactEntry:
+        """索引との関連を引き継がないコピーを作成します。
+
+        Returns:
+            リストと辞書をコピーしたエントリ
+        """
+        clone = type(self).__new__(type(self))
+        setattr_ = object.__setattr__
+        for name in ENTRY_FIELDS:
+            setattr_(clone, name, getattr(self, name))
+        setattr_(clone, "flags", list(self.flags))
+        setattr_(clone, "occurrences", list(self.occurrences))
+        setattr_(clone, "msgstr_plural", dict(self.msgstr_plural))
+        setattr_(clone, "_sgpo_key_indexes", ())
+        setattr_(clone, "_sgpo_fingerprint", self._sgpo_fingerprint)
+        setattr_(clone, "_sgpo_sort_key", self._sgpo_sort_key)
+        return clone
+
+
+# 属性の設定に使うスロットのディスクリプタ（ENTRY_FIELDS、内部の値の順）
+_SETTERS = tuple(
+    getattr(CompactEntry, name).__set__ for name in CompactEntry.__slots__
+)
+_PRIVATE_DEFAULTS = ((), None, None)
+_get_fields = operator.itemgetter(*ENTRY_FIELDS)
+
+
+def _init_private(entry: CompactEntry) -> None:
+    setattr_ = object.__setattr__
+    setattr_(entry, "_sgpo_key_indexes", ())
+    setattr_(entry, "_sgpo_fingerprint", None)
+    setattr_(entry, "_sgpo_sort_key", None)
+
+
+def _intern_fields(entry: CompactEntry) -> None:
+    """繰り返し現れる文字列を共有する"""
+    msgctxt = entry.msgctxt
+    if msgctxt is not None:
+        _set_msgctxt(entry, _intern(msgctxt))
+    if entry.previous_msgctxt is not None:
+        _set_previous_msgctxt(entry, _intern(entry.previous_msgctxt))
+    flags = entry.flags
+    if flags:
+        flags[:] = [_intern(flag) for flag in flags]
+    occurrences = entry.occurrences
+    if occurrences:
+        occurrences[:] = [(_intern(fname), lineno) for fname, lineno in occurrences]
+
+
+_set_msgctxt = CompactEntry.msgctxt.__set__
+_set_previous_msgctxt = CompactEntry.previous_msgctxt.__set__
@@ -4,13 +4,40 @@ import os
 import re
 from enum import Enum
 from os import PathLike
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import polib
 from pydantic import BaseModel, ConfigDict
 
 from . import duplicate_checker
+from .compact import CompactEntry
 from .duplicate_checker import DuplicateEntry
+from .fingerprint import (
+    combine_fingerprints,
+    get_fingerprint,
+    peek_fingerprint,
+    store_fingerprint,
+)
+from .import_report import ImportRecord, ImportReport
+from .key_index import ExpandedKeyIndex, KeyIndex, SGPOEntry, make_index_key
+from .merge import MergeConflict, MergeResult, merge_entries
+from .mo_writer import write_mofile
+from .writer import write_pofile
+
+# エスケープされていない括弧で囲まれた文字列（マルチキーエントリ）
+_MULTI_KEYS_PATTERN = re.compile(r"(?<!\\\\)\(([^)]+)\)(?!\\\\)")
+# エントリにキャッシュするソートキーの属性名
+_SORT_KEY_ATTR = "_sgpo_sort_key"
 
 
 class DiffStatus(str, Enum):
@@ -50,6 +77,36 @@ class DiffResult(BaseModel):
         return bool(self.new_entries or self.removed_entries or self.modified_entries)
 
 
+class DiffRecord(NamedTuple):
+    """SGPOFile.iter_diffが返す軽量な差分レコード
+
+    DiffEntryと異なり検証を伴わないタプルのため、大量の差分でも低コストで生成できます。
+    """
+
+    status: DiffStatus
+    msgctxt: Optional[str]
+    msgid: str
+    old_value: Optional[str] = None
+    new_value: Optional[str] = None
+    # 変更されたフィールド名（MODIFIEDの場合のみ）
+    changed_fields: Tuple[str, ...] = ()
+
+
+class DiffSummary(NamedTuple):
+    """差分の件数のみを表す集計結果"""
+
+    new: int
+    removed: int
+    modified: int
+
+    def __bool__(self) -> bool:
+        return bool(self.new or self.removed or self.modified)
+
+
+# 差分比較の対象にできるフィールド
+DIFF_FIELDS = ("msgstr", "msgstr_plural", "flags", "comment", "tcomment")
+
+
 def pofile(filename: str) -> SGPOFile:
     return SGPOFile.from_file(filename)
 
@@ -80,6 +137,7 @@ class SGPOFile(polib.POFile):
         self.wrapwidth = 9999
         self.charset = "utf-8"
         self.check_for_duplicates = True
+        self._key_index = KeyIndex()
 
     @classmethod
     def from_file(cls, filename: str) -> SGPOFile:
@@ -141,143 +199,159 @@ class SGPOFile(polib.POFile):
               - charset: utf-8
               - check_for_duplicates: True
             - 作成されたインスタンスにはpolibのインスタンス変数とエントリが継承されます
+            - 重複チェックはpolibの線形探索ではなく、キー索引を使って行います
+            - 各エントリのフィンガープリントを計算して保持します
         """
         instance = cls.__new__(cls)
         po = polib.pofile(
-            str(source), wrapwidth=9999, charset="utf-8", check_for_duplicates=True
+            str(source), wrapwidth=9999, charset="utf-8", check_for_duplicates=False
         )
 
         instance.__dict__ = po.__dict__
+        instance.check_for_duplicates = True
+        instance._key_index = KeyIndex()
+        instance._key_index.rebuild([])
         for entry in po:
             instance.append(entry)
+            store_fingerprint(entry)
 
         return instance
 
-    def import_unknown(self, unknown: SGPOFile) -> None:
+    def import_unknown(self, unknown: SGPOFile, verbose: bool = True) -> ImportReport:
         """未知のエントリをインポートします。
 
         Args:
             unknown: インポート元のPOファイル
+            verbose: Trueの場合、インポート結果を標準出力に表示します
+
+        Returns:
+            インポート結果（追加・スキップしたエントリ）
 
         Note:
             - 既存のエントリは上書きされません
-            - インポート結果は標準出力に表示されます
+            - インポート結果は処理の完了後にまとめて表示されます
         """
-        success_count = 0
-        print("\nImport unknown entry...")
+        report = ImportReport("Import unknown entry...")
         for unknown_entry in unknown:
             # unknown_entry.flags = ['New']  # For debugging.
             my_entry = self.find_by_key(unknown_entry.msgctxt, unknown_entry.msgid)
 
             if my_entry is not None:
-                if my_entry.msgid == unknown_entry.msgid:
-                    print("\nAlready exists.(Skipped)")
-                    print(f'\t\tmsgctxt "{unknown_entry.msgctxt}"')
-                    print(f'\t\tmsgid "{unknown_entry.msgid}"')
-                else:
-                    print("\nAlready exists. but,msgid has been changed.(Skipped)")
-                    print(f'\t\t#| msgid "{my_entry.msgid}"')
-                    print(f'\t\tmsgctxt "{unknown_entry.msgctxt}"')
-                    print(f'\t\tmsgid "{unknown_entry.msgid}"')
+                # msgidが異なる場合は、既存エントリのmsgidも記録する
+                previous_msgid = (
+                    None if my_entry.msgid == unknown_entry.msgid else my_entry.msgid
+                )
+                report.skipped.append(
+                    ImportRecord(
+                        unknown_entry.msgctxt, unknown_entry.msgid, previous_msgid
+                    )
+                )
             else:
+                record = ImportRecord(unknown_entry.msgctxt, unknown_entry.msgid)
                 try:
                     self.append(unknown_entry)
-                    print("\nNew entry added.")
-                    print(f'\t\tmsgctxt "{unknown_entry.msgctxt}')
-                    print(f'\t\tmsgid "{unknown_entry.msgid}')
-                    success_count += 1
-                except ValueError as e:
-                    print(e)
-                except OSError as e:
-                    print(e)
-
-        print(f"{success_count} entries added.")
-
-    def import_mismatch(self, mismatch: SGPOFile) -> None:
+                    report.added.append(record)
+                except (ValueError, OSError) as e:
+                    report.failed.append(record._replace(message=str(e)))
+
+        if verbose:
+            report.write()
+        return report
+
+    def import_mismatch(self, mismatch: SGPOFile, verbose: bool = True) -> ImportReport:
         """不一致のエントリをインポートします。
 
         Args:
             mismatch: インポート元のPOファイル
+            verbose: Trueの場合、インポート結果を標準出力に表示します
+
+        Returns:
+            インポート結果（追加・変更・スキップしたエントリ）
 
         Note:
             - 既存のエントリは上書きされます
-            - インポート結果は標準出力に表示されます
+            - インポート結果は処理の完了後にまとめて表示されます
         """
-        new_entry_count = 0
-        modified_entry_count = 0
-
-        print("\nImport unknown entry...")
+        report = ImportReport("Import mismatch entry...")
         for mismatch_entry in mismatch:
             # mismatch_entry.flags = ['Modified']  # For debugging.
             my_entry = self.find_by_key(mismatch_entry.msgctxt, mismatch_entry.msgid)
 
             if my_entry is not None:
                 if my_entry.msgid == mismatch_entry.msgid:
-                    print("\nAlready exists.(Skipped)")
-                    print(f'\t\t#| msgid "{my_entry.previous_msgid}"')
-                    print(f'\t\tmsgctxt "{my_entry.msgctxt}"')
-                    print(f'\t\tmsgid "{my_entry.msgid}"')
+                    report.skipped.append(
+                        ImportRecord(my_entry.msgctxt, my_entry.msgid)
+                    )
                 else:
-                    print("\nmsgid has been changed.")
-                    print(f'\t\t#| msgid "{my_entry.msgid}"')
-                    print(f'\t\tmsgctxt "{mismatch_entry.msgctxt}"')
-                    print(f'\t\tmsgid "{mismatch_entry.msgid}"')
+                    report.modified.append(
+                        ImportRecord(
+                            mismatch_entry.msgctxt,
+                            mismatch_entry.msgid,
+                            my_entry.msgid,
+                        )
+                    )
                     my_entry.previous_msgid = my_entry.msgid
                     my_entry.msgid = mismatch_entry.msgid
-                    modified_entry_count += 1
             else:
+                record = ImportRecord(mismatch_entry.msgctxt, mismatch_entry.msgid)
                 try:
                     self.append(mismatch_entry)
-                    print("\nNew entry added.")
-                    print(f'\t\tmsgctxt "{mismatch_entry.msgctxt}"')
-                    print(f'\t\tmsgid "{mismatch_entry.msgid}"')
-                    new_entry_count += 1
-                except ValueError as e:
-                    print(e)
-                except OSError as e:
-                    print(e)
-
-        print(f"{new_entry_count} entries added.")
-        print(f"{modified_entry_count} entries modified.")
-
-    def import_pot(self, pot: SGPOFile) -> None:
+                    report.added.append(record)
+                except (ValueError, OSError) as e:
+                    report.failed.append(record._replace(message=str(e)))
+
+        if verbose:
+            report.write()
+        return report
+
+    def import_pot(
+        self, pot: SGPOFile, keep_sorted: bool = False, verbose: bool = True
+    ) -> ImportReport:
         """POTファイルからエントリをインポートします。
 
         Args:
             pot: インポート元のPOTファイル
+            keep_sorted: Trueの場合、新規エントリをソート順の位置に挿入します
+                （ファイルがソート済みであることが前提です）
+            verbose: Trueの場合、インポート結果を標準出力に表示します
+
+        Returns:
+            インポート結果（追加・変更・廃止したエントリ）
 
         Note:
             - 新規エントリが追加されます
             - 削除されたエントリは obsolete フラグが設定されます
             - 変更されたエントリは fuzzy フラグが設定されます
-            - インポート結果は標準出力に表示されます
+            - 新規エントリはPOTファイルの順序で追加されます
+            - インポート結果は処理の完了後にまとめて表示されます
         """
-        new_entry_count = 0
-        modified_entry_count = 0
-        po_key_set: set[KeyTuple] = set(self.get_key_list())
-        pot_key_set: set[KeyTuple] = set(pot.get_key_list())
-
-        diff_pot_only_key: set[KeyTuple] = pot_key_set - po_key_set
-        diff_po_only_key: set[KeyTuple] = po_key_set - pot_key_set
+        report = ImportReport("Import pot entry...")
+        po_key_list: list[KeyTuple] = self.get_key_list()
+        po_key_set: set[KeyTuple] = set(po_key_list)
+        pot_key_list: list[KeyTuple] = pot.get_key_list()
+        pot_key_set: set[KeyTuple] = set(pot_key_list)
 
         # Add new my_entry
-        print(f"\npot file only: {len(diff_pot_only_key)}")
-        for key in diff_pot_only_key:
-            print(f'msgctxt:\t"{key.msgctxt}"\n  msgid:\t"{key.msgid}"\n')
-
+        # （POTに同じキーのエントリが複数ある場合は、最初のエントリだけを追加する）
+        for key in dict.fromkeys(pot_key_list):
+            if key in po_key_set:
+                continue
             pot_entry = pot.find_by_key(key.msgctxt, key.msgid)
             if pot_entry:
-                self.append(pot_entry)
-                new_entry_count += 1
+                if keep_sorted:
+                    self.insert_sorted(pot_entry)
+                else:
+                    self.append(pot_entry)
+                report.added.append(ImportRecord(pot_entry.msgctxt, pot_entry.msgid))
 
         # Remove obsolete entry
-        print(f"\npo file only: {len(diff_po_only_key)}")
-        for key in diff_po_only_key:
-            print(f'msgctxt:\t"{key.msgctxt}"\n  msgid:\t"{key.msgid}"\n')
-
+        for key in dict.fromkeys(po_key_list):
+            if key in pot_key_set:
+                continue
             entry = self.find_by_key(key.msgctxt, key.msgid)
             if entry:
                 entry.obsolete = True
+                report.obsoleted.append(ImportRecord(entry.msgctxt, entry.msgid))
 
         # Modified entry
         for my_entry in self:
@@ -287,14 +361,16 @@ class SGPOFile(polib.POFile):
                 )  # Noneの代わりに空文字を使用
 
                 if pot_entry and (my_entry.msgid != pot_entry.msgid):
-                    print(f"msgctxt:\t{my_entry.msgctxt}\n  msgid:\t{my_entry.msgid}\n")
+                    report.modified.append(
+                        ImportRecord(my_entry.msgctxt, pot_entry.msgid, my_entry.msgid)
+                    )
                     my_entry.previous_msgid = my_entry.msgid
                     my_entry.msgid = pot_entry.msgid
                     my_entry.flags = ["fuzzy"]
-                    modified_entry_count += 1
 
-        print(f"\n     new entry:\t{new_entry_count}")
-        print(f"\nmodified entry:\t{modified_entry_count}")
+        if verbose:
+            report.write()
+        return report
 
     def delete_extracted_comments(self) -> None:
         """抽出されたコメントを削除します。
@@ -309,6 +385,22 @@ class SGPOFile(polib.POFile):
             if entry.comment:
                 entry.comment = ""  # polibではNoneではなく空文字を使用
 
+    def compact(self) -> None:
+        """エントリを省メモリのCompactEntryに置き換えます。
+
+        Note:
+            - エントリの内容は変わりません
+            - 置き換え前のエントリオブジェクトは、このファイルのエントリでは
+              なくなります（リストと辞書の属性は置き換え後のエントリと共有されます）
+            - 独自のエントリクラスのエントリは置き換えません
+        """
+        key_index = self._get_raw_key_index()
+        key_index.clear()
+        for i, entry in enumerate(self):
+            if type(entry) in (polib.POEntry, SGPOEntry):
+                list.__setitem__(self, i, CompactEntry.from_entry(entry))
+        key_index.invalidate()
+
     def find_by_key(self, msgctxt: str, msgid: str) -> Optional[polib.POEntry]:
         """キーに一致するエントリを検索します。
 
@@ -322,19 +414,134 @@ class SGPOFile(polib.POFile):
         Note:
             - msgctxtが':'で終わる場合、msgctxtとmsgidの組み合わせがキーとなります
             - それ以外の場合、msgctxtのみがキーとなります
+            - キー索引を使うため、検索はO(1)で行われます
+            - 同じキーのエントリが複数ある場合は、ファイル内で最初のものを返します
         """
-        for entry in self:
-            # If the msgctxt ends with ':', the combination of msgid and
-            # msgctxt becomes the key that identifies the entry.
-            # Otherwise, only msgctxt is the key to identify the entry.
-            entry_msgctxt = entry.msgctxt or ""
-            if entry_msgctxt.endswith(":"):
-                if entry_msgctxt == msgctxt and entry.msgid == msgid:
-                    return entry
-            else:
-                if entry_msgctxt == msgctxt:
-                    return entry
-        return None
+        if msgctxt is None:
+            return None
+
+        candidates = self._get_key_index().get(make_index_key(msgctxt, msgid))
+        if not candidates:
+            return None
+        return candidates[0]
+
+    def find_by_expanded_key(
+        self, msgctxt: str, msgid: str = ""
+    ) -> Optional[polib.POEntry]:
+        """SmartGitの圧縮表記を展開したキーに一致するエントリを検索します。
+
+        Args:
+            msgctxt: 展開後のメッセージコンテキスト（例: "dlg.a.title"）
+            msgid: メッセージID（msgctxtが':'で終わる場合のみ使用）
+
+        Returns:
+            一致するエントリ。見つからない場合はNone
+
+        Note:
+            - "dlg.(a|b).title"のように圧縮表記で保存されたエントリも、
+              展開後のいずれのmsgctxtでも検索できます（複数のグループや
+              入れ子のグループにも対応します）
+            - 展開後のキーの索引は最初の検索時に作成され、以後はエントリの
+              追加・削除やmsgctxt/msgidの変更に合わせて更新されるため、
+              検索はO(1)で行われます
+            - 一致するエントリが複数ある場合は、ファイル内で最初のものを返します
+        """
+        if msgctxt is None:
+            return None
+
+        candidates = self._get_expanded_key_index().get(
+            make_index_key(msgctxt, msgid)
+        )
+        if not candidates:
+            return None
+        return candidates[0]
+
+    def append(self, entry: polib.POEntry) -> None:
+        """エントリを末尾に追加します。
+
+        Args:
+            entry: 追加するエントリ
+
+        Raises:
+            ValueError: check_for_duplicatesが有効で、同じエントリが既に存在する場合
+
+        Note:
+            - 重複の判定基準はpolibと同じです（廃止されていないエントリで、
+              msgctxtとmsgidが完全一致するもの）
+            - polibの線形探索の代わりにキー索引を使って判定します
+        """
+        # check_for_duplicates may not be defined (yet) when unpickling.
+        if getattr(self, "check_for_duplicates", False) and self._has_duplicate(entry):
+            raise ValueError('Entry "%s" already exists' % entry.msgid)
+        list.append(self, entry)
+        self._get_raw_key_index().add(entry)
+
+    def insert(self, index: int, entry: polib.POEntry) -> None:
+        """指定位置にエントリを挿入します。
+
+        Args:
+            index: 挿入位置
+            entry: 挿入するエントリ
+
+        Raises:
+            ValueError: check_for_duplicatesが有効で、同じエントリが既に存在する場合
+        """
+        if self.check_for_duplicates and self._has_duplicate(entry):
+            raise ValueError('Entry "%s" already exists' % entry.msgid)
+        list.insert(self, index, entry)
+        self._get_raw_key_index().insert(entry)
+
+    def extend(self, entries: Iterable[polib.POEntry]) -> None:
+        """複数のエントリを末尾に追加します（重複チェックは行いません）。"""
+        entries = list(entries)
+        list.extend(self, entries)
+        key_index = self._get_raw_key_index()
+        for entry in entries:
+            key_index.add(entry)
+
+    def __iadd__(  # type: ignore[override]
+        self, entries: Iterable[polib.POEntry]
+    ) -> SGPOFile:
+        self.extend(entries)
+        return self
+
+    def remove(self, entry: polib.POEntry) -> None:
+        """エントリを削除します。
+
+        Args:
+            entry: 削除するエントリ
+
+        Raises:
+            ValueError: エントリが存在しない場合
+        """
+        self.pop(self.index(entry))
+
+    def pop(self, index: int = -1) -> polib.POEntry:  # type: ignore[override]
+        """指定位置のエントリを取り出します。"""
+        entry = list.pop(self, index)
+        self._get_raw_key_index().discard(entry)
+        return entry
+
+    def clear(self) -> None:
+        """すべてのエントリを削除します。"""
+        list.clear(self)
+        self._get_raw_key_index().rebuild([])
+
+    def reverse(self) -> None:
+        """エントリの並びを反転します。"""
+        list.reverse(self)
+        self._get_raw_key_index().invalidate()
+
+    def __delitem__(self, index) -> None:
+        if isinstance(index, int):
+            self.pop(index)
+            return
+        list.__delitem__(self, index)
+        self._get_raw_key_index().invalidate()
+
+    def __setitem__(self, index, value) -> None:
+        list.__setitem__(self, index, value)
+        self._get_raw_key_index().invalidate()
 
     def sort(
         self,
@@ -352,14 +559,48 @@ class SGPOFile(polib.POFile):
             デフォルトのソートキーは以下の規則に従います：
             - '*'で始まるエントリは先頭に配置
             - その他のエントリは_multi_keys_filterを通して生成されたキーでソート
+            - デフォルトのソートキーはエントリごとにキャッシュされ、
+              msgctxtまたはmsgidが変更された場合のみ再計算されます
         """
         if key is None:
-            super().sort(
-                key=lambda entry: self._po_entry_to_sort_key(entry),
-                reverse=reverse,
-            )
+            super().sort(key=self._get_sort_key, reverse=reverse)
         else:
             super().sort(key=key, reverse=reverse)
+        self._get_raw_key_index().invalidate()
+
+    def insert_sorted(self, entry: polib.POEntry) -> int:
+        """ソート済みのファイルに、並び順を保ったままエントリを挿入します。
+
+        Args:
+            entry: 挿入するエントリ
+
+        Returns:
+            挿入した位置
+
+        Raises:
+            ValueError: check_for_duplicatesが有効で、同じエントリが既に存在する場合
+
+        Note:
+            - ファイルがデフォルトのソートキーで昇順にソートされていることが前提です
+            - 挿入位置は二分探索で求めるため、ファイル全体の再ソートは行いません
+            - 同じソートキーのエントリがある場合は、その後ろに挿入します
+              （末尾に追加してからsort()した場合と同じ位置です）
+        """
+        if self.check_for_duplicates and self._has_duplicate(entry):
+            raise ValueError('Entry "%s" already exists' % entry.msgid)
+
+        sort_key = self._get_sort_key(entry)
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if sort_key < self._get_sort_key(list.__getitem__(self, mid)):
+                hi = mid
+            else:
+                lo = mid + 1
+        list.insert(self, lo, entry)
+        # 同じキーのエントリがなければ、索引内の順序は変わらない
+        self._get_raw_key_index().insert(entry)
+        return lo
 
     def format(self):
         """POファイルをフォーマットします。
@@ -384,15 +625,51 @@ class SGPOFile(polib.POFile):
             repr_method: エントリの文字列表現を生成するメソッド名
             newline: 改行コード。デフォルトはLF（\n）
 
+        Raises:
+            IOError: 保存先のパスが指定されておらず、元のパスもない場合
+
         Note:
-            polibのデフォルトの改行コードをLFに変更しています。
+            - polibのデフォルトの改行コードをLFに変更しています。
+            - 既定のrepr_methodでは、ファイル全体の文字列を組み立てずに
+              エントリ単位で書き出します（出力内容はpolibと同じです）
+            - 一時ファイルに書き出してから置き換えるため、保存中に失敗しても
+              元のファイルは壊れません
         """
-        # Change the default value of newline to \n (LF).
-        super().save(
-            fpath=fpath,
-            repr_method=repr_method,
-            newline=newline,
-        )
+        if repr_method != "__unicode__":
+            # Change the default value of newline to \n (LF).
+            super().save(
+                fpath=fpath,
+                repr_method=repr_method,
+                newline=newline,
+            )
+            return
+
+        if self.fpath is None and fpath is None:
+            raise IOError("You must provide a file path to save() method")
+        write_pofile(self, fpath if fpath is not None else self.fpath, newline=newline)
+
+        # set the file path if not set
+        if self.fpath is None and fpath:
+            self.fpath = fpath
+
+    def save_mo(self, fpath: str, hash_table: bool = True) -> None:
+        """コンパイル済みのMOファイルとして保存します。
+
+        Args:
+            fpath: 保存先のパス
+            hash_table: Falseの場合はハッシュ表を出力しません
+                （msgfmtの--no-hashと同じ）
+
+        Raises:
+            ValueError: msgctxtとmsgidが同じエントリが複数ある場合
+
+        Note:
+            - 出力はsave()で保存したPOファイルをmsgfmtでコンパイルした結果と
+              同じです（廃止、fuzzy、未翻訳のエントリは含まれません）
+            - polibのsave_as_mofileと異なり、ハッシュ表を含み、
+              ファイル全体を1回の書き込みで保存します
+        """
+        write_mofile(self, fpath, hash_table=hash_table)
 
     def get_key_list(self) -> list[KeyTuple]:
         """全エントリのキーのリストを返します。
@@ -417,6 +694,18 @@ class SGPOFile(polib.POFile):
         """
         return duplicate_checker.check_msgctxt_duplicates(self)
 
+    def iter_duplicates(self) -> Iterator[DuplicateEntry]:
+        """重複エントリを検出した順に返します。
+
+        Yields:
+            重複エントリ
+
+        Note:
+            - check_duplicatesのストリーミング版です
+            - 結果を逐次表示したい場合（GUIなど）に使用します
+        """
+        return duplicate_checker.iter_msgctxt_duplicates(self)
+
     def diff(self, other: SGPOFile) -> DiffResult:
         """2つのPOファイル間の差分を比較します。
 
@@ -433,51 +722,287 @@ class SGPOFile(polib.POFile):
             - エントリの一致判定は(msgctxt, msgid)の組み合わせで行います
             - msgstrの値のみが異なる場合は変更として扱います
             - 比較は大文字小文字を区別します
+            - 大きなファイルの比較にはiter_diffまたはdiff_summaryを使用してください
         """
-        result = DiffResult()
-        self_entries = {(entry.msgctxt, entry.msgid): entry for entry in self}
-        other_entries = {(entry.msgctxt, entry.msgid): entry for entry in other}
+        return self.diff_result_from_records(self.iter_diff(other))
 
-        # 新規エントリの検出
-        for key, entry in other_entries.items():
-            if key not in self_entries:
-                result.new_entries.append(
-                    DiffEntry(
-                        key=KeyTuple(msgctxt=key[0], msgid=key[1]),
-                        status=DiffStatus.NEW,
-                        new_value=entry.msgstr if entry else None,
-                    )
-                )
+    def iter_diff(
+        self, other: SGPOFile, fields: Iterable[str] = ("msgstr",)
+    ) -> Iterator[DiffRecord]:
+        """2つのPOファイル間の差分を順次生成します。
 
-        # 削除されたエントリの検出
-        for key, entry in self_entries.items():
-            if key not in other_entries:
-                result.removed_entries.append(
-                    DiffEntry(
-                        key=KeyTuple(msgctxt=key[0], msgid=key[1]),
-                        status=DiffStatus.REMOVED,
-                        old_value=entry.msgstr if entry else None,
-                    )
+        Args:
+            other: 比較対象のPOファイル
+            fields: 変更の判定に使うフィールド名（DIFF_FIELDSのいずれか）
+
+        Yields:
+            DiffRecord: 差分レコード
+                - REMOVED/MODIFIEDはselfのエントリ順に生成されます
+                - NEWはその後にotherのエントリ順に生成されます
+
+        Raises:
+            ValueError: 未対応のフィールド名が指定された場合
+
+        Note:
+            - エントリの一致判定はdiffと同じく(msgctxt, msgid)の組み合わせで行います
+            - old_value/new_valueにはmsgstrが格納されます
+            - フィンガープリントが一致するエントリはフィールドを比較しません
+        """
+        fields = self._validate_diff_fields(fields)
+        self_entries = self._entries_by_msg_key(self)
+        other_entries = self._entries_by_msg_key(other)
+
+        for key, self_entry in self_entries.items():
+            other_entry = other_entries.get(key)
+            if other_entry is None:
+                yield DiffRecord(
+                    DiffStatus.REMOVED, key[0], key[1], old_value=self_entry.msgstr
+                )
+                continue
+            if self._has_same_fingerprint(self_entry, other_entry):
+                continue
+            changed_fields = tuple(
+                field
+                for field in fields
+                if getattr(self_entry, field) != getattr(other_entry, field)
+            )
+            if changed_fields:
+                yield DiffRecord(
+                    DiffStatus.MODIFIED,
+                    key[0],
+                    key[1],
+                    self_entry.msgstr,
+                    other_entry.msgstr,
+                    changed_fields,
                 )
 
-        # 変更されたエントリの検出
-        for key in self_entries.keys() & other_entries.keys():
-            self_entry = self_entries[key]
-            other_entry = other_entries[key]
-
-            if self_entry and other_entry and self_entry.msgstr != other_entry.msgstr:
-                result.modified_entries.append(
-                    DiffEntry(
-                        key=KeyTuple(msgctxt=key[0], msgid=key[1]),
-                        status=DiffStatus.MODIFIED,
-                        old_value=self_entry.msgstr,
-                        new_value=other_entry.msgstr,
-                    )
+        for key, other_entry in other_entries.items():
+            if key not in self_entries:
+                yield DiffRecord(
+                    DiffStatus.NEW, key[0], key[1], new_value=other_entry.msgstr
                 )
 
+    def diff_summary(
+        self, other: SGPOFile, fields: Iterable[str] = ("msgstr",)
+    ) -> DiffSummary:
+        """2つのPOファイル間の差分の件数のみを集計します。
+
+        Args:
+            other: 比較対象のPOファイル
+            fields: 変更の判定に使うフィールド名（DIFF_FIELDSのいずれか）
+
+        Returns:
+            DiffSummary: 新規・削除・変更の件数
+
+        Raises:
+            ValueError: 未対応のフィールド名が指定された場合
+        """
+        fields = self._validate_diff_fields(fields)
+        self_entries = self._entries_by_msg_key(self)
+        other_entries = self._entries_by_msg_key(other)
+
+        common = 0
+        modified = 0
+        for key, self_entry in self_entries.items():
+            other_entry = other_entries.get(key)
+            if other_entry is None:
+                continue
+            common += 1
+            if self._has_same_fingerprint(self_entry, other_entry):
+                continue
+            for field in fields:
+                if getattr(self_entry, field) != getattr(other_entry, field):
+                    modified += 1
+                    break
+
+        return DiffSummary(
+            new=len(other_entries) - common,
+            removed=len(self_entries) - common,
+            modified=modified,
+        )
+
+    def content_fingerprint(self) -> str:
+        """ファイル全体の内容のフィンガープリントを返します。
+
+        Returns:
+            16進数文字列のフィンガープリント
+
+        Note:
+            - ヘッダー、メタデータ、エントリの内容と順序から計算されます
+            - 各エントリのフィンガープリントは保持している値を使うため、
+              変更されていないファイルでは文字列の比較や連結は行いません
+        """
+        prefix = "\x00".join(
+            [self.header, "1" if self.metadata_is_fuzzy else "0"]
+            + ["%s: %s" % item for item in self.ordered_metadata()]
+        )
+        return combine_fingerprints(
+            (get_fingerprint(entry) for entry in self), prefix=prefix
+        )
+
+    def fingerprints(self) -> frozenset:
+        """全エントリのフィンガープリントの集合を返します。
+
+        Returns:
+            フィンガープリント（bytes）の集合
+
+        Note:
+            2つのファイルの集合の差を取ると、内容が変更・追加・削除された
+            エントリのフィンガープリントが得られます。
+        """
+        return frozenset(get_fingerprint(entry) for entry in self)
+
+    def changed_entries(self, other: SGPOFile) -> List[polib.POEntry]:
+        """otherに同じ内容のエントリがないエントリを返します。
+
+        Args:
+            other: 比較対象のPOファイル
+
+        Returns:
+            内容が変更された、またはotherにないエントリのリスト（ファイル内の順序）
+
+        Note:
+            フィンガープリントの集合演算のみで判定するため、フィールドの比較は行いません。
+        """
+        other_fingerprints = other.fingerprints()
+        return [
+            entry for entry in self if get_fingerprint(entry) not in other_fingerprints
+        ]
+
+    @staticmethod
+    def diff_result_from_records(records: Iterable[DiffRecord]) -> DiffResult:
+        """差分レコードからDiffResultを生成します。
+
+        Args:
+            records: iter_diffが生成した差分レコード
+
+        Returns:
+            DiffResult: 差分の結果
+        """
+        result = DiffResult()
+        lists = {
+            DiffStatus.NEW: result.new_entries,
+            DiffStatus.REMOVED: result.removed_entries,
+            DiffStatus.MODIFIED: result.modified_entries,
+        }
+        for record in records:
+            lists[record.status].append(
+                DiffEntry(
+                    key=KeyTuple(msgctxt=record.msgctxt, msgid=record.msgid),
+                    status=record.status,
+                    old_value=record.old_value,
+                    new_value=record.new_value,
+                )
+            )
         return result
 
+    @classmethod
+    def merge3(cls, base: SGPOFile, ours: SGPOFile, theirs: SGPOFile) -> MergeResult:
+        """共通の祖先をもとに2つのPOファイルを3方向マージします。
+
+        Args:
+            base: 共通の祖先のPOファイル
+            ours: 自分の変更版のPOファイル
+            theirs: 相手の変更版のPOファイル
+
+        Returns:
+            MergeResult:
+                - merged: マージ後のPOファイル（ヘッダーとメタデータはoursのもの）
+                - conflicts: 自動解決できなかった変更のリスト
+
+        Note:
+            - エントリの対応付けは_po_entry_to_key_tupleと同じ規則で行います
+            - 片方だけの変更（msgstr、フラグなど）は自動的に取り込まれます
+            - 競合したフィールドはoursの値が残ります
+            - 入力のPOファイルは変更されません
+        """
+        entries, conflicts = merge_entries(base, ours, theirs)
+
+        merged = cls()
+        merged.header = ours.header
+        merged.metadata = dict(ours.metadata)
+        merged.metadata_is_fuzzy = ours.metadata_is_fuzzy
+        merged.encoding = ours.encoding
+        merged.extend(entries)
+        return MergeResult(merged, conflicts)
+
     # ======= Private methods =======
+    def _get_raw_key_index(self) -> KeyIndex:
+        """キー索引を返します（再構築は行いません）。
+
+        Note:
+            - polibのパーサーやpickleから復元されたインスタンスは__init__を
+              経由しないため、索引がなければここで作成します
+        """
+        key_index = self.__dict__.get("_key_index")
+        if key_index is None:
+            key_index = KeyIndex()
+            self.__dict__["_key_index"] = key_index
+        return key_index
+
+    def _get_key_index(self) -> KeyIndex:
+        """最新の状態に更新されたキー索引を返します。"""
+        key_index = self._get_raw_key_index()
+        if not key_index.is_valid:
+            key_index.rebuild(self)
+        return key_index
+
+    def _get_expanded_key_index(self) -> ExpandedKeyIndex:
+        """最新の状態に更新された展開キー索引を返します。"""
+        expanded_index = self._get_raw_key_index().expanded_index()
+        if not expanded_index.is_valid:
+            expanded_index.rebuild(self)
+        return expanded_index
+
+    @staticmethod
+    def _entries_by_msg_key(
+        entries: Iterable[polib.POEntry],
+    ) -> Dict[Tuple[Optional[str], str], polib.POEntry]:
+        """(msgctxt, msgid)をキーとするエントリの辞書を返します。
+
+        Note:
+            同じキーのエントリが複数ある場合は、最後のエントリが使われます
+        """
+        return {(entry.msgctxt, entry.msgid): entry for entry in entries}
+
+    @staticmethod
+    def _has_same_fingerprint(entry: polib.POEntry, other: polib.POEntry) -> bool:
+        """両方のエントリが同じフィンガープリントを保持しているかどうか"""
+        fingerprint = peek_fingerprint(entry)
+        return fingerprint is not None and fingerprint == peek_fingerprint(other)
+
+    @staticmethod
+    def _validate_diff_fields(fields: Iterable[str]) -> Tuple[str, ...]:
+        """差分比較の対象フィールドを検証します。
+
+        Raises:
+            ValueError: 未対応のフィールド名が指定された場合
+        """
+        fields = tuple(fields)
+        for field in fields:
+            if field not in DIFF_FIELDS:
+                raise ValueError(f"Unsupported diff field: {field}")
+        return fields
+
+    def _has_duplicate(self, entry: polib.POEntry) -> bool:
+        """polibのcheck_for_duplicatesと同じ基準で重複を判定します。
+
+        Args:
+            entry: 判定対象のエントリ
+
+        Returns:
+            廃止されていないエントリで、msgctxtとmsgidが一致するものがあればTrue
+        """
+        candidates = self._get_key_index().get(
+            make_index_key(entry.msgctxt, entry.msgid)
+        )
+        return any(
+            not candidate.obsolete
+            and candidate.msgid == entry.msgid
+            and candidate.msgctxt == entry.msgctxt
+            for candidate in candidates
+        )
+
     @staticmethod
     def _filter_po_metadata(meta_dict: Dict[str, str]) -> Dict[str, str]:
         """メタデータを定義済みの形式に整理します。
@@ -520,6 +1045,28 @@ class SGPOFile(polib.POFile):
         else:
             return self._multi_keys_filter(self._po_entry_to_legacy_key(po_entry))
 
+    def _get_sort_key(self, po_entry: polib.POEntry) -> str:
+        """キャッシュを利用してエントリのソートキーを取得します。
+
+        Args:
+            po_entry: POエントリ
+
+        Returns:
+            ソートキー
+
+        Note:
+            ソートキーは生成元のmsgctxt/msgidと一緒にエントリに保持され、
+            どちらかが変更されていた場合は再計算されます。
+        """
+        msgctxt = po_entry.msgctxt
+        msgid = po_entry.msgid
+        cached = getattr(po_entry, _SORT_KEY_ATTR, None)
+        if cached is not None and cached[0] == msgctxt and cached[1] == msgid:
+            return cached[2]
+        sort_key = self._po_entry_to_sort_key(po_entry)
+        object.__setattr__(po_entry, _SORT_KEY_ATTR, (msgctxt, msgid, sort_key))
+        return sort_key
+
     @staticmethod
     def _po_entry_to_legacy_key(po_entry: polib.POEntry) -> str:
         """レガシー形式のキーを生成します。
@@ -553,11 +1100,8 @@ class SGPOFile(polib.POFile):
             - msgctxtが':'で終わる場合：msgctxtとmsgidを使用
             - それ以外の場合：msgctxtと空文字を使用
         """
-        msgctxt = po_entry.msgctxt or ""
-        if msgctxt.endswith(":"):
-            return KeyTuple(msgctxt=msgctxt, msgid=po_entry.msgid)
-        else:
-            return KeyTuple(msgctxt=msgctxt, msgid="")
+        msgctxt, msgid = make_index_key(po_entry.msgctxt, po_entry.msgid)
+        return KeyTuple(msgctxt=msgctxt, msgid=msgid)
 
     @staticmethod
     def _multi_keys_filter(text: str) -> str:
@@ -573,12 +1117,9 @@ class SGPOFile(polib.POFile):
             - エスケープされていない括弧内の文字列の前に'ZZZ'を追加
             - これにより、マルチキーエントリがロケールファイル内の適切な位置にグループ化されます
         """
-        # Matches everything inside parentheses that are NOT escaped
-        pattern = r"(?<!\\\\)\(([^)]+)\)(?!\\\\)"
-
         # Use re.sub to add 'ZZZ' and remove parentheses from any matched
-        # pattern
-        modified_text = re.sub(pattern, "ZZZ\\1", text)
+        # pattern (everything inside parentheses that are NOT escaped)
+        modified_text = _MULTI_KEYS_PATTERN.sub("ZZZ\\1", text)
 
         return modified_text
 
@@ -2,12 +2,25 @@ from __future__ import annotations
 
 from enum import Enum
 from os import PathLike
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from polib import POEntry, POFile
 from pydantic import BaseModel
 
 from .duplicate_checker import DuplicateEntry
+from .import_report import ImportRecord, ImportReport
+from .key_index import KeyIndex
+from .merge import MergeConflict, MergeResult
 
 class DiffStatus(str, Enum):
     """差分の状態を表すEnum"""
@@ -38,6 +51,26 @@ class DiffResult(BaseModel):
     modified_entries: list[DiffEntry]
     def __bool__(self) -> bool: ...
 
+class DiffRecord(NamedTuple):
+    """SGPOFile.iter_diffが返す軽量な差分レコード"""
+
+    status: DiffStatus
+    msgctxt: Optional[str]
+    msgid: str
+    old_value: Optional[str] = None
+    new_value: Optional[str] = None
+    changed_fields: Tuple[str, ...] = ()
+
+class DiffSummary(NamedTuple):
+    """差分の件数のみを表す集計結果"""
+
+    new: int
+    removed: int
+    modified: int
+    def __bool__(self) -> bool: ...
+
+DIFF_FIELDS: Tuple[str, ...]
+
 class SGPOFile(POFile):
     """SmartGit用のPOファイル操作クラス"""
 
@@ -50,17 +83,35 @@ class SGPOFile(POFile):
     def from_text(cls, text: str) -> SGPOFile: ...
     @classmethod
     def _create_instance(cls, source: Union[str, PathLike[str]]) -> SGPOFile: ...
-    def import_unknown(self, unknown: SGPOFile) -> None: ...
-    def import_mismatch(self, mismatch: SGPOFile) -> None: ...
-    def import_pot(self, pot: SGPOFile) -> None: ...
+    def import_unknown(
+        self, unknown: SGPOFile, verbose: bool = True
+    ) -> ImportReport: ...
+    def import_mismatch(
+        self, mismatch: SGPOFile, verbose: bool = True
+    ) -> ImportReport: ...
+    def import_pot(
+        self, pot: SGPOFile, keep_sorted: bool = False, verbose: bool = True
+    ) -> ImportReport: ...
     def delete_extracted_comments(self) -> None: ...
+    def compact(self) -> None: ...
     def find_by_key(self, msgctxt: str, msgid: str) -> Optional[POEntry]: ...
+    def find_by_expanded_key(
+        self, msgctxt: str, msgid: str = ""
+    ) -> Optional[POEntry]: ...
+    def append(self, entry: POEntry) -> None: ...
+    def insert(self, index: int, entry: POEntry) -> None: ...
+    def extend(self, entries: Iterable[POEntry]) -> None: ...
+    def remove(self, entry: POEntry) -> None: ...
+    def pop(self, index: int = -1) -> POEntry: ...
+    def clear(self) -> None: ...
+    def reverse(self) -> None: ...
     def sort(
         self,
         *,
         key: Optional[Any] = None,
         reverse: bool = False,
     ) -> None: ...
+    def insert_sorted(self, entry: POEntry) -> int: ...
     def format(self) -> None: ...
     def save(
         self,
@@ -68,12 +119,41 @@ class SGPOFile(POFile):
         repr_method: str = "__unicode__",
         newline: Optional[str] = "\n",
     ) -> None: ...
+    def save_mo(self, fpath: str, hash_table: bool = True) -> None: ...
     def get_key_list(self) -> list[KeyTuple]: ...
     def check_duplicates(self) -> List[DuplicateEntry]: ...
+    def iter_duplicates(self) -> Iterator[DuplicateEntry]: ...
     def diff(self, other: SGPOFile) -> DiffResult: ...
+    def iter_diff(
+        self, other: SGPOFile, fields: Iterable[str] = ("msgstr",)
+    ) -> Iterator[DiffRecord]: ...
+    def diff_summary(
+        self, other: SGPOFile, fields: Iterable[str] = ("msgstr",)
+    ) -> DiffSummary: ...
+    def content_fingerprint(self) -> str: ...
+    def fingerprints(self) -> frozenset: ...
+    def changed_entries(self, other: SGPOFile) -> List[POEntry]: ...
+    @staticmethod
+    def diff_result_from_records(records: Iterable[DiffRecord]) -> DiffResult: ...
+    @classmethod
+    def merge3(
+        cls, base: SGPOFile, ours: SGPOFile, theirs: SGPOFile
+    ) -> MergeResult: ...
+    def _get_raw_key_index(self) -> KeyIndex: ...
+    def _get_key_index(self) -> KeyIndex: ...
+    @staticmethod
+    def _entries_by_msg_key(
+        entries: Iterable[POEntry],
+    ) -> Dict[Tuple[Optional[str], str], POEntry]: ...
+    @staticmethod
+    def _has_same_fingerprint(entry: POEntry, other: POEntry) -> bool: ...
+    @staticmethod
+    def _validate_diff_fields(fields: Iterable[str]) -> Tuple[str, ...]: ...
+    def _has_duplicate(self, entry: POEntry) -> bool: ...
     @staticmethod
     def _filter_po_metadata(meta_dict: Dict[str, str]) -> Dict[str, str]: ...
     def _po_entry_to_sort_key(self, po_entry: POEntry) -> str: ...
+    def _get_sort_key(self, po_entry: POEntry) -> str: ...
     @staticmethod
     def _po_entry_to_legacy_key(po_entry: POEntry) -> str: ...
     @staticmethod
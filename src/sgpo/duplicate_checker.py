@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import polib
 from pydantic import BaseModel, ConfigDict, Field
@@ -35,25 +35,76 @@ def check_msgctxt_duplicates(po_file: polib.POFile) -> List[DuplicateEntry]:
         po_file: チェック対象のPOファイル
 
     Returns:
-        重複エントリのリスト
+        重複エントリのリスト（1つ目のエントリ、2つ目のエントリの出現順）
+
+    Note:
+        各エントリのmsgctxtは一度だけ展開し、(msgid, 展開後のmsgctxt)で
+        バケットに振り分けて重複を検出します。
+        計算量はエントリ数と展開後のmsgctxt数の合計にほぼ比例します。
+    """
+    found = sorted(_iter_duplicate_pairs(po_file), key=lambda item: item[:2])
+    return [duplicate for _, _, duplicate in found]
+
+
+def iter_msgctxt_duplicates(po_file: polib.POFile) -> Iterator[DuplicateEntry]:
+    """
+    SmartGitの圧縮表記を考慮して重複エントリを検出した順に返す
+
+    Args:
+        po_file: チェック対象のPOファイル
+
+    Yields:
+        重複エントリ（2つ目のエントリを読み込んだ時点で返す）
+
+    Note:
+        GUIなどで結果を逐次表示するためのストリーミング版です。
+        返される重複の集合はcheck_msgctxt_duplicatesと同じですが、順序は
+        2つ目のエントリの出現順になります。
+    """
+    for _, _, duplicate in _iter_duplicate_pairs(po_file):
+        yield duplicate
+
+
+def _iter_duplicate_pairs(
+    po_file: polib.POFile,
+) -> Iterator[Tuple[int, int, DuplicateEntry]]:
     """
-    duplicates: List[DuplicateEntry] = []
-    for i, entry1 in enumerate(po_file):
-        for j, entry2 in enumerate(po_file):
-            if i >= j:  # 同じエントリ同士や、既にチェック済みの組み合わせはスキップ
-                continue
-            if entry1.msgid == entry2.msgid:  # msgidが同じ場合のみチェック
-                if _has_msgctxt_overlap(entry1.msgctxt, entry2.msgctxt):
-                    duplicates.append(
-                        DuplicateEntry(
-                            line1=entry1.linenum,
-                            line2=entry2.linenum,
-                            msgid=entry1.msgid,
-                            msgctxt1=entry1.msgctxt,
-                            msgctxt2=entry2.msgctxt,
-                        )
-                    )
-    return duplicates
+    (msgid, 展開後のmsgctxt)の転置インデックスを作りながら重複を検出する
+
+    Args:
+        po_file: チェック対象のPOファイル
+
+    Yields:
+        (1つ目のエントリの位置, 2つ目のエントリの位置, 重複エントリ)
+    """
+    entries: List[polib.POEntry] = []
+    buckets: Dict[Tuple[str, str], List[int]] = {}
+
+    for j, entry2 in enumerate(po_file):
+        msgctxt2 = entry2.msgctxt or ""
+        # 同じ展開結果が複数回現れても1回として扱う
+        expanded = dict.fromkeys(_expand_msgctxt(msgctxt2))
+
+        earlier: set[int] = set()
+        for ctxt in expanded:
+            bucket = buckets.setdefault((entry2.msgid, ctxt), [])
+            earlier.update(bucket)
+            bucket.append(j)
+        entries.append(entry2)
+
+        for i in sorted(earlier):
+            entry1 = entries[i]
+            yield (
+                i,
+                j,
+                DuplicateEntry(
+                    line1=entry1.linenum,
+                    line2=entry2.linenum,
+                    msgid=entry1.msgid,
+                    msgctxt1=entry1.msgctxt or "",
+                    msgctxt2=msgctxt2,
+                ),
+            )
 
 
 def _has_msgctxt_overlap(msgctxt1: str, msgctxt2: str) -> bool:
@@ -81,17 +132,68 @@ def _expand_msgctxt(msgctxt: str) -> List[str]:
         msgctxt: 展開対象のmsgctxt
 
     Returns:
-        展開後のmsgctxtのリスト
+        展開後のmsgctxtのリスト（表記の順序）
+
+    Note:
+        - 複数のグループ（"(a|b).(c|d)"）と入れ子のグループ（"(a|b(c|d))"）に
+          対応します
+        - 空の候補（"(a|)"の2つ目）は展開結果に含めません
+        - 括弧の対応が取れていない場合は、元の文字列をそのまま返します
     """
     # 圧縮表記がない場合は元の文字列をリストで返す
     if "(" not in msgctxt:
         return [msgctxt]
 
-    # 圧縮表記を展開
-    prefix = msgctxt[: msgctxt.find("(")]
-    compressed = msgctxt[msgctxt.find("(") + 1 : msgctxt.find(")")]
-    suffix = msgctxt[msgctxt.find(")") + 1 :]
+    try:
+        expanded, end = _expand_sequence(msgctxt, 0)
+    except ValueError:
+        return [msgctxt]
+    if end != len(msgctxt):
+        # 対応する"("のない")"または"|"がある
+        return [msgctxt]
+    return expanded
+
+
+def _expand_sequence(text: str, pos: int) -> Tuple[List[str], int]:
+    """
+    posから、グループの外側の")"または"|"の直前までを展開する
 
-    # | で区切られた部分を展開
-    parts = [part for part in compressed.split("|") if part]
-    return [f"{prefix}{part}{suffix}" for part in parts]
+    Returns:
+        (展開結果のリスト, 読み終えた位置)
+    """
+    results = [""]
+    start = pos
+    while pos < len(text):
+        char = text[pos]
+        if char == ")" or char == "|":
+            break
+        if char == "(":
+            literal = text[start:pos]
+            alternatives, pos = _expand_group(text, pos + 1)
+            results = [f"{r}{literal}{alt}" for r in results for alt in alternatives]
+            start = pos
+        else:
+            pos += 1
+    literal = text[start:pos]
+    return [f"{r}{literal}" for r in results], pos
+
+
+def _expand_group(text: str, pos: int) -> Tuple[List[str], int]:
+    """
+    "("の直後のposから、対応する")"までのグループを展開する
+
+    Returns:
+        (空でない候補のリスト, ")"の次の位置)
+
+    Raises:
+        ValueError: グループが閉じられていない場合
+    """
+    alternatives: List[str] = []
+    while True:
+        expanded, pos = _expand_sequence(text, pos)
+        alternatives.extend(alt for alt in expanded if alt)
+        if pos >= len(text):
+            raise ValueError(f"Unclosed group in msgctxt: {text}")
+        if text[pos] == ")":
+            return alternatives, pos + 1
+        pos += 1  # "|"
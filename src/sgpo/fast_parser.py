@@ -0,0 +1,504 @@
+"""SmartGit用POファイルの高速パーサー
+
+polibの行単位ステートマシンと同じ解釈でPOファイルを読み込み、
+SGPOFileを1パスで組み立てます。
+
+- 行の種類は先頭文字で判定し、コメント行以外ではトークン分割を行いません
+- エスケープを含まない文字列はunescapeを通しません
+- エントリはSGPOEntryとして直接生成し、SGPOFileへの再コピーを行いません
+
+SmartGitのロケールファイル（UTF-8、wrapwidth 9999）を前提としています。
+想定外の構文や文字コードを検出した場合は、polibによる通常の読み込みに
+切り替えるため、エラーメッセージを含めて結果はpolibと同じになります。
+"""
+
+from __future__ import annotations
+
+import codecs
+import re
+from typing import Callable, Dict, List, Optional, Tuple, cast
+
+import polib
+
+from .compact import CompactEntry
+from .core import SGPOFile
+from .fingerprint import store_fingerprint
+from .key_index import KeyIndex, SGPOEntry
+
+# polibと同じ「エスケープされていないダブルクォート」の判定
+_UNESCAPED_QUOTE_RE = re.compile(r'([^\\]|^)"')
+# polib.detect_encodingと同じ文字コードの検出パターン
+_CHARSET_RE = re.compile(r'"?Content-Type:.+? charset=([\w_\-:\.]+)')
+_BOM = codecs.BOM_UTF8.decode("utf-8")
+# str.splitlinesが行区切りとして扱う、改行文字以外の文字
+_EXTRA_LINE_BREAKS_RE = re.compile(r"[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# SmartGitのロケールファイルで大半を占める単純なエントリ
+# （フラグ、msgctxt、msgid、msgstrがそれぞれ1行に収まっているもの）
+# 後続の継続行などは通常の行単位の処理で現在のエントリに追加される
+_QUOTED = r'"([^"\\\n]*(?:\\.[^"\\\n]*)*)"\n'
+_SIMPLE_ENTRY_RE = re.compile(
+    r"(\n*)"
+    r"(?:#, (\S[^\n]*)\n)?"
+    r"(?:msgctxt " + _QUOTED + r")?"
+    r"msgid " + _QUOTED + r"msgstr " + _QUOTED
+)
+
+_KEYWORDS = {
+    "msgctxt": "ct",
+    "msgid": "mi",
+    "msgstr": "ms",
+    "msgid_plural": "mp",
+}
+_PREV_KEYWORDS = {
+    "msgid_plural": "pp",
+    "msgid": "pm",
+    "msgctxt": "pc",
+}
+_FIELD_BY_STATE = {
+    "ct": "msgctxt",
+    "mi": "msgid",
+    "mp": "msgid_plural",
+    "ms": "msgstr",
+    "pp": "previous_msgid_plural",
+    "pm": "previous_msgid",
+    "pc": "previous_msgctxt",
+}
+
+# polibの_POFileParserと同じ遷移表（シンボル -> 遷移元として許される状態）
+_ALL_STATES = frozenset(
+    ("st", "he", "gc", "oc", "fl", "ct", "pc", "pm", "pp", "tc", "ms", "mp", "mx", "mi")
+)
+_ALLOWED_FROM = {
+    "gc": _ALL_STATES,
+    "oc": _ALL_STATES,
+    "fl": _ALL_STATES,
+    "pc": _ALL_STATES,
+    "pm": _ALL_STATES,
+    "pp": _ALL_STATES,
+    "tc": _ALL_STATES - {"ct"},
+    "ct": frozenset(
+        ("st", "he", "gc", "oc", "fl", "tc", "pc", "pm", "pp", "ms", "mx")
+    ),
+    "mi": frozenset(
+        ("st", "he", "gc", "oc", "fl", "ct", "tc", "pc", "pm", "pp", "ms", "mx")
+    ),
+    "mp": frozenset(("tc", "gc", "pc", "pm", "pp", "mi")),
+    "ms": frozenset(("mi", "mp", "tc")),
+    "mx": frozenset(("mi", "mx", "mp", "tc")),
+    "mc": frozenset(("ct", "mi", "mp", "ms", "mx", "pm", "pp", "pc")),
+}
+# これらのシンボルはmsgstrの後に現れると新しいエントリを開始する
+_STARTS_ENTRY = frozenset(("tc", "gc", "oc", "fl", "pp", "pm", "pc", "ct", "mi"))
+
+
+class _FallbackRequired(Exception):
+    """高速パーサーで扱えない入力を検出したことを示す内部例外"""
+
+
+def parse_file(filename: str, compact: bool = False) -> SGPOFile:
+    """POファイルを高速パーサーで読み込みます。
+
+    Args:
+        filename: POファイルのパス
+        compact: Trueの場合、エントリを省メモリのCompactEntryとして作成します
+
+    Returns:
+        SGPOFileインスタンス
+
+    Raises:
+        ValueError: ファイルパスが無効な場合、または重複エントリがある場合
+        FileNotFoundError: ファイルが存在しない場合
+        IOError: POファイルの構文エラー
+
+    Note:
+        - 結果はSGPOFile.from_fileと同じです
+        - UTF-8以外の文字コードや想定外の構文の場合はpolibで読み込みます
+    """
+    SGPOFile._validate_filename(filename)
+    try:
+        with open(filename, encoding="utf-8") as f:
+            text = f.read()
+        return _build(text, fpath=filename, compact=compact)
+    except (_FallbackRequired, UnicodeDecodeError):
+        return _fallback(filename, compact)
+
+
+def parse_text(text: str, compact: bool = False) -> SGPOFile:
+    """POファイルの内容を高速パーサーで解析します。
+
+    Args:
+        text: POファイルの内容
+        compact: Trueの場合、エントリを省メモリのCompactEntryとして作成します
+
+    Returns:
+        SGPOFileインスタンス
+
+    Note:
+        - 結果はSGPOFile.from_textと同じです
+    """
+    try:
+        if _EXTRA_LINE_BREAKS_RE.search(text):
+            # polibはテキストをsplitlinesで分割するため、同じ行に揃える
+            text = "\n".join(text.splitlines())
+        return _build(text, fpath=None, compact=compact)
+    except _FallbackRequired:
+        return _fallback(text, compact)
+
+
+def _fallback(source: str, compact: bool) -> SGPOFile:
+    """polibで読み込む"""
+    instance = SGPOFile._create_instance(source)
+    if compact:
+        instance.compact()
+    return instance
+
+
+def _build(text: str, fpath: Optional[str], compact: bool = False) -> SGPOFile:
+    """POファイルの内容からSGPOFileを組み立てる
+
+    Args:
+        text: 改行文字（LF）で行が区切られたPOファイルの内容
+        fpath: 読み込み元のファイルパス（テキストから読む場合はNone）
+        compact: Trueの場合、エントリをCompactEntryとして作成する
+
+    Returns:
+        SGPOFileインスタンス
+    """
+    encoding = _detect_encoding(text)
+    make_entry = CompactEntry.from_fields if compact else _make_entry
+    header, entries = _parse_lines(text, make_entry)
+    metadata, metadata_is_fuzzy, entries = _extract_metadata(entries)
+    _check_duplicates(entries)
+    for entry in entries:
+        store_fingerprint(entry)
+
+    instance = SGPOFile.__new__(SGPOFile)
+    polib.POFile.__init__(
+        instance, fpath=fpath, encoding=encoding, check_for_duplicates=True
+    )
+    instance.wrapwidth = 9999
+    instance.header = header
+    instance.metadata = metadata
+    instance.metadata_is_fuzzy = metadata_is_fuzzy
+    instance._key_index = KeyIndex()
+    list.extend(instance, entries)
+    return instance
+
+
+def _detect_encoding(text: str) -> str:
+    """polib.detect_encodingと同じ規則で文字コードを判定する
+
+    Raises:
+        _FallbackRequired: UTF-8以外の文字コードが宣言されている場合
+    """
+    match = _CHARSET_RE.search(text)
+    if not match:
+        return cast(str, polib.default_encoding)
+    encoding = match.group(1).strip()
+    try:
+        codec = codecs.lookup(encoding)
+    except LookupError:
+        # "charset=CHARSET" のようなテンプレートはpolibと同様に既定値を使う
+        return cast(str, polib.default_encoding)
+    if codec.name != "utf-8":
+        raise _FallbackRequired()
+    return encoding
+
+
+def _new_fields(linenum: int) -> Dict:
+    """polib.POEntry()の初期状態と同じ属性辞書を返す"""
+    return {
+        "msgid": "",
+        "msgstr": "",
+        "msgid_plural": "",
+        "msgstr_plural": {},
+        "msgctxt": None,
+        "obsolete": False,
+        "encoding": polib.default_encoding,
+        "comment": "",
+        "tcomment": "",
+        "occurrences": [],
+        "flags": [],
+        "previous_msgctxt": None,
+        "previous_msgid": None,
+        "previous_msgid_plural": None,
+        "linenum": linenum,
+    }
+
+
+def _make_entry(fields: Dict) -> SGPOEntry:
+    entry = SGPOEntry.__new__(SGPOEntry)
+    entry.__dict__ = fields
+    return entry
+
+
+def _unquote(token: str) -> str:
+    value = token[1:-1]
+    if "\\" in value:
+        return cast(str, polib.unescape(value))
+    return value
+
+
+def _check_quotes(token: str) -> None:
+    inner = token[1:-1]
+    if '"' in inner and _UNESCAPED_QUOTE_RE.search(inner):
+        raise _FallbackRequired()
+
+
+def _parse_lines(
+    text: str, make_entry: Callable[[Dict], SGPOEntry] = _make_entry
+) -> Tuple[str, List[SGPOEntry]]:
+    """polibの_POFileParser.parseと同じ規則で行を解析する
+
+    Args:
+        text: 改行文字（LF）で行が区切られたPOファイルの内容
+        make_entry: 属性辞書からエントリを作成する関数
+
+    Returns:
+        (ヘッダーコメント, メタデータを含むエントリのリスト)
+
+    Raises:
+        _FallbackRequired: polibに処理を任せるべき入力の場合
+    """
+    entries: List[SGPOEntry] = []
+    header = ""
+    cur = _new_fields(0)
+    state = "st"
+    msgstr_index = 0
+    last_is_comment = False
+    seen_token = False
+    symbol: Optional[str]
+    allowed_from = _ALLOWED_FROM
+    match_simple = _SIMPLE_ENTRY_RE.match
+    find = text.find
+    pos = 0
+    end = len(text)
+    linenum = 0
+
+    while pos < end:
+        if state in ("st", "he", "ms", "mx"):
+            # 新しいエントリを開始できる位置では、単純なエントリを一度に読む
+            m = match_simple(text, pos)
+            if m is not None:
+                blank_lines, flags, msgctxt, msgid, msgstr = m.groups()
+                linenum += len(blank_lines)
+                if state in ("ms", "mx"):
+                    entries.append(make_entry(cur))
+                    cur = _new_fields(linenum + 1)
+                if flags is not None:
+                    cur["flags"] += [c.strip() for c in flags.split(",")]
+                    linenum += 1
+                if msgctxt is not None:
+                    cur["msgctxt"] = (
+                        polib.unescape(msgctxt) if "\\" in msgctxt else msgctxt
+                    )
+                    linenum += 1
+                cur["obsolete"] = 0
+                cur["msgid"] = polib.unescape(msgid) if "\\" in msgid else msgid
+                cur["msgstr"] = polib.unescape(msgstr) if "\\" in msgstr else msgstr
+                linenum += 2
+                pos = m.end()
+                state = "ms"
+                last_is_comment = False
+                seen_token = True
+                continue
+
+        newline = find("\n", pos)
+        if newline < 0:
+            newline = end
+        line = text[pos:newline]
+        pos = newline + 1
+        linenum += 1
+
+        if linenum == 1 and line.startswith(_BOM):
+            line = line[len(_BOM) :]
+        line = line.strip()
+        if not line:
+            continue
+        seen_token = True
+
+        obsolete = 0
+        if line[:2] == "#~":
+            tokens = line.split(None, 2)
+            if tokens[0] == "#~|":
+                last_is_comment = True
+                continue
+            if tokens[0] == "#~" and len(tokens) > 1:
+                if line[2] != " ":
+                    # polibは3文字目以降を切り出すため、その解釈に任せる
+                    raise _FallbackRequired()
+                line = line[3:].strip()
+                obsolete = 1
+
+        first = line[0]
+        last_is_comment = first == "#"
+
+        # --- 記号の判定（polibと同じ優先順位） ---
+        if first == '"':
+            _check_quotes(line)
+            symbol, token = "mc", line
+        elif first == "m":
+            parts = line.split(None, 1)
+            symbol = _KEYWORDS.get(parts[0]) if len(parts) > 1 else None
+            if symbol is not None:
+                token = parts[1]
+                _check_quotes(token)
+            elif line[:7] == "msgstr[":
+                symbol, token = "mx", line
+            else:
+                raise _FallbackRequired()
+        elif first == "#":
+            tokens = line.split(None, 2)
+            head = tokens[0]
+            if head == "#:":
+                if len(tokens) <= 1:
+                    continue
+                symbol, token = "oc", line
+            elif head == "#,":
+                if len(tokens) <= 1:
+                    continue
+                symbol, token = "fl", line
+            elif head == "#" or head.startswith("##"):
+                symbol, token = "tc", (line + " " if line == "#" else line)
+            elif head == "#.":
+                if len(tokens) <= 1:
+                    continue
+                symbol, token = "gc", line
+            elif head == "#|":
+                if len(tokens) <= 1:
+                    raise _FallbackRequired()
+                token = line[2:].lstrip()
+                if tokens[1].startswith('"'):
+                    # 直前の #| フィールドの継続行
+                    symbol = "mc"
+                elif len(tokens) == 2 or tokens[1] not in _PREV_KEYWORDS:
+                    raise _FallbackRequired()
+                else:
+                    token = token[len(tokens[1]) :].lstrip()
+                    symbol = _PREV_KEYWORDS[tokens[1]]
+            else:
+                raise _FallbackRequired()
+        else:
+            raise _FallbackRequired()
+
+        # --- 状態遷移 ---
+        if state not in allowed_from[symbol]:
+            raise _FallbackRequired()
+
+        if symbol in _STARTS_ENTRY and state in ("ms", "mx"):
+            entries.append(make_entry(cur))
+            cur = _new_fields(linenum)
+
+        if symbol == "mc":
+            value = _unquote(token)
+            if state == "mx":
+                cur["msgstr_plural"][msgstr_index] += value
+            else:
+                cur[_FIELD_BY_STATE[state]] += value
+            continue
+
+        if symbol == "tc":
+            if state in ("st", "he"):
+                if header != "":
+                    header += "\n"
+                header += token[2:]
+                state = "he"
+                continue
+            tcomment = token.lstrip("#")
+            if tcomment.startswith(" "):
+                tcomment = tcomment[1:]
+            cur["tcomment"] = (
+                cur["tcomment"] + "\n" + tcomment if cur["tcomment"] else tcomment
+            )
+        elif symbol == "mi":
+            cur["obsolete"] = obsolete
+            cur["msgid"] = _unquote(token)
+        elif symbol == "ms":
+            cur["msgstr"] = _unquote(token)
+        elif symbol == "ct":
+            cur["msgctxt"] = _unquote(token)
+        elif symbol == "fl":
+            cur["flags"] += [c.strip() for c in token[3:].split(",")]
+        elif symbol == "oc":
+            occurrences = cur["occurrences"]
+            for occurrence in token[3:].split():
+                fil, sep, lineno = occurrence.rpartition(":")
+                if not sep or not lineno.isdigit():
+                    fil, lineno = occurrence, ""
+                occurrences.append((fil, lineno))
+        elif symbol == "gc":
+            comment = token[3:]
+            cur["comment"] = (
+                cur["comment"] + "\n" + comment if cur["comment"] else comment
+            )
+        elif symbol == "mx":
+            try:
+                msgstr_index = int(token[7])
+            except ValueError:
+                raise _FallbackRequired() from None
+            value = token[token.find('"') + 1 : -1]
+            cur["msgstr_plural"][msgstr_index] = (
+                polib.unescape(value) if "\\" in value else value
+            )
+        else:
+            # mp, pp, pm, pc
+            cur[_FIELD_BY_STATE[symbol]] = _unquote(token)
+        state = symbol
+
+    # 最後のエントリは、最終行がコメントでない場合のみ追加される（polibと同じ）
+    if seen_token and not last_is_comment:
+        entries.append(make_entry(cur))
+
+    return header, entries
+
+
+def _extract_metadata(
+    entries: List[SGPOEntry],
+) -> Tuple[Dict[str, str], object, List[SGPOEntry]]:
+    """メタデータエントリを取り出して辞書に変換する
+
+    Args:
+        entries: メタデータを含むエントリのリスト
+
+    Returns:
+        (メタデータ, metadata_is_fuzzy, メタデータを除いたエントリのリスト)
+    """
+    # polib.POFile.find("")と同じ選び方
+    matches = [e for e in entries if not e.obsolete and e.msgid == ""]
+    if not matches:
+        return {}, 0, entries
+    metadata_entry = matches[0]
+    if len(matches) > 1:
+        for match in matches:
+            if not match.msgctxt:
+                metadata_entry = match
+
+    metadata: Dict[str, str] = {}
+    key = None
+    for msg in metadata_entry.msgstr.splitlines():
+        try:
+            key, val = msg.split(":", 1)
+            metadata[key] = val.strip()
+        except (ValueError, KeyError):
+            if key is not None:
+                metadata[key] += "\n" + msg.strip()
+
+    remaining = [e for e in entries if e is not metadata_entry]
+    return metadata, metadata_entry.flags, remaining
+
+
+def _check_duplicates(entries: List[SGPOEntry]) -> None:
+    """SGPOFile.appendと同じ基準で重複エントリを検出する
+
+    Raises:
+        ValueError: 重複エントリがある場合
+    """
+    seen = set()
+    for entry in entries:
+        key = (entry.msgctxt, entry.msgid)
+        if key in seen:
+            raise ValueError('Entry "%s" already exists' % entry.msgid)
+        if not entry.obsolete:
+            seen.add(key)
+
@@ -0,0 +1,173 @@
+"""エントリ内容のフィンガープリント
+
+エントリの内容（FINGERPRINT_FIELDS）から安定したハッシュ値を計算します。
+フィンガープリントが一致するエントリは内容も一致するとみなせるため、
+差分や変更の検出で、変更されていないエントリのフィールド比較を省略できます。
+
+フィンガープリントは読み込み時に計算してエントリに保持します。
+保持した値は、SGPOEntryのフィールドへの代入、またはフラグ・複数形の翻訳の
+直接の変更を検知すると再計算されます。
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Iterable, Optional, Tuple, Union, cast
+
+import polib
+
+# フィンガープリントの計算対象のフィールド
+FINGERPRINT_FIELDS = frozenset(
+    (
+        "msgctxt",
+        "msgid",
+        "msgstr",
+        "msgid_plural",
+        "msgstr_plural",
+        "flags",
+        "comment",
+        "tcomment",
+        "obsolete",
+    )
+)
+# エントリに保持するフィンガープリントの属性名
+FINGERPRINT_ATTR = "_sgpo_fingerprint"
+
+# フィールドの区切り文字と、Noneを表す文字
+_SEPARATOR = "\x00"
+_NONE = "\x01"
+
+_blake2b = hashlib.blake2b
+
+
+def compute_fingerprint(entry: polib.POEntry) -> bytes:
+    """エントリのフィンガープリントを計算します。
+
+    Args:
+        entry: 対象のエントリ
+
+    Returns:
+        8バイトのフィンガープリント（プロセスをまたいでも同じ値になります）
+    """
+    msgctxt = entry.msgctxt
+    msgstr_plural = entry.msgstr_plural
+    flags = entry.flags
+    data = _SEPARATOR.join(
+        (
+            _NONE if msgctxt is None else msgctxt,
+            entry.msgid,
+            entry.msgstr,
+            entry.msgid_plural or "",
+            _SEPARATOR.join("%s=%s" % item for item in sorted(msgstr_plural.items()))
+            if msgstr_plural
+            else "",
+            _SEPARATOR.join(flags) if flags else "",
+            entry.comment or "",
+            entry.tcomment or "",
+            "1" if entry.obsolete else "0",
+        )
+    )
+    return _blake2b(data.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+
+
+def store_fingerprint(entry: polib.POEntry) -> bytes:
+    """エントリのフィンガープリントを計算して保持します。
+
+    Args:
+        entry: 対象のエントリ
+
+    Returns:
+        フィンガープリント
+
+    Note:
+        フラグと複数形の翻訳は直接変更されても検知できないため、保持した時点の
+        値と一緒に保持します。どちらも空の場合はフィンガープリントだけを保持します。
+    """
+    fingerprint = compute_fingerprint(entry)
+    flags = entry.flags
+    msgstr_plural = entry.msgstr_plural
+    cached: Union[bytes, Tuple[bytes, tuple, tuple]]
+    if flags or msgstr_plural:
+        cached = (fingerprint, tuple(flags), tuple(msgstr_plural.items()))
+    else:
+        cached = fingerprint
+    object.__setattr__(entry, FINGERPRINT_ATTR, cached)
+    return fingerprint
+
+
+def get_fingerprint(entry: polib.POEntry) -> bytes:
+    """保持しているフィンガープリントを返します（なければ計算します）。
+
+    Args:
+        entry: 対象のエントリ
+
+    Returns:
+        フィンガープリント
+
+    Note:
+        __setattr__で変更を検知できないエントリ（polib.POEntryなど）は
+        保持せずに毎回計算します。
+    """
+    if type(entry).__setattr__ is object.__setattr__:
+        return compute_fingerprint(entry)
+
+    fingerprint = peek_fingerprint(entry)
+    if fingerprint is not None:
+        return fingerprint
+    return store_fingerprint(entry)
+
+
+def peek_fingerprint(entry: polib.POEntry) -> Optional[bytes]:
+    """保持している有効なフィンガープリントを返します（計算は行いません）。
+
+    Args:
+        entry: 対象のエントリ
+
+    Returns:
+        フィンガープリント。保持していない場合や、内容が変更されている場合はNone
+    """
+    if type(entry).__setattr__ is object.__setattr__:
+        return None
+    cached = getattr(entry, FINGERPRINT_ATTR, None)
+    if cached is None:
+        return None
+    if type(cached) is bytes:
+        if entry.flags or entry.msgstr_plural:
+            return None
+        return cached
+    if cached[1] != tuple(entry.flags) or cached[2] != tuple(
+        entry.msgstr_plural.items()
+    ):
+        return None
+    return cast(bytes, cached[0])
+
+
+def discard_fingerprint(entry: polib.POEntry) -> None:
+    """保持しているフィンガープリントを破棄します。
+
+    Args:
+        entry: 対象のエントリ
+    """
+    if getattr(entry, FINGERPRINT_ATTR, None) is not None:
+        object.__setattr__(entry, FINGERPRINT_ATTR, None)
+
+
+def combine_fingerprints(
+    fingerprints: Iterable[bytes], prefix: Optional[str] = None
+) -> str:
+    """フィンガープリントの並びから全体のフィンガープリントを計算します。
+
+    Args:
+        fingerprints: エントリのフィンガープリントの並び
+        prefix: 先頭に含める文字列（ヘッダーやメタデータなど）
+
+    Returns:
+        16進数文字列のフィンガープリント
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    if prefix is not None:
+        hasher.update(prefix.encode("utf-8", "surrogatepass"))
+        hasher.update(b"\x00")
+    for fingerprint in fingerprints:
+        hasher.update(fingerprint)
+    return hasher.hexdigest()
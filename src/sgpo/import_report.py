@@ -0,0 +1,105 @@
+"""エントリのインポート結果
+
+SGPOFile.import_unknown、import_mismatch、import_potの結果を保持します。
+インポート中はエントリごとに標準出力へ書き込まず、結果を記録するだけにして、
+表示が必要な場合は最後にまとめて文字列にしてから1回で書き込みます。
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import IO, Dict, List, NamedTuple, Optional
+
+
+class ImportRecord(NamedTuple):
+    """インポートで処理されたエントリ"""
+
+    msgctxt: Optional[str]
+    msgid: str
+    previous_msgid: Optional[str] = None  # 既存エントリのmsgidが異なる場合の値
+    message: Optional[str] = None  # 追加に失敗した場合のエラーメッセージ
+
+
+class ImportReport:
+    """インポート結果
+
+    Attributes:
+        title: インポートの種類（表示用）
+        added: 追加されたエントリ
+        skipped: 既に存在するため追加しなかったエントリ
+        modified: msgidを更新したエントリ
+        obsoleted: 廃止にしたエントリ
+        failed: 追加に失敗したエントリ
+    """
+
+    def __init__(self, title: str) -> None:
+        self.title = title
+        self.added: List[ImportRecord] = []
+        self.skipped: List[ImportRecord] = []
+        self.modified: List[ImportRecord] = []
+        self.obsoleted: List[ImportRecord] = []
+        self.failed: List[ImportRecord] = []
+
+    def __repr__(self) -> str:
+        counts = ", ".join(f"{name}={count}" for name, count in self.counts.items())
+        return f"ImportReport({self.title!r}, {counts})"
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """種類ごとの件数"""
+        return {
+            "added": len(self.added),
+            "skipped": len(self.skipped),
+            "modified": len(self.modified),
+            "obsoleted": len(self.obsoleted),
+            "failed": len(self.failed),
+        }
+
+    def format(self) -> str:
+        """人が読むための形式で結果を文字列にします。
+
+        Returns:
+            結果の文字列（エントリごとの詳細と件数の集計）
+        """
+        lines = [f"\n{self.title}"]
+        for record in self.skipped:
+            if record.previous_msgid is None:
+                lines.append("\nAlready exists.(Skipped)")
+            else:
+                lines.append("\nAlready exists. but,msgid has been changed.(Skipped)")
+                lines.append(f'\t\t#| msgid "{record.previous_msgid}"')
+            lines.extend(_format_key(record))
+        for record in self.added:
+            lines.append("\nNew entry added.")
+            lines.extend(_format_key(record))
+        for record in self.modified:
+            lines.append("\nmsgid has been changed.")
+            lines.append(f'\t\t#| msgid "{record.previous_msgid}"')
+            lines.extend(_format_key(record))
+        for record in self.obsoleted:
+            lines.append("\nEntry has been obsoleted.")
+            lines.extend(_format_key(record))
+        for record in self.failed:
+            lines.append(f"\n{record.message}")
+            lines.extend(_format_key(record))
+
+        lines.append("")
+        for name, count in self.counts.items():
+            lines.append(f"{count} entries {name}.")
+        lines.append("")
+        return "\n".join(lines)
+
+    def write(self, stream: Optional[IO[str]] = None) -> None:
+        """結果を1回の書き込みで出力します。
+
+        Args:
+            stream: 出力先（省略時は標準出力）
+        """
+        if stream is None:
+            stream = sys.stdout
+        stream.write(self.format())
+        stream.flush()
+
+
+def _format_key(record: ImportRecord) -> List[str]:
+    return [f'\t\tmsgctxt "{record.msgctxt}"', f'\t\tmsgid "{record.msgid}"']
@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import weakref
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import polib
+
+from .duplicate_checker import _expand_msgctxt
+from .fingerprint import FINGERPRINT_ATTR, FINGERPRINT_FIELDS
+
+IndexKey = Tuple[str, Optional[str]]
+
+# msgctxt/msgidが変更されると索引上のキーも変わる
+_KEY_FIELDS = frozenset(("msgctxt", "msgid"))
+
+
+def make_index_key(msgctxt: Optional[str], msgid: Optional[str]) -> IndexKey:
+    """エントリを識別する索引キーを生成する
+
+    Args:
+        msgctxt: メッセージコンテキスト
+        msgid: メッセージID
+
+    Returns:
+        (msgctxt, msgid)のタプル
+
+    Note:
+        SGPOFile._po_entry_to_key_tupleと同じ規則に従います。
+        - msgctxtが':'で終わる場合：msgctxtとmsgidを使用
+        - それ以外の場合：msgctxtと空文字を使用
+    """
+    msgctxt = msgctxt or ""
+    if msgctxt.endswith(":"):
+        return (msgctxt, msgid)
+    return (msgctxt, "")
+
+
+class SGPOEntry(polib.POEntry):
+    """キー索引に変更を通知するPOEntry
+
+    SGPOFileに追加されたpolib.POEntryはこのクラスに差し替えられます。
+    msgctxtまたはmsgidが直接書き換えられた場合、エントリを保持している
+    すべてのKeyIndexへ通知し、索引を更新させます。
+    内容のフィールドが書き換えられた場合は、保持しているフィンガープリントを
+    破棄します。
+    """
+
+    # sgpoが内部で保持する値の既定値（必要になったエントリにだけ設定する）
+    _sgpo_key_indexes: Tuple[weakref.ref, ...] = ()  # エントリを保持する索引
+    _sgpo_fingerprint = None  # fingerprint.store_fingerprintを参照
+    _sgpo_sort_key = None  # SGPOFile._get_sort_keyを参照
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in FINGERPRINT_FIELDS and self._sgpo_fingerprint is not None:
+            object.__setattr__(self, FINGERPRINT_ATTR, None)
+        if name not in _KEY_FIELDS:
+            object.__setattr__(self, name, value)
+            return
+
+        owners = self._sgpo_key_indexes
+        if not owners:
+            object.__setattr__(self, name, value)
+            return
+
+        old_key = make_index_key(self.msgctxt, self.msgid)
+        object.__setattr__(self, name, value)
+        if make_index_key(self.msgctxt, self.msgid) != old_key:
+            for ref in owners:
+                index = ref()
+                if index is not None:
+                    index.on_key_changed(self, old_key)
+
+    def __getstate__(self):
+        # 索引への参照はコピーやpickleに含めない
+        state = self.__dict__.copy()
+        state.pop("_sgpo_key_indexes", None)
+        return state
+
+
+class KeyIndex:
+    """KeyTupleの規則でエントリを引くためのハッシュ索引
+
+    同じキーを持つエントリが複数ある場合は、ファイル内の順序で保持します。
+    順序が保証できなくなる操作（ソートや任意位置への挿入など）の後は
+    invalidate()を呼び出し、次回の参照時に再構築させます。
+
+    展開キー索引（expanded_index()）を作成した場合、エントリの追加や削除、
+    無効化はその索引にも反映されます。
+    """
+
+    def __init__(self) -> None:
+        self._buckets: Dict[IndexKey, List[polib.POEntry]] = {}
+        self._valid = False
+        self._expanded: Optional[ExpandedKeyIndex] = None
+        # エントリからは弱参照で参照する（全エントリで同じ弱参照を共有する）
+        self._ref = weakref.ref(self)
+        self._owners = (self._ref,)
+
+    def __getstate__(self):
+        return {"_buckets": {}, "_valid": False, "_expanded": None}
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        self._ref = weakref.ref(self)
+        self._owners = (self._ref,)
+
+    @property
+    def is_valid(self) -> bool:
+        """索引が最新の状態かどうか"""
+        return self._valid
+
+    def invalidate(self) -> None:
+        """索引を無効化する（次回の参照時に再構築される）"""
+        self._valid = False
+        if self._expanded is not None:
+            self._expanded.invalidate()
+
+    def expanded_index(self) -> ExpandedKeyIndex:
+        """この索引と連動する展開キー索引を返す（再構築は行わない）"""
+        if self._expanded is None:
+            self._expanded = ExpandedKeyIndex()
+        return self._expanded
+
+    def rebuild(self, entries: Iterable[polib.POEntry]) -> None:
+        """エントリ列から索引を再構築する
+
+        Args:
+            entries: ファイル内の順序で並んだエントリ
+        """
+        self.clear()
+        for entry in entries:
+            self._add(entry)
+        self._valid = True
+        if self._expanded is not None:
+            # 展開キー索引は参照されるまで再構築しない
+            self._expanded.invalidate()
+
+    def clear(self) -> None:
+        """索引を空にする"""
+        for bucket in self._buckets.values():
+            for entry in bucket:
+                self._unwatch(entry)
+        self._buckets = {}
+        if self._expanded is not None:
+            self._expanded.clear()
+
+    def add(self, entry: polib.POEntry) -> None:
+        """エントリを末尾に追加したものとして索引に登録する"""
+        if self._valid:
+            self._add(entry)
+        if self._expanded is not None:
+            self._expanded.add(entry)
+
+    def insert(self, entry: polib.POEntry) -> None:
+        """エントリを任意の位置に挿入したものとして索引に登録する
+
+        同じキーのエントリが既にある場合は前後関係が分からないため、
+        索引を無効化します。
+        """
+        if self._valid and not any(
+            key in self._buckets for key in self._entry_keys(entry)
+        ):
+            self._add(entry)
+        else:
+            self._valid = False
+        if self._expanded is not None:
+            self._expanded.insert(entry)
+
+    def discard(self, entry: polib.POEntry) -> None:
+        """エントリを索引から取り除く"""
+        if self._expanded is not None:
+            self._expanded.discard(entry)
+        if not self._valid:
+            return
+        key = make_index_key(entry.msgctxt, entry.msgid)
+        bucket = self._buckets.get(key)
+        if bucket is None or not _remove_identical(bucket, entry):
+            return
+        if not bucket:
+            del self._buckets[key]
+        if not _contains_identical(bucket, entry):
+            self._unwatch(entry)
+
+    def get(self, key: IndexKey) -> List[polib.POEntry]:
+        """キーに一致するエントリをファイル内の順序で返す"""
+        return self._buckets.get(key, [])
+
+    def on_key_changed(self, entry: polib.POEntry, old_key: IndexKey) -> None:
+        """エントリのキーが変更されたときに呼ばれる
+
+        Args:
+            entry: 変更されたエントリ
+            old_key: 変更前の索引キー
+        """
+        if not self._valid:
+            return
+        bucket = self._buckets.get(old_key)
+        if bucket is None:
+            self._unwatch(entry)
+            return
+
+        moved = 0
+        while _remove_identical(bucket, entry):
+            moved += 1
+        if not bucket:
+            del self._buckets[old_key]
+        if moved == 0:
+            # 既にこの索引から外れたエントリ
+            self._unwatch(entry)
+            return
+
+        new_key = make_index_key(entry.msgctxt, entry.msgid)
+        new_bucket = self._buckets.setdefault(new_key, [])
+        if new_bucket:
+            # 既存エントリとの前後関係が分からないため再構築させる
+            self._valid = False
+            return
+        new_bucket.extend([entry] * moved)
+
+    # ======= Private methods =======
+    def _entry_keys(self, entry: polib.POEntry) -> Tuple[IndexKey, ...]:
+        """エントリを登録する索引キー"""
+        return (make_index_key(entry.msgctxt, entry.msgid),)
+
+    def _add(self, entry: polib.POEntry) -> None:
+        key = make_index_key(entry.msgctxt, entry.msgid)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            # ほとんどのキーはエントリが1件のため、余分な容量を確保しない
+            self._buckets[key] = [entry]
+        else:
+            bucket.append(entry)
+        self._watch(entry)
+
+    def _watch(self, entry: polib.POEntry) -> None:
+        if type(entry) is polib.POEntry:
+            entry.__class__ = SGPOEntry
+        if not isinstance(entry, SGPOEntry):
+            # 独自のエントリクラスは変更を追跡できない
+            return
+        owners = entry._sgpo_key_indexes
+        if not owners:
+            object.__setattr__(entry, "_sgpo_key_indexes", self._owners)
+        elif self._ref not in owners:
+            # 解放済みの索引への参照はここで取り除く
+            object.__setattr__(
+                entry,
+                "_sgpo_key_indexes",
+                tuple(ref for ref in owners if ref() is not None) + (self._ref,),
+            )
+
+    def _unwatch(self, entry: polib.POEntry) -> None:
+        owners = getattr(entry, "_sgpo_key_indexes", None)
+        if owners and self._ref in owners:
+            object.__setattr__(
+                entry,
+                "_sgpo_key_indexes",
+                tuple(ref for ref in owners if ref is not self._ref),
+            )
+
+
+class ExpandedKeyIndex(KeyIndex):
+    """SmartGitの圧縮表記を展開したキーでエントリを引くための索引
+
+    msgctxtが圧縮表記（例: "dlg.(a|b).title"）のエントリを、展開後の
+    すべてのmsgctxt（"dlg.a.title"、"dlg.b.title"）のキーで登録します。
+    索引キーの規則はKeyIndexと同じで、元のmsgctxtが':'で終わる場合のみ
+    msgidを含みます。
+    """
+
+    def discard(self, entry: polib.POEntry) -> None:
+        """エントリを索引から取り除く"""
+        if not self._valid:
+            return
+        keys = self._entry_keys(entry)
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket is None or not _remove_identical(bucket, entry):
+                continue
+            if not bucket:
+                del self._buckets[key]
+        if not any(_contains_identical(self.get(key), entry) for key in keys):
+            self._unwatch(entry)
+
+    def on_key_changed(self, entry: polib.POEntry, old_key: IndexKey) -> None:
+        """エントリのキーが変更されたときに呼ばれる
+
+        Args:
+            entry: 変更されたエントリ
+            old_key: 変更前の索引キー
+        """
+        if not self._valid:
+            return
+        old_keys = _expand_key(old_key)
+        if not old_keys:
+            # 展開結果のないエントリは、索引に含まれているか判断できない
+            self._valid = False
+            return
+
+        moved = 0
+        for key in old_keys:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                continue
+            count = 0
+            while _remove_identical(bucket, entry):
+                count += 1
+            if not bucket:
+                del self._buckets[key]
+            moved = max(moved, count)
+        if moved == 0:
+            # 既にこの索引から外れたエントリ
+            self._unwatch(entry)
+            return
+
+        new_keys = self._entry_keys(entry)
+        if moved > 1 or any(key in self._buckets for key in new_keys):
+            # 既存エントリとの前後関係が分からないため再構築させる
+            self._valid = False
+            return
+        for key in new_keys:
+            self._buckets[key] = [entry]
+
+    # ======= Private methods =======
+    def _entry_keys(self, entry: polib.POEntry) -> Tuple[IndexKey, ...]:
+        return _expand_key(make_index_key(entry.msgctxt, entry.msgid))
+
+    def _add(self, entry: polib.POEntry) -> None:
+        for key in self._entry_keys(entry):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                self._buckets[key] = [entry]
+            else:
+                bucket.append(entry)
+        # 展開結果がなくても、msgctxtの変更を検知するために追跡する
+        self._watch(entry)
+
+
+def _expand_key(key: IndexKey) -> Tuple[IndexKey, ...]:
+    """索引キーのmsgctxtを展開した索引キー（重複を除く）"""
+    msgctxt, msgid = key
+    if "(" not in msgctxt:
+        return (key,)
+    return tuple((ctxt, msgid) for ctxt in dict.fromkeys(_expand_msgctxt(msgctxt)))
+
+
+def _contains_identical(bucket: List[polib.POEntry], entry: polib.POEntry) -> bool:
+    return any(item is entry for item in bucket)
+
+
+def _remove_identical(bucket: List[polib.POEntry], entry: polib.POEntry) -> bool:
+    # list.removeは__eq__で比較するため、同一性で探して取り除く
+    for i, item in enumerate(bucket):
+        if item is entry:
+            del bucket[i]
+            return True
+    return False
@@ -0,0 +1,256 @@
+"""POファイルの3方向マージ
+
+共通の祖先（base）と2つの変更版（ours、theirs）を、SGPOFileと同じキーの規則
+（make_index_key）で対応付けてマージします。
+
+- 片方だけが変更したフィールドは、変更した側の値を採用します
+- 両方が同じ値に変更した場合は、その値を採用します
+- 両方が異なる値に変更した場合は競合とし、oursの値を残します
+- フラグは集合として3方向マージするため、競合になりません
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import polib
+
+from .compact import CompactEntry
+from .fingerprint import discard_fingerprint
+from .key_index import IndexKey, make_index_key
+
+# 3方向マージの対象フィールド（flagsは別途集合としてマージする。
+# msgctxtはキーの一部のため対象外）
+MERGE_FIELDS = (
+    "msgid",
+    "msgstr",
+    "msgid_plural",
+    "msgstr_plural",
+    "obsolete",
+    "comment",
+    "tcomment",
+    "occurrences",
+    "previous_msgid",
+    "previous_msgid_plural",
+    "previous_msgctxt",
+)
+
+# 競合の種類
+CONFLICT_CONTENT = "content"  # 両方が同じフィールドを異なる値に変更した
+CONFLICT_DELETED_IN_OURS = "deleted_in_ours"  # oursで削除、theirsで変更された
+CONFLICT_DELETED_IN_THEIRS = "deleted_in_theirs"  # theirsで削除、oursで変更された
+
+
+class MergeConflict(NamedTuple):
+    """3方向マージで自動解決できなかった変更
+
+    kindがCONFLICT_CONTENTの場合は、fieldと各版の値が格納されます。
+    削除と変更の競合では、fieldはNoneで、各版の値にはmsgstr（エントリが
+    ない版はNone）が格納されます。
+    """
+
+    kind: str
+    msgctxt: Optional[str]
+    msgid: str
+    field: Optional[str]
+    base_value: object
+    ours_value: object
+    theirs_value: object
+
+
+class MergeResult(NamedTuple):
+    """3方向マージの結果"""
+
+    merged: polib.POFile
+    conflicts: List[MergeConflict]
+
+
+def merge_entries(
+    base: Iterable[polib.POEntry],
+    ours: Iterable[polib.POEntry],
+    theirs: Iterable[polib.POEntry],
+) -> Tuple[List[polib.POEntry], List[MergeConflict]]:
+    """3つの版のエントリをマージします。
+
+    Args:
+        base: 共通の祖先のエントリ
+        ours: 自分の変更版のエントリ
+        theirs: 相手の変更版のエントリ
+
+    Returns:
+        (マージ後のエントリのリスト, 競合のリスト)
+
+    Note:
+        - マージ後のエントリはoursの順序に従い、theirsで追加されたエントリは
+          末尾にtheirsの順序で追加されます
+        - マージ後のエントリは入力のコピーで、入力のエントリは変更されません
+        - 同じキーのエントリが複数ある場合、2件目以降はoursの内容をそのまま使います
+    """
+    base_entries = _index_by_key(base)
+    theirs_entries = _index_by_key(theirs)
+
+    merged: List[polib.POEntry] = []
+    conflicts: List[MergeConflict] = []
+    seen: set = set()
+
+    for ours_entry in ours:
+        key = make_index_key(ours_entry.msgctxt, ours_entry.msgid)
+        if key in seen:
+            merged.append(_clone_entry(ours_entry))
+            continue
+        seen.add(key)
+
+        base_entry = base_entries.get(key)
+        theirs_entry = theirs_entries.get(key)
+        if theirs_entry is None:
+            if base_entry is None:
+                # oursで追加された
+                merged.append(_clone_entry(ours_entry))
+            elif not _is_unchanged(base_entry, ours_entry):
+                # theirsで削除されたがoursで変更されている
+                conflicts.append(
+                    _entry_conflict(
+                        CONFLICT_DELETED_IN_THEIRS,
+                        ours_entry,
+                        base_entry,
+                        ours_entry,
+                        None,
+                    )
+                )
+                merged.append(_clone_entry(ours_entry))
+            # 変更されていなければtheirsの削除を採用する
+            continue
+
+        merged.append(_merge_entry(base_entry, ours_entry, theirs_entry, conflicts))
+
+    for key, theirs_entry in theirs_entries.items():
+        if key in seen:
+            continue
+        base_entry = base_entries.get(key)
+        if base_entry is None:
+            # theirsで追加された
+            merged.append(_clone_entry(theirs_entry))
+        elif not _is_unchanged(base_entry, theirs_entry):
+            # oursで削除されたがtheirsで変更されている
+            conflicts.append(
+                _entry_conflict(
+                    CONFLICT_DELETED_IN_OURS,
+                    theirs_entry,
+                    base_entry,
+                    None,
+                    theirs_entry,
+                )
+            )
+            merged.append(_clone_entry(theirs_entry))
+        # 変更されていなければoursの削除を採用する
+
+    return merged, conflicts
+
+
+def _merge_entry(
+    base_entry: Optional[polib.POEntry],
+    ours_entry: polib.POEntry,
+    theirs_entry: polib.POEntry,
+    conflicts: List[MergeConflict],
+) -> polib.POEntry:
+    """両方の版にあるエントリをマージする"""
+    result = _clone_entry(ours_entry)
+    for field in MERGE_FIELDS:
+        ours_value = getattr(ours_entry, field)
+        theirs_value = getattr(theirs_entry, field)
+        if ours_value == theirs_value:
+            continue
+        base_value = getattr(base_entry, field) if base_entry is not None else None
+        if base_entry is not None and ours_value == base_value:
+            # theirsだけが変更した（コピーは索引に登録されていないため直接設定する）
+            object.__setattr__(result, field, _copy_value(theirs_value))
+            discard_fingerprint(result)
+        elif base_entry is not None and theirs_value == base_value:
+            # oursだけが変更した
+            continue
+        else:
+            conflicts.append(
+                MergeConflict(
+                    CONFLICT_CONTENT,
+                    ours_entry.msgctxt,
+                    ours_entry.msgid,
+                    field,
+                    base_value,
+                    ours_value,
+                    theirs_value,
+                )
+            )
+
+    if ours_entry.flags != theirs_entry.flags:
+        flags = _merge_flags(
+            base_entry.flags if base_entry is not None else [],
+            ours_entry.flags,
+            theirs_entry.flags,
+        )
+        object.__setattr__(result, "flags", flags)
+    return result
+
+
+def _merge_flags(base: List[str], ours: List[str], theirs: List[str]) -> List[str]:
+    """フラグを集合として3方向マージする（oursの順序を優先する）"""
+    removed = (set(base) - set(ours)) | (set(base) - set(theirs))
+    merged = [flag for flag in ours if flag not in removed]
+    merged += [flag for flag in theirs if flag not in removed and flag not in merged]
+    return merged
+
+
+def _index_by_key(entries: Iterable[polib.POEntry]) -> Dict[IndexKey, polib.POEntry]:
+    """キーからエントリを引く辞書を作成する（同じキーは最初のエントリを使う）"""
+    index: Dict[IndexKey, polib.POEntry] = {}
+    for entry in entries:
+        index.setdefault(make_index_key(entry.msgctxt, entry.msgid), entry)
+    return index
+
+
+def _is_unchanged(base_entry: polib.POEntry, entry: polib.POEntry) -> bool:
+    """エントリがbaseから変更されていないかどうか"""
+    if base_entry.flags != entry.flags:
+        return False
+    return all(
+        getattr(base_entry, field) == getattr(entry, field) for field in MERGE_FIELDS
+    )
+
+
+def _entry_conflict(
+    kind: str,
+    entry: polib.POEntry,
+    base_entry: polib.POEntry,
+    ours_entry: Optional[polib.POEntry],
+    theirs_entry: Optional[polib.POEntry],
+) -> MergeConflict:
+    return MergeConflict(
+        kind,
+        entry.msgctxt,
+        entry.msgid,
+        None,
+        base_entry.msgstr,
+        ours_entry.msgstr if ours_entry is not None else None,
+        theirs_entry.msgstr if theirs_entry is not None else None,
+    )
+
+
+def _clone_entry(entry: polib.POEntry) -> polib.POEntry:
+    """エントリをコピーする（copy.deepcopyより高速で、索引との関連は引き継がない）"""
+    if isinstance(entry, CompactEntry):
+        return entry.clone()
+    fields = entry.__dict__.copy()
+    fields.pop("_sgpo_key_indexes", None)
+    fields["flags"] = list(entry.flags)
+    fields["occurrences"] = list(entry.occurrences)
+    fields["msgstr_plural"] = dict(entry.msgstr_plural)
+    clone = object.__new__(type(entry))
+    clone.__dict__ = fields
+    return clone
+
+
+def _copy_value(value):
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return dict(value)
+    return value
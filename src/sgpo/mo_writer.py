@@ -0,0 +1,210 @@
+"""MOファイルの書き出し
+
+GNU gettextのmsgfmtと同じ形式（ハッシュ表を含む）でMOファイルを作成します。
+
+polib.POFile.save_as_mofileはバイト列の連結を繰り返してファイル全体を
+組み立てるため、エントリ数が増えると急激に遅くなります。
+このモジュールはオフセット表とハッシュ表をarrayで作成し、文字列は
+まとめて連結してから1回の書き込みで保存します。
+"""
+
+from __future__ import annotations
+
+from array import array
+from itertools import accumulate
+from operator import itemgetter
+from typing import List, Tuple
+
+import polib
+
+from .writer import atomic_write
+
+# MOファイルのマジックナンバー（書き込む環境のバイト順で格納する）
+MO_MAGIC = 0x950412DE
+
+# ヘッダーのサイズ（32ビット整数7個）
+_HEADER_SIZE = 7 * 4
+
+# (ソートとハッシュに使うキー, 原文の文字列, 翻訳の文字列)
+_Message = Tuple[bytes, bytes, bytes]
+
+
+def write_mofile(pofile: polib.POFile, fpath: str, hash_table: bool = True) -> None:
+    """POファイルをMOファイルとして保存します。
+
+    Args:
+        pofile: 保存するPOファイル
+        fpath: 保存先のパス
+        hash_table: Falseの場合はハッシュ表を出力しません
+            （msgfmtの--no-hashと同じ）
+
+    Raises:
+        ValueError: msgctxtとmsgidが同じエントリが複数ある場合
+
+    Note:
+        - 一時ファイルに書き出してから置き換えるため、保存中に失敗しても
+          元のファイルは壊れません
+    """
+    data = build_mo(pofile, hash_table)
+    with atomic_write(fpath, mode="wb") as f:
+        f.write(data)
+
+
+def build_mo(pofile: polib.POFile, hash_table: bool = True) -> bytes:
+    """POファイルからMOファイルの内容を作成します。
+
+    Args:
+        pofile: 対象のPOファイル
+        hash_table: Falseの場合はハッシュ表を出力しません
+
+    Returns:
+        MOファイルの内容
+
+    Raises:
+        ValueError: msgctxtとmsgidが同じエントリが複数ある場合
+
+    Note:
+        出力するエントリと内容はmsgfmtの既定の動作に合わせています。
+        - 廃止エントリ、fuzzyのエントリ（ヘッダーを除く）、未翻訳のエントリ
+          （複数形の場合は最初の翻訳が空のもの）は出力しません
+        - エントリはmsgctxtとmsgidのバイト列の順に並べます
+        - ハッシュ表の大きさとハッシュ関数はGNU gettextと同じです
+    """
+    messages = _collect_messages(pofile)
+    messages.sort(key=itemgetter(0))
+    for previous, current in zip(messages, messages[1:]):
+        if previous[0] == current[0]:
+            key = current[0].decode(pofile.encoding, "replace")
+            raise ValueError(f"Duplicate message definition: {key!r}")
+
+    count = len(messages)
+    hash_size = _hash_table_size(count) if hash_table else 0
+    orig_offset = _HEADER_SIZE
+    trans_offset = orig_offset + count * 8
+    hash_offset = trans_offset + count * 8
+    strings_offset = hash_offset + hash_size * 4
+
+    msgids = [msgid for _, msgid, _ in messages]
+    msgstrs = [msgstr for _, _, msgstr in messages]
+    orig_table, ids_end = _string_table(msgids, strings_offset)
+    trans_table, _ = _string_table(msgstrs, ids_end)
+
+    header = array(
+        "I",
+        (MO_MAGIC, 0, count, orig_offset, trans_offset, hash_size, hash_offset),
+    )
+    parts = [header.tobytes(), orig_table.tobytes(), trans_table.tobytes()]
+    if hash_size:
+        keys = [key for key, _, _ in messages]
+        parts.append(_build_hash_table(keys, hash_size).tobytes())
+    if count:
+        parts.append(b"\0".join(msgids))
+        parts.append(b"\0")
+        parts.append(b"\0".join(msgstrs))
+        parts.append(b"\0")
+    return b"".join(parts)
+
+
+def _collect_messages(pofile: polib.POFile) -> List[_Message]:
+    """MOファイルに出力するエントリを集める"""
+    encoding = pofile.encoding
+    messages: List[_Message] = []
+
+    header = pofile.metadata_as_entry()
+    if header.msgstr:
+        messages.append((b"", b"", header.msgstr.encode(encoding)))
+
+    for entry in pofile:
+        if entry.obsolete or "fuzzy" in entry.flags:
+            continue
+        if entry.msgid_plural:
+            forms = [entry.msgstr_plural[i] for i in sorted(entry.msgstr_plural)]
+            if not forms or not forms[0]:
+                continue
+            msgstr = "\0".join(forms).encode(encoding)
+        else:
+            if not entry.msgstr:
+                continue
+            msgstr = entry.msgstr.encode(encoding)
+
+        key = entry.msgid.encode(encoding)
+        if entry.msgctxt is not None:
+            key = b"%s\x04%s" % (entry.msgctxt.encode(encoding), key)
+        msgid = key
+        if entry.msgid_plural:
+            msgid = b"%s\0%s" % (key, entry.msgid_plural.encode(encoding))
+        messages.append((key, msgid, msgstr))
+    return messages
+
+
+def _string_table(strings: List[bytes], start: int) -> Tuple[array, int]:
+    """文字列の(長さ, オフセット)の表を作成する
+
+    Returns:
+        (表, 最後の文字列の終端の次のオフセット)
+    """
+    lengths = array("I", map(len, strings))
+    table = array("I", bytes(8 * len(strings)))
+    table[0::2] = lengths
+    # 各文字列は終端のNULを含めて連続して配置する
+    offsets = array("I", accumulate((length + 1 for length in lengths), initial=start))
+    end = offsets.pop()
+    table[1::2] = offsets
+    return table, end
+
+
+def _build_hash_table(keys: List[bytes], size: int) -> array:
+    """GNU gettextと同じ規則でハッシュ表を作成する（値は文字列の番号+1）"""
+    table = array("I", bytes(4 * size))
+    for number, key in enumerate(keys, 1):
+        hash_value = _hash_string(key)
+        index = hash_value % size
+        if table[index]:
+            increment = 1 + hash_value % (size - 2)
+            while True:
+                if index >= size - increment:
+                    index -= size - increment
+                else:
+                    index += increment
+                if not table[index]:
+                    break
+        table[index] = number
+    return table
+
+
+def _hash_string(data: bytes) -> int:
+    """GNU gettextのhash_string（PJWハッシュ）"""
+    hash_value = 0
+    for byte in data:
+        # 32ビットの符号なし整数として計算する（32ビットを超える桁上がりは捨てる）
+        hash_value = ((hash_value << 4) + byte) & 0xFFFFFFFF
+        high = hash_value & 0xF0000000
+        if high:
+            # 上位4ビットを下位へ折り返して取り除く
+            hash_value ^= high >> 24
+            hash_value ^= high
+    return hash_value
+
+
+def _hash_table_size(count: int) -> int:
+    """msgfmtと同じハッシュ表の大きさ（要素数の4/3以上の素数、3以上）"""
+    size = _next_prime(count * 4 // 3)
+    return size if size > 2 else 3
+
+
+def _next_prime(seed: int) -> int:
+    seed |= 1
+    while not _is_prime(seed):
+        seed += 2
+    return seed
+
+
+def _is_prime(candidate: int) -> bool:
+    # GNU gettextのis_primeと同じ判定（candidateは奇数）
+    divisor = 3
+    square = divisor * divisor
+    while square < candidate and candidate % divisor:
+        divisor += 1
+        square += 4 * divisor
+        divisor += 1
+    return candidate % divisor != 0
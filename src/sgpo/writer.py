@@ -0,0 +1,193 @@
+"""POファイルのストリーミング書き出し
+
+polib.POFile.saveはファイル全体を1つの文字列に組み立ててから書き込むため、
+大きなファイルではピーク時のメモリ使用量が倍になります。
+このモジュールはエントリを1件ずつバッファ付きのファイルへ書き出し、
+一時ファイルからのリネームでファイルを置き換えます。
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import re
+import shutil
+import uuid
+from typing import IO, Iterator, Optional
+
+import polib
+
+from .compact import CompactEntry
+from .key_index import SGPOEntry
+
+# 書き込みバッファのサイズ（バイト）
+WRITE_BUFFER_SIZE = 1 << 16
+
+# polib.escapeでエスケープされる文字と、str.splitlinesが行区切りとみなす文字
+_SPECIAL_CHARS_RE = re.compile(r'[\\"\t\n\r\x08\x0b\x0c\x1c-\x1e\x85\u2028\u2029]')
+
+# 既定の__unicode__を使うエントリクラス
+_PLAIN_ENTRY_TYPES = (polib.POEntry, SGPOEntry, CompactEntry)
+
+
+def write_pofile(
+    pofile: polib.POFile, fpath: str, newline: Optional[str] = "\n"
+) -> None:
+    """POファイルをエントリ単位で書き出します。
+
+    Args:
+        pofile: 書き出すPOファイル
+        fpath: 保存先のパス
+        newline: 改行コード（open()のnewline引数と同じ意味）
+
+    Note:
+        - 出力はpolib.POFile.__unicode__の結果と同じです
+        - 一時ファイルに書き出してから置き換えるため、保存中に失敗しても
+          元のファイルは壊れません
+    """
+    with atomic_write(fpath, encoding=pofile.encoding, newline=newline) as f:
+        for chunk in iter_pofile_chunks(pofile):
+            f.write(chunk)
+
+
+def iter_pofile_chunks(pofile: polib.POFile) -> Iterator[str]:
+    """POファイルの文字列表現をエントリ単位で生成します。
+
+    Args:
+        pofile: 対象のPOファイル
+
+    Yields:
+        POファイルの文字列表現の断片（連結するとpolib.POFile.__unicode__と同じ）
+    """
+    # ヘッダーコメント（polib.POFile.__unicode__と同じ規則）
+    header_lines = []
+    for header in pofile.header.split("\n"):
+        if not len(header):
+            header_lines.append("#\n")
+        elif header[:1] in [",", ":"]:
+            header_lines.append("#%s\n" % header)
+        else:
+            header_lines.append("# %s\n" % header)
+    yield "".join(header_lines)
+
+    wrapwidth = pofile.wrapwidth
+    yield pofile.metadata_as_entry().__unicode__(wrapwidth)
+    # polibと同じく、廃止エントリはファイルの末尾にまとめて出力する
+    for entry in pofile:
+        if not entry.obsolete:
+            yield "\n"
+            text = _format_simple_entry(entry, wrapwidth)
+            yield text if text is not None else entry.__unicode__(wrapwidth)
+    for entry in pofile:
+        if entry.obsolete:
+            yield "\n"
+            yield entry.__unicode__(wrapwidth)
+
+
+def _format_simple_entry(entry: polib.POEntry, wrapwidth: int) -> Optional[str]:
+    """単純なエントリをpolibと同じ形式で文字列にします。
+
+    Args:
+        entry: 対象のエントリ
+        wrapwidth: 折り返し幅
+
+    Returns:
+        エントリの文字列表現。単純なエントリでない場合はNone
+
+    Note:
+        コメントや複数形を持たず、各フィールドがエスケープも折り返しも
+        不要なエントリのみを対象とし、それ以外はpolibに任せます。
+    """
+    if (
+        type(entry) not in _PLAIN_ENTRY_TYPES
+        or entry.tcomment
+        or entry.comment
+        or entry.occurrences
+        or entry.msgid_plural
+        or entry.msgstr_plural
+        or entry.previous_msgctxt is not None
+        or entry.previous_msgid is not None
+        or entry.previous_msgid_plural is not None
+    ):
+        return None
+
+    msgctxt = entry.msgctxt
+    msgid = entry.msgid
+    msgstr = entry.msgstr
+    search = _SPECIAL_CHARS_RE.search
+    if search(msgid) or search(msgstr) or (msgctxt is not None and search(msgctxt)):
+        return None
+    if wrapwidth > 0:
+        # polibの_str_fieldと同じ判定（フィールド名 + 空白 + 引用符2つ）
+        if (
+            len(msgid) > wrapwidth - 8
+            or len(msgstr) > wrapwidth - 9
+            or (msgctxt is not None and len(msgctxt) > wrapwidth - 10)
+        ):
+            return None
+
+    parts = []
+    if entry.flags:
+        parts.append("#, %s\n" % ", ".join(entry.flags))
+    if msgctxt is not None:
+        parts.append('msgctxt "%s"\n' % msgctxt)
+    parts.append('msgid "%s"\nmsgstr "%s"\n' % (msgid, msgstr))
+    return "".join(parts)
+
+
+@contextlib.contextmanager
+def atomic_write(
+    fpath: str,
+    mode: str = "w",
+    encoding: Optional[str] = None,
+    newline: Optional[str] = None,
+) -> Iterator[IO]:
+    """一時ファイルに書き込み、成功した場合のみ保存先を置き換えます。
+
+    Args:
+        fpath: 保存先のパス
+        mode: "w"（テキスト）または"wb"（バイナリ）
+        encoding: テキストモードの文字コード
+        newline: テキストモードの改行コード
+
+    Yields:
+        一時ファイルのファイルオブジェクト
+
+    Note:
+        - 一時ファイルは保存先と同じディレクトリに作成されます
+        - 既存ファイルのパーミッションは引き継がれます
+    """
+    fpath = os.fspath(fpath)
+    directory, name = os.path.split(os.path.abspath(fpath))
+    tmp_path = os.path.join(directory, ".%s.%s.tmp" % (name, uuid.uuid4().hex))
+
+    # os.openで作成すると、umaskに従った通常のパーミッションになる
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        if "b" in mode:
+            f = os.fdopen(fd, mode, buffering=WRITE_BUFFER_SIZE)
+        else:
+            f = os.fdopen(
+                fd,
+                mode,
+                buffering=WRITE_BUFFER_SIZE,
+                encoding=encoding,
+                newline=newline,
+            )
+    except BaseException:
+        os.close(fd)
+        os.remove(tmp_path)
+        raise
+
+    try:
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(fpath):
+            shutil.copymode(fpath, tmp_path)
+        os.replace(tmp_path, fpath)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
@@ -1,15 +1,23 @@
 """コマンドラインインターフェース"""
 
 import argparse
+import asyncio
+import json
 from pathlib import Path
 
 from sgpo_editor.core.sgpo_adapter import SgpoFile as POFile
+from sgpo_editor.core.viewer_po_file import ViewerPOFile
 
 
 def main():
     """コマンドラインインターフェースのエントリポイント"""
     parser = argparse.ArgumentParser(description="POファイルビューワー")
     parser.add_argument("file", help="POファイルのパス")
+    parser.add_argument(
+        "--query-stats",
+        metavar="JSON",
+        help="POファイルの読み込みと表示で実行したSQL文の統計をJSONファイルに保存する",
+    )
     args = parser.parse_args()
 
     file_path = Path(args.file)
@@ -17,6 +25,9 @@ def main():
         print(f"エラー: ファイルが見つかりません: {file_path}")
         return 1
 
+    if args.query_stats:
+        return export_query_stats(file_path, Path(args.query_stats))
+
     po_file = POFile(file_path)
     stats = po_file.get_stats()
 
@@ -30,5 +41,30 @@ def main():
     return 0
 
 
+def export_query_stats(file_path: Path, output_path: Path) -> int:
+    """POファイルをエディタと同じ方法で読み込み、実行したSQL文の統計を保存する
+
+    読み込みの後、統計情報の取得と一覧の表示（フィルタなし）を一度ずつ行います。
+
+    Args:
+        file_path: POファイルのパス
+        output_path: 統計を保存するJSONファイルのパス
+    """
+    po_file = ViewerPOFile()
+    store = po_file.db_accessor.db
+    store.enable_query_stats()
+    asyncio.run(po_file.load(file_path))
+    po_file.get_stats()
+    po_file.get_filtered_entries()
+
+    # 読み込み中にデータベースが切り替わっていても、集計先は引き継がれる
+    stats = po_file.db_accessor.db.get_query_stats()
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, ensure_ascii=False, indent=2)
+
+    print(f"SQL文の統計を保存しました: {output_path}")
+    return 0
+
+
 if __name__ == "__main__":
     main()
@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 
 # デフォルト設定
 DEFAULT_CONFIG = {
-    # 使用するPOライブラリ（"polib" または "sgpo"）
+    # 使用するPOライブラリ（"polib"、"sgpo" または "sgpo_fast"）
     "po_library": "sgpo",
     # キャッシュ設定
     "cache": {
@@ -24,6 +24,17 @@ DEFAULT_CONFIG = {
         "prefetch_enabled": False,  # プリフェッチ機能の有効/無効
         "prefetch_size": 100,  # プリフェッチ時の取得件数
     },
+    # POファイルの解析結果キャッシュ設定
+    "parse_cache": {
+        "enabled": True,  # 解析結果キャッシュ有効/無効
+        "max_size_mb": 200,  # キャッシュファイルの合計サイズの上限（MB）
+        "directory": "",  # 保存先（空の場合はプラットフォームのキャッシュディレクトリ）
+    },
+    # 作業データベースの設定
+    "entry_store": {
+        "persistent": False,  # POファイルごとのデータベースをファイルに保存するか
+        "directory": "",  # 保存先（空の場合はプラットフォームのキャッシュディレクトリ）
+    },
     # UIの設定
     "ui": {
         # テーブルの列幅
@@ -14,12 +14,21 @@ ViewerPOFileクラスからデータベース操作の責務を分離します
 - フィルタリング操作は、まずキャッシュを確認し、キャッシュミスまたは強制更新フラグがある場合にDatabaseAccessorを使用
 """
 
+import base64
+import binascii
+import json
 import logging
-from typing import Optional, List, Dict, Set, Tuple
-import sqlite3
+from typing import Any, Iterable, NamedTuple, Optional, List, Dict, Set, Tuple, cast
+
+import apsw
 
 from sgpo_editor.models.database import InMemoryEntryStore
 from sgpo_editor.models.entry import EntryModel
+from sgpo_editor.models.statements import (
+    ENTRY_DETAIL_COLUMNS,
+    in_list_chunks,
+    statement,
+)
 from sgpo_editor.types import (
     EntryDict,
     EntryDictList,
@@ -30,6 +39,49 @@ from sgpo_editor.types import (
 
 logger = logging.getLogger(__name__)
 
+# advanced_searchのsearch_fieldsと全文検索テーブル（entries_fts）の列の対応
+_FTS_COLUMNS = {
+    "msgid": "msgid",
+    "msgstr": "msgstr",
+    "reference": "reference",
+    "translator_comment": "tcomment",
+    "tcomment": "tcomment",
+    "extracted_comment": "comment",
+    "comment": "comment",
+}
+
+# 全文検索テーブルのトークンの文字数（これより短い検索テキストは索引を使えない）
+_TRIGRAM_LENGTH = 3
+
+# 全文検索の列ごとの、エントリの値を表すSQL式
+_FIELD_EXPRESSIONS = {
+    "msgid": "e.msgid",
+    "msgstr": "e.msgstr",
+    "tcomment": "e.tcomment",
+    "comment": "e.comment",
+}
+
+# advanced_searchのsort_columnとソートに使うSQL式
+_SORT_EXPRESSIONS = {
+    "position": "d.position",
+    "msgid": "e.msgid",
+    "msgstr": "e.msgstr",
+    "fuzzy": "e.fuzzy",
+    "score": """(
+        SELECT qs.overall_score
+        FROM quality_scores qs
+        WHERE qs.entry_id = e.id
+    )""",
+}
+
+
+class SearchPage(NamedTuple):
+    """advanced_search_pageの結果（1ページ分のエントリ）"""
+
+    entries: EntryDictList
+    # 次のページを取得するための継続トークン（最後のページの場合はNone）
+    next_cursor: Optional[str]
+
 
 class DatabaseAccessor:
     """インメモリデータベースへのアクセスを抽象化するクラス
@@ -62,16 +114,71 @@ class DatabaseAccessor:
         logger.debug("DatabaseAccessor.clear_database: データベースをクリア")
         self.db.clear()
 
-    def add_entries_bulk(self, entries: EntryDictList) -> None:
+    def add_entries_bulk(self, entries: Iterable[EntryDict]) -> None:
         """複数のエントリを一括でデータベースに追加する
 
         Args:
-            entries: 追加するエントリのリスト
+            entries: 追加するエントリ（ジェネレータも可）
+        """
+        logger.debug("DatabaseAccessor.add_entries_bulk: エントリを一括追加")
+        self.db.add_entries_bulk(entries)
+
+    def bulk_load(self, entries: Iterable[EntryDict]) -> None:
+        """POファイルのエントリを読み込み用の設定で一括追加する
+
+        索引の作成などを読み込みの後にまとめて行うため、大量のエントリを
+        追加する場合はadd_entries_bulkより高速です。
+
+        Args:
+            entries: 追加するエントリ（ジェネレータも可）
+        """
+        logger.debug("DatabaseAccessor.bulk_load: エントリを一括読み込み")
+        self.db.bulk_load(entries)
+
+    def move_entries(self, keys: List[str], before_key: Optional[str] = None) -> None:
+        """エントリを指定したエントリの前に移動する
+
+        移動するエントリの表示順だけを更新します。
+
+        Args:
+            keys: 移動するエントリのキー（この順に並ぶ）
+            before_key: このキーのエントリの前に移動（Noneの場合は末尾）
+
+        Raises:
+            KeyError: キーに対応するエントリが存在しない場合
+            ValueError: before_keyが移動するエントリに含まれる場合
         """
         logger.debug(
-            f"DatabaseAccessor.add_entries_bulk: {len(entries)}件のエントリを一括追加"
+            f"DatabaseAccessor.move_entries: {len(keys)}件のエントリを{before_key}の前に移動"
         )
-        self.db.add_entries_bulk(entries)
+        self.db.move_entries(keys, before_key)
+
+    def insert_entry(self, entry: EntryDict, before_key: Optional[str] = None) -> None:
+        """エントリを追加し、指定したエントリの前に表示する
+
+        Args:
+            entry: 追加するエントリ
+            before_key: このキーのエントリの前に追加（Noneの場合は末尾）
+
+        Raises:
+            KeyError: before_keyに対応するエントリが存在しない場合
+        """
+        logger.debug(
+            f"DatabaseAccessor.insert_entry: キー={entry.get('key')}を{before_key}の前に追加"
+        )
+        self.db.insert_entry(entry, before_key)
+
+    def delete_entry(self, key: str) -> bool:
+        """エントリを削除する
+
+        Args:
+            key: 削除するエントリのキー
+
+        Returns:
+            bool: 削除した場合はTrue、エントリが存在しない場合はFalse
+        """
+        logger.debug(f"DatabaseAccessor.delete_entry: キー={key}のエントリを削除")
+        return bool(self.db.delete_entry(key))
 
     def get_entry_by_key(self, key: str) -> Optional[EntryDict]:
         """キーでエントリを取得する
@@ -88,8 +195,8 @@ class DatabaseAccessor:
             エントリの辞書、存在しない場合はNone
         """
         logger.debug(f"DatabaseAccessor.get_entry_by_key: キー={key}のエントリを取得")
-        with self.db.transaction() as cur:
-            cur.execute("SELECT * FROM entries WHERE key = ?", (key,))
+        with self.db.read_transaction() as cur:
+            cur.execute(statement("entry_by_key"), (key,))
             row = cur.fetchone()
             if row:
                 columns = [desc[0] for desc in cur.description]
@@ -113,27 +220,21 @@ class DatabaseAccessor:
             return {}
 
         entries_dict = {}
-        with self.db.transaction() as cur:
-            placeholders = ", ".join(["?"] * len(keys))
-
-            cur.execute(
-                f"""
-                SELECT
-                    e.*,
-                    d.position
-                FROM entries e
-                LEFT JOIN display_order d ON e.id = d.entry_id
-                WHERE e.key IN ({placeholders})
-                """,
-                keys,
-            )
-            self.last_cursor_description = cur.description
+        with self.db.read_transaction() as cur:
+            # キーの数によらず同じSQL文を再利用できるよう、要素数を揃えて取得する
+            for chunk in in_list_chunks(keys):
+                cur.execute(statement("entries_by_keys", keys=len(chunk)), chunk)
+                try:
+                    columns = [desc[0] for desc in cur.description]
+                except apsw.ExecutionCompleteError:
+                    # 一致する行がない場合、apswは列情報を返さない
+                    continue
 
-            for row in cur.fetchall():
-                entry_dict = self._row_to_entry_dict(row)
-                key = entry_dict.get("key", "")
-                if key:
-                    entries_dict[key] = entry_dict
+                for row in cur.fetchall():
+                    entry_dict = self._row_to_entry_dict(dict(zip(columns, row)))
+                    key = entry_dict.get("key", "")
+                    if key:
+                        entries_dict[key] = entry_dict
 
         return entries_dict
 
@@ -145,8 +246,8 @@ class DatabaseAccessor:
         """
         logger.debug("DatabaseAccessor.get_all_entries: すべてのエントリを取得")
         entries = []
-        with self.db.transaction() as cur:
-            cur.execute("SELECT * FROM entries")
+        with self.db.read_transaction() as cur:
+            cur.execute(statement("all_entries"))
             columns = [desc[0] for desc in cur.description]
             for row in cur.fetchall():
                 entry_dict = dict(zip(columns, row))
@@ -165,25 +266,10 @@ class DatabaseAccessor:
 
         # データベースからすべてのエントリの基本情報を取得
         entries = {}
-        with self.db.transaction() as cur:
-            cur.execute(
-                """
-                SELECT key, msgid, msgstr, fuzzy, obsolete
-                FROM entries
-                """
-            )
-            # 件数デバッグ出力
-            cur.execute(
-                """
-                SELECT key, msgid, msgstr, fuzzy, obsolete
-                FROM entries
-                """
-            )
-            columns = [desc[0] for desc in cur.description]
-            rows = cur.fetchall()
-            print(f"[DEBUG] 取得時の件数: {len(rows)}")
-            for row in rows:
-                print(f"columns: {columns}, row: {row}, type(row): {type(row)}")
+        with self.db.read_transaction() as cur:
+            cur.execute(statement("all_entries_basic_info"))
+            columns = ["key", "msgid", "msgstr", "fuzzy", "obsolete"]
+            for row in cur.fetchall():
                 row_dict = dict(zip(columns, row))
                 key = row_dict["key"]
                 entries[key] = {
@@ -195,7 +281,6 @@ class DatabaseAccessor:
                     "position": 0,  # デフォルト値を設定
                 }
 
-        print(f"entries(keys): {list(entries.keys())}, entries: {entries}")
         return entries
 
     def get_entry_basic_info(self, key: str) -> Optional[EntryDict]:
@@ -211,16 +296,8 @@ class DatabaseAccessor:
             f"DatabaseAccessor.get_entry_basic_info: キー={key}の基本情報を取得"
         )
 
-        with self.db.transaction() as cur:
-            cur.execute(
-                """
-                SELECT
-                    e.key, e.msgid, e.msgstr, e.fuzzy, e.obsolete
-                FROM entries e
-                WHERE e.key = ?
-                """,
-                (key,),
-            )
+        with self.db.read_transaction() as cur:
+            cur.execute(statement("entry_basic_info"), (key,))
             row = cur.fetchone()
 
             if not row:
@@ -527,17 +604,11 @@ class DatabaseAccessor:
                     entry_data,
                 )
 
-                keys = list(entries_dict.keys())
-                placeholders = ", ".join(["?"] * len(keys))
-                cur.execute(
-                    f"""
-                    SELECT id, key FROM entries
-                    WHERE key IN ({placeholders})
-                    """,
-                    keys,
-                )
-
-                id_map = {key: entry_id for entry_id, key in cur.fetchall()}
+                id_map: Dict[str, int] = {}
+                for chunk in in_list_chunks(list(entries_dict.keys())):
+                    cur.execute(statement("entry_ids_by_keys", keys=len(chunk)), chunk)
+                    rows = cast(List[Tuple[int, str]], cur.fetchall())
+                    id_map.update((key, entry_id) for entry_id, key in rows)
 
                 references = []
                 flags = []
@@ -613,6 +684,16 @@ class DatabaseAccessor:
 
         Returns:
             検索条件に一致するエントリのリスト
+
+        Note:
+            search_textの検索にはtrigramの全文検索テーブル（entries_fts）を使用します。
+            - 部分一致では、検索テキスト全体を含むエントリが一致します
+              （大文字・小文字の区別はLOWERと同じくASCII文字のみ）
+            - 全文検索で候補を絞り込んだ後、フィールドの値で部分一致・完全一致を
+              確認するため、結果は全文検索を使わない場合と同じです
+            - 3文字未満の検索テキストは全文検索で絞り込めないため、全件を走査します
+            - 結果の並び順は全文検索の有無によらず、sort_columnに従います
+              （同じ値の間は表示順、エントリIDの順）
         """
         logger.debug(
             f"DatabaseAccessor.advanced_search: search_text={search_text}, "
@@ -621,148 +702,210 @@ class DatabaseAccessor:
             f"limit={limit}, offset={offset}"
         )
 
-        # 検索フィールド指定がない場合はデフォルト値を使用
-        if not search_fields:
-            search_fields = ["msgid", "msgstr"]
-
         # InMemoryEntryStoreはadvanced_searchのパラメータをすべてサポートしていないため、
         # SQL文を直接構築して実行する
-
-        # SQLクエリのパラメータ
-        params = []
+        where_conditions, params = self._build_search_conditions(
+            search_text,
+            search_fields,
+            flag_conditions,
+            translation_status,
+            exact_match,
+            case_sensitive,
+        )
 
         # 基本クエリ
-        query = """
-            SELECT e.*, d.position AS position
+        query = f"""
+            SELECT e.*, d.position AS position, {ENTRY_DETAIL_COLUMNS}
             FROM entries e
             LEFT JOIN display_order d ON e.id = d.entry_id
         """
 
-        # WHERE句の条件を格納するリスト
-        where_conditions = []
+        # WHERE句を構築
+        if where_conditions:
+            query += " WHERE " + " AND ".join(where_conditions)
 
-        # 検索テキストフィルタ
-        if search_text:
-            # 検索フィールドごとの条件を構築
-            search_field_conditions = []
+        # ソート条件を追加（ソート列とソート順はSQLインジェクションを防ぐため固定値から選ぶ）
+        sort_column = sort_column if sort_column in _SORT_EXPRESSIONS else "position"
+        direction = _sort_direction(sort_order)
+        # 同じ値の間は、advanced_search_pageと同じく表示順、エントリIDの順に並べる
+        sort_keys = ["d.position", "e.id"]
+        if sort_column != "position":
+            sort_keys.insert(0, _SORT_EXPRESSIONS[sort_column])
+        query += " ORDER BY " + ", ".join(f"{key} {direction}" for key in sort_keys)
 
-            for field in search_fields:
-                if field == "msgid":
-                    if exact_match:
-                        if case_sensitive:
-                            search_field_conditions.append("e.msgid = ?")
-                        else:
-                            search_field_conditions.append("LOWER(e.msgid) = LOWER(?)")
-                    else:
-                        if case_sensitive:
-                            search_field_conditions.append("e.msgid LIKE ?")
-                        else:
-                            search_field_conditions.append(
-                                "LOWER(e.msgid) LIKE LOWER(?)"
-                            )
+        # LIMIT と OFFSET の追加（値はパラメータにして、ページごとに同じSQL文を使う）
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+            if offset is not None and offset > 0:
+                query += " OFFSET ?"
+                params.append(offset)
 
-                    if exact_match:
-                        params.append(search_text)
-                    else:
-                        params.append(f"%{search_text}%")
-
-                elif field == "msgstr":
-                    if exact_match:
-                        if case_sensitive:
-                            search_field_conditions.append("e.msgstr = ?")
-                        else:
-                            search_field_conditions.append("LOWER(e.msgstr) = LOWER(?)")
-                    else:
-                        if case_sensitive:
-                            search_field_conditions.append("e.msgstr LIKE ?")
-                        else:
-                            search_field_conditions.append(
-                                "LOWER(e.msgstr) LIKE LOWER(?)"
-                            )
+        # クエリ実行と結果の取得
+        logger.debug(f"DatabaseAccessor.advanced_search: SQLクエリ実行: {query}")
+        logger.debug(f"DatabaseAccessor.advanced_search: SQLパラメータ: {params}")
+        result = self._fetch_entry_dicts(query, params)
 
-                    if exact_match:
-                        params.append(search_text)
-                    else:
-                        params.append(f"%{search_text}%")
-
-                elif field == "reference":
-                    if exact_match:
-                        if case_sensitive:
-                            search_field_conditions.append("""
-                                EXISTS (
-                                    SELECT 1 FROM entry_references r 
-                                    WHERE r.entry_id = e.id AND r.reference = ?
-                                )
-                            """)
-                        else:
-                            search_field_conditions.append("""
-                                EXISTS (
-                                    SELECT 1 FROM entry_references r 
-                                    WHERE r.entry_id = e.id AND LOWER(r.reference) = LOWER(?)
-                                )
-                            """)
-                    else:
-                        if case_sensitive:
-                            search_field_conditions.append("""
-                                EXISTS (
-                                    SELECT 1 FROM entry_references r 
-                                    WHERE r.entry_id = e.id AND r.reference LIKE ?
-                                )
-                            """)
-                        else:
-                            search_field_conditions.append("""
-                                EXISTS (
-                                    SELECT 1 FROM entry_references r 
-                                    WHERE r.entry_id = e.id AND LOWER(r.reference) LIKE LOWER(?)
-                                )
-                            """)
-
-                    if exact_match:
-                        params.append(search_text)
-                    else:
-                        params.append(f"%{search_text}%")
-
-                elif field == "translator_comment" or field == "tcomment":
-                    if exact_match:
-                        if case_sensitive:
-                            search_field_conditions.append("e.tcomment = ?")
-                        else:
-                            search_field_conditions.append(
-                                "LOWER(e.tcomment) = LOWER(?)"
-                            )
-                    else:
-                        if case_sensitive:
-                            search_field_conditions.append("e.tcomment LIKE ?")
-                        else:
-                            search_field_conditions.append(
-                                "LOWER(e.tcomment) LIKE LOWER(?)"
-                            )
+        logger.debug(
+            f"DatabaseAccessor.advanced_search: {len(result)}件のエントリを取得"
+        )
+        return result
 
-                    if exact_match:
-                        params.append(search_text)
-                    else:
-                        params.append(f"%{search_text}%")
-
-                elif field == "extracted_comment" or field == "comment":
-                    if exact_match:
-                        if case_sensitive:
-                            search_field_conditions.append("e.comment = ?")
-                        else:
-                            search_field_conditions.append(
-                                "LOWER(e.comment) = LOWER(?)"
-                            )
-                    else:
-                        if case_sensitive:
-                            search_field_conditions.append("e.comment LIKE ?")
-                        else:
-                            search_field_conditions.append(
-                                "LOWER(e.comment) LIKE LOWER(?)"
-                            )
+    def advanced_search_page(
+        self,
+        search_text: Optional[str] = None,
+        search_fields: Optional[List[str]] = None,
+        sort_column: Optional[str] = None,
+        sort_order: Optional[str] = None,
+        flag_conditions: Optional[FlagConditions] = None,
+        translation_status: Optional[str] = None,
+        exact_match: bool = False,
+        case_sensitive: bool = False,
+        page_size: int = 100,
+        cursor: Optional[str] = None,
+    ) -> SearchPage:
+        """検索結果を1ページ分取得する（キーセットページング）
+
+        OFFSETで読み飛ばす代わりに、前のページの最後のエントリの
+        (ソート値, 表示順, ID)より後ろのエントリを取得します。
+        表示順で並べる場合は索引をたどるため、何ページ目であっても
+        1ページの取得時間は変わりません。
+
+        Args:
+            search_text: 検索テキスト
+            search_fields: 検索対象のフィールド（省略時は["msgid", "msgstr"]）
+            sort_column: ソートするカラム
+            sort_order: ソート順序（"asc" または "desc"）
+            flag_conditions: フラグ条件
+            translation_status: 翻訳ステータス
+            exact_match: 完全一致で検索するかどうか
+            case_sensitive: 大文字・小文字を区別するかどうか
+            page_size: 1ページに含める最大件数
+            cursor: 前のページのnext_cursor（省略時は最初のページ）
+
+        Returns:
+            SearchPage: ページのエントリと、次のページの継続トークン
+
+        Raises:
+            ValueError: cursorが不正な場合、または別の並び順で作成された場合
+
+        Note:
+            - 並び順はadvanced_searchと同じで、同じ値の間は表示順、エントリIDの順です
+            - 表示順（display_order）のないエントリは含まれません
+            - 継続トークンの位置から取得を再開するため、ページの取得の間に
+              エントリが追加・削除されても、取得済みのエントリは重複しません
+        """
+        if page_size <= 0:
+            raise ValueError(f"page_sizeは1以上を指定してください: {page_size}")
+
+        sort_column = sort_column if sort_column in _SORT_EXPRESSIONS else "position"
+        direction = _sort_direction(sort_order)
+        # 並び順が一意になるよう、表示順とエントリIDを加える
+        sort_keys = ["d.position", "e.id"]
+        if sort_column == "score":
+            # スコアのないエントリ（NULL）は行値で比較できないため、
+            # ソートで先頭になる値に置き換える
+            sort_keys.insert(0, f"COALESCE({_SORT_EXPRESSIONS['score']}, -1)")
+        elif sort_column != "position":
+            sort_keys.insert(0, _SORT_EXPRESSIONS[sort_column])
+
+        where_conditions, params = self._build_search_conditions(
+            search_text,
+            search_fields,
+            flag_conditions,
+            translation_status,
+            exact_match,
+            case_sensitive,
+        )
+        if cursor is not None:
+            operator = "<" if direction == "DESC" else ">"
+            placeholders = ", ".join("?" * len(sort_keys))
+            where_conditions.append(
+                f"({', '.join(sort_keys)}) {operator} ({placeholders})"
+            )
+            params.extend(_decode_cursor(cursor, sort_column, direction))
+
+        query = f"""
+            SELECT
+                e.*, d.position AS position, {ENTRY_DETAIL_COLUMNS},
+                {sort_keys[0]} AS page_sort_value
+            FROM entries e
+            JOIN display_order d ON e.id = d.entry_id
+        """
+        if where_conditions:
+            query += " WHERE " + " AND ".join(where_conditions)
+        query += " ORDER BY " + ", ".join(f"{key} {direction}" for key in sort_keys)
+        # 次のページがあるか判断するため、1件多く取得する
+        query += " LIMIT ?"
+        params.append(int(page_size) + 1)
+
+        with self.db.read_transaction() as cur:
+            cur.execute(query, params)
+            try:
+                columns = [desc[0] for desc in cur.description]
+            except apsw.ExecutionCompleteError:
+                # 一致する行がない場合、apswは列情報を返さない
+                return SearchPage([], None)
+            rows = [dict(zip(columns, row)) for row in cur.fetchall()]
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            keys = [last["position"], last["id"]]
+            if sort_column != "position":
+                keys.insert(0, last["page_sort_value"])
+            next_cursor = _encode_cursor(sort_column, direction, keys)
+
+        entries = [self._row_to_entry_dict(row) for row in rows]
+        logger.debug(
+            f"DatabaseAccessor.advanced_search_page: {len(entries)}件のエントリを取得"
+        )
+        return SearchPage(entries, next_cursor)
+
+    def _build_search_conditions(
+        self,
+        search_text: Optional[str],
+        search_fields: Optional[List[str]],
+        flag_conditions: Optional[FlagConditions],
+        translation_status: Optional[str],
+        exact_match: bool,
+        case_sensitive: bool,
+    ) -> Tuple[List[str], list]:
+        """advanced_searchの検索条件をWHERE句の条件に変換する
+
+        Returns:
+            Tuple[List[str], list]: (ANDで結合する条件のリスト, SQLパラメータ)
+        """
+        # 検索フィールド指定がない場合はデフォルト値を使用
+        if not search_fields:
+            search_fields = ["msgid", "msgstr"]
+
+        # SQLクエリのパラメータ
+        params = []
 
-                    if exact_match:
-                        params.append(search_text)
-                    else:
-                        params.append(f"%{search_text}%")
+        # WHERE句の条件を格納するリスト
+        where_conditions = []
+
+        # 検索テキストフィルタ
+        if search_text:
+            columns = _fts_columns(search_fields)
+            fts_query = _build_fts_query(search_text, columns)
+            if fts_query is not None:
+                # 全文検索の索引で候補を絞り込む（全件の走査を避ける）
+                where_conditions.append(
+                    "e.id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)"
+                )
+                params.append(fts_query)
+
+            # 候補をフィールドの値で確認する（絞り込めない場合は全件を走査する）
+            search_field_conditions = []
+            for column in columns:
+                condition, value = _field_search_condition(
+                    column, search_text, exact_match, case_sensitive
+                )
+                search_field_conditions.append(condition)
+                params.append(value)
 
             # 検索フィールド条件をORで結合
             if search_field_conditions:
@@ -828,61 +971,19 @@ class DatabaseAccessor:
                         """)
                         params.append(flag_name)
 
-        # WHERE句を構築
-        if where_conditions:
-            query += " WHERE " + " AND ".join(where_conditions)
-
-        # ソート順の決定
-        valid_sort_columns = {
-            "position": "d.position",
-            "msgid": "e.msgid",
-            "msgstr": "e.msgstr",
-            "fuzzy": "e.fuzzy",
-            "score": """(
-                SELECT qs.overall_score 
-                FROM quality_scores qs 
-                WHERE qs.entry_id = e.id
-            )""",
-        }
+        return where_conditions, params
 
-        # 有効なソート列かチェック
-        sort_column_sql = (
-            valid_sort_columns[sort_column]
-            if sort_column in valid_sort_columns
-            else "d.position"
-        )
-
-        # ソート順のSQLインジェクション防止
-        sort_order_sql = (
-            "ASC" if sort_order is None or sort_order.upper() != "DESC" else "DESC"
-        )
-
-        # ソート条件を追加
-        query += f" ORDER BY {sort_column_sql} {sort_order_sql}"
-
-        # LIMIT と OFFSET の追加
-        if limit is not None:
-            query += f" LIMIT {limit}"
-            if offset is not None and offset > 0:
-                query += f" OFFSET {offset}"
-
-        # クエリ実行と結果の取得
-        with self.db.transaction() as cur:
-            logger.debug(f"DatabaseAccessor.advanced_search: SQLクエリ実行: {query}")
-            logger.debug(f"DatabaseAccessor.advanced_search: SQLパラメータ: {params}")
+    def _fetch_entry_dicts(self, query: str, params: list) -> EntryDictList:
+        """クエリを実行し、結果の行をエントリの辞書に変換する"""
+        with self.db.read_transaction() as cur:
             cur.execute(query, params)
-            self.last_cursor_description = cur.description
-
-            # 結果をリストに変換
-            result = []
-            for row in cur.fetchall():
-                entry_dict = self._row_to_entry_dict(row)
-                result.append(entry_dict)
-
-        logger.debug(
-            f"DatabaseAccessor.advanced_search: {len(result)}件のエントリを取得"
-        )
-        return result
+            try:
+                columns = [desc[0] for desc in cur.description]
+            except apsw.ExecutionCompleteError:
+                # 一致する行がない場合、apswは列情報を返さない
+                return []
+            rows = [dict(zip(columns, row)) for row in cur.fetchall()]
+        return [self._row_to_entry_dict(row) for row in rows]
 
     def get_all_flags(self) -> Set[str]:
         """データベース内のすべてのフラグの集合を取得する
@@ -892,13 +993,44 @@ class DatabaseAccessor:
         """
         logger.debug("DatabaseAccessor.get_all_flags: すべてのフラグを取得")
 
-        flags = set()
-        with self.db.transaction() as cur:
-            cur.execute("SELECT DISTINCT flag FROM entry_flags")
-            for row in cur.fetchall():
-                flags.add(row["flag"])
+        return set(self.get_flag_counts())
 
-        return flags
+    def get_entry_counts(self) -> Dict[str, int]:
+        """トリガーで更新しているエントリの件数を取得する
+
+        Returns:
+            Dict[str, int]: 以下の件数
+                total: すべてのエントリ
+                translated / untranslated: msgstrが空でない / 空のエントリ
+                fuzzy / obsolete: fuzzy / 廃止済みのエントリ
+                translated_not_fuzzy / untranslated_not_fuzzy:
+                    fuzzyでないエントリのうち、msgstrが空でない / 空のもの
+        """
+        logger.debug("DatabaseAccessor.get_entry_counts: エントリの件数を取得")
+        with self.db.read_transaction() as cur:
+            cur.execute(statement("entry_counts"))
+            columns = [desc[0] for desc in cur.description]
+            values = cur.fetchone() or ()
+        return {
+            name: int(value) for name, value in zip(columns, values) if name != "id"
+        }
+
+    def get_flag_counts(self) -> Dict[str, int]:
+        """フラグごとに、そのフラグを持つエントリの数を取得する
+
+        fuzzyの件数は、count_entries_with_flagと同じくentriesのfuzzy列から数えた値です。
+
+        Returns:
+            Dict[str, int]: フラグ名とエントリ数の辞書（エントリのないフラグは含まない）
+        """
+        logger.debug("DatabaseAccessor.get_flag_counts: フラグごとの件数を取得")
+        with self.db.read_transaction() as cur:
+            cur.execute(statement("flag_counts"))
+            counts = dict(cast(List[Tuple[str, int]], cur.fetchall()))
+            if "fuzzy" in counts:
+                cur.execute(statement("fuzzy_count"))
+                counts["fuzzy"] = int(cur.fetchone()[0])
+        return counts
 
     def count_entries(self) -> int:
         """データベース内のエントリ数を取得する
@@ -907,8 +1039,8 @@ class DatabaseAccessor:
             int: エントリの総数
         """
         logger.debug("DatabaseAccessor.count_entries: エントリ数を取得")
-        with self.db.transaction() as cur:
-            cur.execute("SELECT COUNT(*) FROM entries")
+        with self.db.read_transaction() as cur:
+            cur.execute(statement("total_count"))
             return cur.fetchone()[0]
 
     def count_entries_with_condition(self, condition: Dict) -> int:
@@ -934,7 +1066,7 @@ class DatabaseAccessor:
             logger.error(f"無効な演算子: {operator}")
             return 0
 
-        with self.db.transaction() as cur:
+        with self.db.read_transaction() as cur:
             # None値の場合の特別処理
             if value is None:
                 if operator == "=":
@@ -963,22 +1095,15 @@ class DatabaseAccessor:
         """
         logger.debug(f"DatabaseAccessor.count_entries_with_flag: flag={flag}")
 
-        if flag == "fuzzy":
-            # fuzzyはエントリテーブルの列として存在
-            with self.db.transaction() as cur:
-                cur.execute("SELECT COUNT(*) FROM entries WHERE fuzzy = 1")
-                return cur.fetchone()[0]
-        else:
-            # その他のフラグはフラグテーブルで保持
-            with self.db.transaction() as cur:
-                cur.execute(
-                    """
-                    SELECT COUNT(*) FROM entry_flags
-                    WHERE flag = ?
-                    """,
-                    (flag,),
-                )
-                return cur.fetchone()[0]
+        with self.db.read_transaction() as cur:
+            if flag == "fuzzy":
+                # fuzzyはエントリテーブルの列として存在
+                cur.execute(statement("fuzzy_count"))
+            else:
+                # その他のフラグはフラグテーブルで保持
+                cur.execute(statement("flag_count"), (flag,))
+            row = cur.fetchone()
+            return row[0] if row else 0
 
     def get_unique_msgid_count(self) -> int:
         """一意のmsgid数を取得する
@@ -988,8 +1113,8 @@ class DatabaseAccessor:
         """
         logger.debug("DatabaseAccessor.get_unique_msgid_count: 一意のmsgid数を取得")
 
-        with self.db.transaction() as cur:
-            cur.execute("SELECT COUNT(DISTINCT msgid) as count FROM entries")
+        with self.db.read_transaction() as cur:
+            cur.execute(statement("unique_msgid_count"))
             row = cur.fetchone()
             return row["count"] if row else 0
 
@@ -1003,32 +1128,13 @@ class DatabaseAccessor:
             "DatabaseAccessor.get_entry_counts_by_status: ステータス別エントリ数を取得"
         )
 
-        with self.db.transaction() as cur:
-            # 総数を取得
-            cur.execute("SELECT COUNT(*) as count FROM entries")
-            total_row = cur.fetchone()
-            total = total_row["count"] if total_row else 0
-
-            # fuzzy数を取得
-            cur.execute("SELECT COUNT(*) as count FROM entries WHERE fuzzy = 1")
-            fuzzy_row = cur.fetchone()
-            fuzzy = fuzzy_row["count"] if fuzzy_row else 0
-
-            # 翻訳済み数を取得 (fuzzyでなく、msgstrが空でない)
-            cur.execute(
-                "SELECT COUNT(*) as count FROM entries WHERE fuzzy = 0 AND msgstr != ''"
-            )
-            translated_row = cur.fetchone()
-            translated = translated_row["count"] if translated_row else 0
-
-            # 未翻訳数を取得 (fuzzyでなく、msgstrが空)
-            cur.execute(
-                "SELECT COUNT(*) as count FROM entries WHERE fuzzy = 0 AND msgstr = ''"
-            )
-            untranslated_row = cur.fetchone()
-            untranslated = untranslated_row["count"] if untranslated_row else 0
-
-        return (total, translated, fuzzy, untranslated)
+        counts = self.get_entry_counts()
+        return (
+            counts["total"],
+            counts["translated_not_fuzzy"],
+            counts["fuzzy"],
+            counts["untranslated_not_fuzzy"],
+        )
 
     def invalidate_entry(self, key: str) -> None:
         """エントリを無効化する
@@ -1062,20 +1168,12 @@ class DatabaseAccessor:
         #         "UPDATE entries SET invalidated = 1 WHERE key = ?",
         #         (key,)
 
-    def _row_to_entry_dict(self, row: sqlite3.Row) -> EntryDict:
-        from typing import cast
+    def _row_to_entry_dict(self, row: Dict[str, Any]) -> EntryDict:
+        """ENTRY_DETAIL_COLUMNSを含む行をエントリの辞書に変換する
 
-        if not hasattr(row, "keys") and isinstance(row, tuple):
-            if (
-                hasattr(self, "last_cursor_description")
-                and self.last_cursor_description
-            ):
-                keys = [desc[0] for desc in self.last_cursor_description]
-                row = dict(zip(keys, row))
-            else:
-                raise TypeError("rowがtuple型ですがカラム名情報がありません")
-        elif hasattr(row, "keys"):
-            row = dict(row)
+        データベースにはアクセスしません。
+        """
+        from typing import cast
 
         entry_dict: EntryDict = {
             "key": row["key"],
@@ -1095,51 +1193,114 @@ class DatabaseAccessor:
             "previous_msgctxt",
         ]:
             if row.get(field):
-                entry_dict[field] = row[field]
-
-        entry_id = row["id"]
-        with self.db.transaction() as cur:
-            cur.execute("SELECT flag FROM entry_flags WHERE entry_id = ?", (entry_id,))
-            flags = [
-                r["flag"]
-                if isinstance(r, dict)
-                or hasattr(r, "__getitem__")
-                and not isinstance(r, tuple)
-                else r[0]
-                for r in cur.fetchall()
-            ]
-            if flags:
-                entry_dict["flags"] = flags
-
-            cur.execute(
-                "SELECT reference FROM entry_references WHERE entry_id = ?", (entry_id,)
-            )
-            references = [
-                r["reference"]
-                if isinstance(r, dict)
-                or hasattr(r, "__getitem__")
-                and not isinstance(r, tuple)
-                else r[0]
-                for r in cur.fetchall()
-            ]
-            if references:
-                entry_dict["references"] = references
-
-            cur.execute(
-                "SELECT id, overall_score FROM quality_scores WHERE entry_id = ?",
-                (entry_id,),
-            )
-            quality_score_row = cur.fetchone()
-            if quality_score_row:
-                entry_dict["overall_quality_score"] = quality_score_row["overall_score"]
-
-                quality_score_id = quality_score_row["id"]
-                cur.execute(
-                    "SELECT category, score FROM category_scores WHERE quality_score_id = ?",
-                    (quality_score_id,),
-                )
-                category_scores = {r["category"]: r["score"] for r in cur.fetchall()}
-                if category_scores:
-                    entry_dict["category_quality_scores"] = category_scores
+                cast(Dict[str, Any], entry_dict)[field] = row[field]
+
+        # フラグ、参照、品質スコアはENTRY_DETAIL_COLUMNSの列から取り出す
+        flags = json.loads(row.get("flags_json") or "[]")
+        if flags:
+            entry_dict["flags"] = flags
+
+        references = json.loads(row.get("references_json") or "[]")
+        if references:
+            entry_dict["references"] = references
+
+        quality = row.get("quality_json")
+        if quality:
+            overall_score, category_scores = json.loads(quality)
+            entry_dict["overall_quality_score"] = overall_score
+            if category_scores:
+                entry_dict["category_quality_scores"] = category_scores
 
         return cast(EntryDict, entry_dict)
+
+
+def _fts_columns(search_fields: List[str]) -> List[str]:
+    """検索フィールドを全文検索テーブルの列名に変換する（未対応のフィールドは無視）"""
+    columns = []
+    for field in search_fields:
+        column = _FTS_COLUMNS.get(field)
+        if column is not None and column not in columns:
+            columns.append(column)
+    return columns
+
+
+def _build_fts_query(search_text: str, columns: List[str]) -> Optional[str]:
+    """全文検索テーブルに対するMATCHの検索式を作成する
+
+    Args:
+        search_text: 検索テキスト
+        columns: 検索対象の列
+
+    Returns:
+        Optional[str]: 検索テキストを部分文字列として含む行に一致する検索式。
+            全文検索で絞り込めない場合（3文字未満）はNone
+    """
+    if not columns or len(search_text) < _TRIGRAM_LENGTH:
+        return None
+    # 引用符で囲んだ文字列として渡し、FTS5の演算子として解釈させない
+    phrase = '"{}"'.format(search_text.replace('"', '""'))
+    return "{%s} : %s" % (" ".join(columns), phrase)
+
+
+def _field_search_condition(
+    column: str, search_text: str, exact_match: bool, case_sensitive: bool
+) -> Tuple[str, str]:
+    """フィールドの値で検索テキストを確認するSQL条件を作成する
+
+    Args:
+        column: 全文検索テーブルの列名
+        search_text: 検索テキスト
+        exact_match: 完全一致で比較するかどうか
+        case_sensitive: 大文字・小文字を区別するかどうか
+
+    Returns:
+        Tuple[str, str]: (SQL条件, パラメータ)
+    """
+    expression = _FIELD_EXPRESSIONS.get(column, "r.reference")
+    if exact_match:
+        template = "{0} = ?" if case_sensitive else "LOWER({0}) = LOWER(?)"
+    elif case_sensitive:
+        template = "INSTR({0}, ?) > 0"
+    else:
+        template = "INSTR(LOWER({0}), LOWER(?)) > 0"
+    condition = template.format(expression)
+
+    if column == "reference":
+        condition = (
+            "EXISTS (SELECT 1 FROM entry_references r "
+            f"WHERE r.entry_id = e.id AND {condition})"
+        )
+    return condition, search_text
+
+
+def _sort_direction(sort_order: Optional[str]) -> str:
+    """ソート順をSQLのASC/DESCに変換する（不明な値はASC）"""
+    return "DESC" if sort_order is not None and sort_order.upper() == "DESC" else "ASC"
+
+
+def _encode_cursor(sort_column: str, direction: str, keys: List[Any]) -> str:
+    """ページの最後のエントリのソートキーを継続トークンに変換する"""
+    data = json.dumps([sort_column, direction, keys], ensure_ascii=False)
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort_column: str, direction: str) -> List[Any]:
+    """継続トークンからソートキーを取り出す
+
+    Raises:
+        ValueError: トークンが不正な場合、または別の並び順で作成された場合
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        token_column, token_direction, keys = json.loads(data.decode("utf-8"))
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as e:
+        raise ValueError(f"不正な継続トークンです: {cursor!r}") from e
+    if (token_column, token_direction) != (sort_column, direction):
+        raise ValueError(
+            "継続トークンの並び順が異なります: "
+            f"{token_column} {token_direction}（指定: {sort_column} {direction}）"
+        )
+    expected = 2 if sort_column == "position" else 3
+    if not isinstance(keys, list) or len(keys) != expected:
+        raise ValueError(f"不正な継続トークンです: {cursor!r}")
+    return keys
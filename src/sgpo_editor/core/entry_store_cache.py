@@ -0,0 +1,178 @@
+"""POファイルごとの作業データベース
+
+このモジュールは、POファイルを読み込んだエントリのデータベース（InMemoryEntryStore）を
+ファイルに保存し、同じPOファイルを再度開く際に再利用するための仕組みを提供します。
+
+作業データベースの概要:
+1. 保存先: POファイルの絶対パスとPOライブラリの種類ごとに1ファイル（WALモード）
+2. 検証: データベースに記録したPOファイルの内容のハッシュが一致する場合のみそのまま使用
+3. 更新: 内容が異なる場合は、変更されたエントリだけをデータベースに反映
+4. 引き継ぎ: エントリIDが維持されるため、レビューや品質スコアのデータは閉じても失われない
+
+データベースのエントリが編集されると、記録したハッシュは取り消されます。
+次に開く際は、POファイルの内容で差分更新されます。
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from sgpo_editor.models.database import InMemoryEntryStore
+from sgpo_editor.types import EntryDictList, MetadataDict
+
+logger = logging.getLogger(__name__)
+
+# データベースの形式（テーブルの構成を変更した場合は更新する）
+STORE_FORMAT_VERSION = 1
+_SUFFIX = ".sqlite3"
+
+# store_infoテーブルの値の名前
+_INFO_VERSION = "format_version"
+_INFO_SOURCE_HASH = "source_hash"
+_INFO_METADATA = "metadata"
+
+
+class EntryStoreCache:
+    """POファイルごとの作業データベースを管理するクラス"""
+
+    def __init__(self, directory: Union[str, Path]):
+        """初期化
+
+        Args:
+            directory: データベースファイルを保存するディレクトリ
+        """
+        self.directory = Path(directory)
+
+    def open(self, path: Union[str, Path], library: str = "") -> InMemoryEntryStore:
+        """POファイルに対応する作業データベースを開く
+
+        データベースがない場合や形式が古い場合は、空のデータベースを作成します。
+
+        Args:
+            path: POファイルのパス
+            library: POライブラリの種類
+
+        Returns:
+            InMemoryEntryStore: ファイルに保存されるデータベース
+
+        Raises:
+            OSError: ディレクトリを作成できない場合
+            apsw.Error: データベースを開けない場合
+        """
+        store_path = self._store_path(path, library)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        store = InMemoryEntryStore(store_path)
+        if store.get_info(_INFO_VERSION) == str(STORE_FORMAT_VERSION):
+            return store
+
+        if store.get_info(_INFO_VERSION) is not None:
+            logger.debug(f"作業データベースの形式が古いため作り直します: {store_path}")
+            store.close()
+            _remove_store_files(store_path)
+            store = InMemoryEntryStore(store_path)
+        store.set_info(_INFO_VERSION, str(STORE_FORMAT_VERSION))
+        return store
+
+    def get_metadata(
+        self, store: InMemoryEntryStore, content_hash: str
+    ) -> Optional[MetadataDict]:
+        """データベースがPOファイルの内容と一致していれば、メタデータを返す
+
+        Args:
+            store: openで開いたデータベース
+            content_hash: POファイルの内容のハッシュ（parse_cache.hash_file）
+
+        Returns:
+            Optional[MetadataDict]: POファイルのメタデータ（一致しない場合はNone）
+        """
+        if store.get_info(_INFO_SOURCE_HASH) != content_hash:
+            return None
+        metadata = store.get_info(_INFO_METADATA)
+        return json.loads(metadata) if metadata is not None else {}
+
+    def reconcile(
+        self,
+        store: InMemoryEntryStore,
+        content_hash: str,
+        metadata: MetadataDict,
+        entries: EntryDictList,
+    ) -> Dict[str, int]:
+        """データベースをPOファイルの内容に合わせて差分更新する
+
+        Args:
+            store: openで開いたデータベース
+            content_hash: POファイルの内容のハッシュ
+            metadata: POファイルのメタデータ
+            entries: POファイルのエントリ（add_entries_bulkと同じ形式）
+
+        Returns:
+            Dict[str, int]: 追加・更新・削除したエントリの件数
+        """
+        with store.transaction():
+            result: Dict[str, int] = store.reconcile_entries(entries)
+            store.set_info(_INFO_METADATA, json.dumps(dict(metadata)))
+            store.set_info(_INFO_SOURCE_HASH, content_hash)
+        return result
+
+    def clear(self) -> None:
+        """すべての作業データベースを削除する（開いているデータベースを除く）"""
+        for store_path in self.directory.glob(f"*{_SUFFIX}"):
+            _remove_store_files(store_path)
+
+    def _store_path(self, path: Union[str, Path], library: str) -> Path:
+        """POファイルに対応するデータベースファイルのパスを返す"""
+        key = f"{library}\0{os.path.abspath(path)}"
+        digest = hashlib.sha1(key.encode("utf-8", "surrogatepass")).hexdigest()
+        return self.directory / f"{digest}{_SUFFIX}"
+
+
+def _remove_store_files(store_path: Path) -> None:
+    """データベースファイルとWALのファイルを削除する"""
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            Path(f"{store_path}{suffix}").unlink()
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.debug(f"作業データベースを削除できませんでした: {store_path} ({e})")
+
+
+_entry_store_cache_instance: Optional[EntryStoreCache] = None
+
+
+def get_entry_store_cache() -> Optional[EntryStoreCache]:
+    """設定に従って作業データベースの管理クラスを取得する
+
+    Returns:
+        Optional[EntryStoreCache]: 作業データベースを保存しない設定の場合はNone
+    """
+    global _entry_store_cache_instance
+
+    try:
+        from sgpo_editor.config import get_config
+
+        config = get_config()
+        if not config.get("entry_store.persistent", False):
+            return None
+        directory = config.get("entry_store.directory", "") or _default_store_dir()
+    except Exception as e:
+        logger.warning(f"作業データベースの設定を取得できませんでした: {e}")
+        return None
+
+    if (
+        _entry_store_cache_instance is None
+        or _entry_store_cache_instance.directory != Path(directory)
+    ):
+        _entry_store_cache_instance = EntryStoreCache(directory)
+    return _entry_store_cache_instance
+
+
+def _default_store_dir() -> Path:
+    """プラットフォームに応じたデフォルトの保存先を返す"""
+    home_dir = Path.home()
+    if os.name == "nt":  # Windows
+        return home_dir / "AppData" / "Local" / "sgpo_editor" / "entry_store"
+    return home_dir / ".cache" / "sgpo_editor" / "entry_store"
@@ -0,0 +1,326 @@
+"""POファイルの解析結果キャッシュ
+
+このモジュールは、POファイルの解析結果をローカルディスクに保存し、
+変更されていないファイルを再度開く際に解析を省略するためのキャッシュを提供します。
+
+キャッシュの概要:
+1. キー: ファイルの絶対パスとPOライブラリの種類
+2. 検証: ファイルサイズ、更新時刻（ns）、内容のハッシュがすべて一致する場合のみ使用
+3. 形式: marshalによるバイナリ形式（ヘッダーとエントリの行を別々に格納）
+4. 容量: 合計サイズの上限を超えた場合、最も長く使われていないファイルから削除（LRU）
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from sgpo.writer import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# キャッシュファイルの形式（形式を変更した場合は更新する）
+CACHE_FORMAT_VERSION = 1
+_MAGIC = b"SGPC"
+_SUFFIX = ".bin"
+
+# デフォルトのキャッシュ容量（MB）
+DEFAULT_MAX_SIZE_MB = 200
+
+
+class CachedEntry(NamedTuple):
+    """キャッシュから復元したPOエントリ
+
+    POEntryと同じ属性名を持つため、POFileBaseComponent._convert_entry_to_dictに
+    そのまま渡すことができます。
+    """
+
+    msgid: str
+    msgstr: str
+    msgctxt: Optional[str]
+    flags: List[str]
+    obsolete: bool
+    msgid_plural: Optional[str]
+    msgstr_plural: Dict[int, str]
+    previous_msgid: Optional[str]
+    previous_msgid_plural: Optional[str]
+    previous_msgctxt: Optional[str]
+    linenum: Optional[int]
+    comment: Optional[str]
+    tcomment: Optional[str]
+    occurrences: List[Tuple[str, str]]
+
+
+class ParseResult(NamedTuple):
+    """キャッシュに保存する解析結果"""
+
+    metadata: Dict[str, str]
+    entries: List[CachedEntry]
+
+
+def snapshot_entries(pofile: Any) -> List[CachedEntry]:
+    """POファイルのエントリをキャッシュ可能な形式に変換する
+
+    Args:
+        pofile: POファイル（POEntryを返すイテラブル）
+
+    Returns:
+        List[CachedEntry]: エントリのリスト
+    """
+    return [
+        CachedEntry(
+            entry.msgid,
+            entry.msgstr,
+            getattr(entry, "msgctxt", None),
+            list(getattr(entry, "flags", [])),
+            bool(getattr(entry, "obsolete", False)),
+            getattr(entry, "msgid_plural", None),
+            dict(getattr(entry, "msgstr_plural", {})),
+            getattr(entry, "previous_msgid", None),
+            getattr(entry, "previous_msgid_plural", None),
+            getattr(entry, "previous_msgctxt", None),
+            getattr(entry, "linenum", None),
+            getattr(entry, "comment", None),
+            getattr(entry, "tcomment", None),
+            [tuple(occurrence) for occurrence in getattr(entry, "occurrences", [])],
+        )
+        for entry in pofile
+    ]
+
+
+class ParseCache:
+    """POファイルの解析結果をディスクに保存するキャッシュ
+
+    キャッシュファイルはディレクトリ内に1ファイル1件で保存され、
+    ファイルの更新時刻をLRUの最終利用時刻として使用します。
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_size_bytes: int = DEFAULT_MAX_SIZE_MB * 1024 * 1024,
+    ):
+        """初期化
+
+        Args:
+            directory: キャッシュファイルを保存するディレクトリ
+            max_size_bytes: キャッシュファイルの合計サイズの上限（バイト）
+        """
+        self.directory = Path(directory)
+        self.max_size_bytes = max_size_bytes
+
+    def load(
+        self, path: Union[str, Path], library: str = ""
+    ) -> Optional[ParseResult]:
+        """キャッシュから解析結果を読み込む
+
+        Args:
+            path: POファイルのパス
+            library: POライブラリの種類（解析結果はライブラリごとに保存されます）
+
+        Returns:
+            Optional[ParseResult]: 有効なキャッシュがあれば解析結果、なければNone
+        """
+        cache_path = self._cache_path(path, library)
+        try:
+            with open(cache_path, "rb") as f:
+                if f.read(len(_MAGIC)) != _MAGIC:
+                    return None
+                header = marshal.load(f)
+                if not self._is_valid(header, path, library):
+                    logger.debug(f"解析結果キャッシュが古いため使用しません: {path}")
+                    return None
+                metadata, rows = marshal.load(f)
+            entries = list(map(CachedEntry._make, rows))
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError, AttributeError) as e:
+            logger.debug(f"解析結果キャッシュの読み込みに失敗しました: {path} ({e})")
+            return None
+
+        # LRUの最終利用時刻を更新
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+
+        logger.debug(f"解析結果キャッシュを使用します: {path}")
+        return ParseResult(metadata, entries)
+
+    def file_header(self, path: Union[str, Path], library: str = "") -> Dict[str, Any]:
+        """POファイルの現在の状態（サイズ、更新時刻、内容のハッシュ）を表すヘッダーを作成する
+
+        解析中にファイルが保存されても古い内容を新しい状態として記録しないよう、
+        解析の前に作成してstoreに渡します。
+
+        Args:
+            path: POファイルのパス
+            library: POライブラリの種類
+
+        Raises:
+            OSError: ファイルを読み込めない場合
+        """
+        header = self._stat_header(path, library)
+        header["hash"] = hash_file(path)
+        return header
+
+    def store(
+        self,
+        path: Union[str, Path],
+        result: ParseResult,
+        library: str = "",
+        header: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """解析結果をキャッシュに保存する
+
+        Args:
+            path: POファイルのパス
+            result: 解析結果
+            library: POライブラリの種類
+            header: 解析前にfile_headerで作成したヘッダー（省略時は現在の状態）
+        """
+        try:
+            if header is None:
+                header = self.file_header(path, library)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            payload = (dict(result.metadata), [tuple(e) for e in result.entries])
+            with atomic_write(str(self._cache_path(path, library)), mode="wb") as f:
+                f.write(_MAGIC)
+                marshal.dump(header, f)
+                marshal.dump(payload, f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"解析結果キャッシュの保存に失敗しました: {path} ({e})")
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """合計サイズが上限を超えないよう、古いキャッシュファイルから削除する"""
+        files = []
+        total_size = 0
+        for cache_path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = cache_path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, cache_path))
+            total_size += stat.st_size
+
+        if total_size <= self.max_size_bytes:
+            return
+
+        # 最終利用時刻の古い順に削除
+        for _, size, cache_path in sorted(files):
+            if total_size <= self.max_size_bytes:
+                break
+            try:
+                cache_path.unlink()
+                total_size -= size
+                logger.debug(f"解析結果キャッシュを削除しました: {cache_path}")
+            except OSError:
+                continue
+
+    def clear(self) -> None:
+        """すべてのキャッシュファイルを削除する"""
+        for cache_path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                cache_path.unlink()
+            except OSError:
+                continue
+
+    def _cache_path(self, path: Union[str, Path], library: str) -> Path:
+        """POファイルに対応するキャッシュファイルのパスを返す"""
+        key = f"{library}\0{os.path.abspath(path)}"
+        digest = hashlib.sha1(key.encode("utf-8", "surrogatepass")).hexdigest()
+        return self.directory / f"{digest}{_SUFFIX}"
+
+    def _is_valid(self, header: Any, path: Union[str, Path], library: str) -> bool:
+        """キャッシュのヘッダーがPOファイルの現在の状態と一致するか確認する
+
+        サイズや更新時刻が異なる場合は、内容を読まずに無効と判断します。
+        """
+        if not isinstance(header, dict):
+            return False
+        cached_hash = header.get("hash")
+        current = self._stat_header(path, library)
+        if any(header.get(key) != value for key, value in current.items()):
+            return False
+        return cached_hash == hash_file(path)
+
+    @staticmethod
+    def _stat_header(path: Union[str, Path], library: str) -> Dict[str, Any]:
+        """POファイルの現在の状態を表すヘッダー（内容のハッシュを除く）を作成する
+
+        Raises:
+            OSError: ファイルの情報を取得できない場合
+        """
+        stat = os.stat(path)
+        return {
+            "version": CACHE_FORMAT_VERSION,
+            "python": list(sys.version_info[:2]),
+            "marshal": marshal.version,
+            "library": library,
+            "path": os.path.abspath(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """ファイルの内容のハッシュを計算する
+
+    Args:
+        path: ファイルのパス
+
+    Returns:
+        str: ハッシュの16進数表記
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+_parse_cache_instance: Optional[ParseCache] = None
+
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """設定に従って解析結果キャッシュを取得する
+
+    Returns:
+        Optional[ParseCache]: キャッシュが無効な場合はNone
+    """
+    global _parse_cache_instance
+
+    try:
+        from sgpo_editor.config import get_config
+
+        config = get_config()
+        if not config.get("parse_cache.enabled", True):
+            return None
+        directory = config.get("parse_cache.directory", "") or _default_cache_dir()
+        max_size_mb = config.get("parse_cache.max_size_mb", DEFAULT_MAX_SIZE_MB)
+    except Exception as e:
+        logger.warning(f"解析結果キャッシュの設定を取得できませんでした: {e}")
+        return None
+
+    max_size_bytes = int(max_size_mb * 1024 * 1024)
+    if (
+        _parse_cache_instance is None
+        or _parse_cache_instance.directory != Path(directory)
+        or _parse_cache_instance.max_size_bytes != max_size_bytes
+    ):
+        _parse_cache_instance = ParseCache(directory, max_size_bytes)
+    return _parse_cache_instance
+
+
+def _default_cache_dir() -> Path:
+    """プラットフォームに応じたデフォルトのキャッシュディレクトリを返す"""
+    home_dir = Path.home()
+    if os.name == "nt":  # Windows
+        return home_dir / "AppData" / "Local" / "sgpo_editor" / "parse_cache"
+    return home_dir / ".cache" / "sgpo_editor" / "parse_cache"
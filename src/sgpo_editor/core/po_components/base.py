@@ -7,10 +7,17 @@ import asyncio
 import logging
 import time
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Tuple, Union, cast
 
 from sgpo_editor.core.cache_manager import EntryCacheManager
 from sgpo_editor.core.database_accessor import DatabaseAccessor
+from sgpo_editor.core.entry_store_cache import EntryStoreCache, get_entry_store_cache
+from sgpo_editor.core.parse_cache import (
+    ParseResult,
+    get_parse_cache,
+    hash_file,
+    snapshot_entries,
+)
 from sgpo_editor.core.po_factory import get_po_factory, POLibraryType
 from sgpo_editor.core.po_interface import POEntry
 from sgpo_editor.models.database import InMemoryEntryStore
@@ -79,13 +86,34 @@ class POFileBaseComponent:
             path = Path(path)
             self.path = path
 
-            # POファイルファクトリを取得
-            factory = get_po_factory(self.library_type)
+            # 作業データベースを保存する設定の場合は、POファイルに対応するデータベースに
+            # 切り替える（内容が変わっていなければ、解析せずにそのまま使う）
+            entry_store_cache = get_entry_store_cache()
+            content_hash = None
+            if entry_store_cache is not None:
+                try:
+                    content_hash, metadata = await asyncio.to_thread(
+                        self._open_entry_store, entry_store_cache, path
+                    )
+                except Exception as e:
+                    logger.warning(f"作業データベースを開けませんでした: {e}")
+                    self._set_store(InMemoryEntryStore())
+                else:
+                    if metadata is not None:
+                        logger.debug(f"作業データベースをそのまま使用します: {path}")
+                        self.metadata = metadata
+                        await asyncio.to_thread(self._load_all_basic_info)
+                        self._is_loaded = True
+                        self.modified = False
+                        return
+            elif self.db.path is not None:
+                self._set_store(InMemoryEntryStore())
 
             # POファイルを読み込む（CPU負荷の高い処理を非同期実行）
+            # 変更されていないファイルは、解析結果キャッシュから復元する
             try:
                 logger.debug(f"POファイル読み込み処理開始: {path}")
-                pofile = await asyncio.to_thread(factory.load_file, path)
+                pofile = await asyncio.to_thread(self._load_parse_result, path)
                 logger.debug(f"POファイル読み込み処理完了: {path}")
             except Exception as e:
                 logger.error(f"POファイル読み込み処理失敗: {e}")
@@ -98,11 +126,12 @@ class POFileBaseComponent:
                 logger.error("POファイルがNoneです。これは想定外のエラーです。")
                 raise RuntimeError("POファイルの読み込みに失敗しました: ファイルがNoneです")
 
-            # データベースをクリア
+            # データベースをクリア（作業データベースは後で差分更新する）
             try:
-                logger.debug("データベースクリア開始")
-                self.db_accessor.clear_database()
-                logger.debug("データベースクリア完了")
+                if content_hash is None:
+                    logger.debug("データベースクリア開始")
+                    self.db_accessor.clear_database()
+                    logger.debug("データベースクリア完了")
             except Exception as e:
                 logger.error(f"データベースクリア失敗: {e}")
                 raise RuntimeError(f"データベースのクリアに失敗しました: {e}") from e
@@ -111,8 +140,9 @@ class POFileBaseComponent:
             try:
                 logger.debug("エントリ変換処理開始")
                 entries_to_add = []
-                for i, entry in enumerate(pofile):
-                    entry_dict = self._convert_entry_to_dict(entry, i)
+                for i, entry in enumerate(pofile.entries):
+                    # CachedEntryはPOEntryと同じ属性名を持つ
+                    entry_dict = self._convert_entry_to_dict(cast(POEntry, entry), i)
                     entries_to_add.append(entry_dict)
                 logger.debug(f"エントリ変換処理完了: {len(entries_to_add)}件のエントリを変換")
             except Exception as e:
@@ -122,8 +152,16 @@ class POFileBaseComponent:
             # エントリをデータベースに追加（CPU負荷の高い処理を非同期実行）
             try:
                 logger.debug(f"データベース一括追加処理開始: {len(entries_to_add)}件")
-                if entries_to_add:
-                    await asyncio.to_thread(self.db_accessor.add_entries_bulk, entries_to_add)
+                if entry_store_cache is not None and content_hash is not None:
+                    await asyncio.to_thread(
+                        entry_store_cache.reconcile,
+                        self.db,
+                        content_hash,
+                        self.metadata,
+                        entries_to_add,
+                    )
+                elif entries_to_add:
+                    await asyncio.to_thread(self.db_accessor.bulk_load, entries_to_add)
                 logger.debug("データベース一括追加処理完了")
             except Exception as e:
                 logger.error(f"データベース一括追加処理失敗: {e}")
@@ -163,8 +201,12 @@ class POFileBaseComponent:
             pofile = None
             
             # データベースとキャッシュのリセットを試みる
+            # （作業データベースの内容は消さず、空のインメモリデータベースに切り替える）
             try:
-                self.db_accessor.clear_database()
+                if self.db.path is not None:
+                    self._set_store(InMemoryEntryStore())
+                else:
+                    self.db_accessor.clear_database()
             except Exception as clear_error:
                 logger.error(f"エラー回復時のデータベースクリアに失敗: {clear_error}")
             
@@ -176,6 +218,68 @@ class POFileBaseComponent:
             # 元の例外を再スロー
             raise
 
+    def _open_entry_store(
+        self, entry_store_cache: EntryStoreCache, path: Path
+    ) -> Tuple[str, Optional[MetadataDict]]:
+        """POファイルに対応する作業データベースに切り替える
+
+        Args:
+            entry_store_cache: 作業データベースの管理クラス
+            path: 読み込むPOファイルのパス
+
+        Returns:
+            Tuple[str, Optional[MetadataDict]]: POファイルの内容のハッシュと、
+                データベースがPOファイルと一致している場合はそのメタデータ
+        """
+        content_hash = hash_file(path)
+        store = entry_store_cache.open(path, self.library_type.value)
+        self._set_store(store)
+        return content_hash, entry_store_cache.get_metadata(store, content_hash)
+
+    def _set_store(self, store: InMemoryEntryStore) -> None:
+        """使用するデータベースを切り替える（ファイルに保存するデータベースは閉じる）"""
+        previous = self.db
+        if previous.query_stats is not None:
+            # SQL文の統計の集計中は、切り替え後のデータベースでも同じ集計先に記録する
+            store.enable_query_stats(previous.query_stats)
+        self.db = store
+        self.db_accessor.db = store
+        if previous is not store and previous.path is not None:
+            previous.close()
+
+    def _load_parse_result(self, path: Path) -> Optional[ParseResult]:
+        """POファイルを解析する（解析結果キャッシュが有効な場合はキャッシュを使用する）
+
+        Args:
+            path: 読み込むPOファイルのパス
+
+        Returns:
+            Optional[ParseResult]: メタデータとエントリ（読み込めなかった場合はNone）
+        """
+        parse_cache = get_parse_cache()
+        library = self.library_type.value
+        header = None
+        if parse_cache is not None:
+            cached = parse_cache.load(path, library)
+            if cached is not None:
+                logger.debug(f"解析結果キャッシュから復元しました: {path}")
+                return cached
+            # 解析中にファイルが保存された場合に備え、解析前の状態をキャッシュに記録する
+            try:
+                header = parse_cache.file_header(path, library)
+            except OSError as e:
+                logger.debug(f"POファイルの状態を取得できませんでした: {path} ({e})")
+                parse_cache = None
+
+        factory = get_po_factory(self.library_type)
+        pofile = factory.load_file(path)
+        if pofile is None:
+            return None
+        result = ParseResult(dict(pofile.metadata), snapshot_entries(pofile))
+        if parse_cache is not None:
+            parse_cache.store(path, result, library, header)
+        return result
+
     def _load_all_basic_info(self) -> None:
         """すべてのエントリの基本情報を一括ロード
 
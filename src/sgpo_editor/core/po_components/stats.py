@@ -74,22 +74,17 @@ class StatsComponent:
                 "percent_translated": 0.0,
             }
 
-        # 総エントリ数
-        total = self.db_accessor.count_entries()
+        # エントリ数はトリガーで更新しているentry_countsテーブルから1回で取得する
+        counts = self.db_accessor.get_entry_counts()
+        total = counts["total"]
         # 翻訳済みエントリ数 (msgstrが空でないもの)
-        translated = self.db_accessor.count_entries_with_condition(
-            {"field": "msgstr", "value": "", "operator": "!="}
-        )
+        translated = counts["translated"]
         # 未翻訳エントリ数 (msgstrが空のもの)
-        untranslated = self.db_accessor.count_entries_with_condition(
-            {"field": "msgstr", "value": "", "operator": "="}
-        )
+        untranslated = counts["untranslated"]
         # fuzzyフラグ付きエントリ数
-        fuzzy = self.db_accessor.count_entries_with_flag("fuzzy")
+        fuzzy = counts["fuzzy"]
         # obsoleteフラグ付きエントリ数
-        obsolete = self.db_accessor.count_entries_with_condition(
-            {"field": "obsolete", "value": True, "operator": "="}
-        )
+        obsolete = counts["obsolete"]
 
         # 翻訳率の計算 (0除算対策)
         percent_translated = (translated / total * 100) if total > 0 else 0.0
@@ -125,14 +120,8 @@ class StatsComponent:
         if not self.db_accessor:
             return {}
 
-        result = {}
-        all_flags = self.db_accessor.get_all_flags()
-
-        for flag in all_flags:
-            count = self.db_accessor.count_entries_with_flag(flag)
-            result[flag] = count
-
-        return result
+        counts: Dict[str, int] = self.db_accessor.get_flag_counts()
+        return counts
 
     async def save(self, path: Optional[Union[str, Path]] = None) -> bool:
         """POファイルを保存する
@@ -9,7 +9,7 @@ from typing import Dict, Optional
 
 from sgpo_editor.core.po_interface import POFileFactory
 from sgpo_editor.core.polib_adapter import PolibFactory
-from sgpo_editor.core.sgpo_adapter import SgpoFactory
+from sgpo_editor.core.sgpo_adapter import FastSgpoFactory, SgpoFactory
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +19,7 @@ class POLibraryType(str, Enum):
 
     POLIB = "polib"
     SGPO = "sgpo"
+    SGPO_FAST = "sgpo_fast"
 
 
 # デフォルトのPOライブラリ
@@ -31,6 +32,7 @@ _current_po_library = None
 _factory_instances: Dict[POLibraryType, Optional[POFileFactory]] = {
     POLibraryType.POLIB: None,
     POLibraryType.SGPO: None,
+    POLibraryType.SGPO_FAST: None,
 }
 
 
@@ -61,6 +63,8 @@ def get_po_factory(library_type: Optional[POLibraryType] = None) -> POFileFactor
             _factory_instances[library_type] = PolibFactory()
         elif library_type == POLibraryType.SGPO:
             _factory_instances[library_type] = SgpoFactory()
+        elif library_type == POLibraryType.SGPO_FAST:
+            _factory_instances[library_type] = FastSgpoFactory()
         else:
             raise ValueError(f"不明なPOライブラリタイプ: {library_type}")
 
@@ -90,6 +94,8 @@ def _get_default_library_from_config() -> POLibraryType:
             return POLibraryType.POLIB
         elif po_library == POLibraryType.SGPO:
             return POLibraryType.SGPO
+        elif po_library == POLibraryType.SGPO_FAST:
+            return POLibraryType.SGPO_FAST
         else:
             logger.warning(
                 f"不明なPOライブラリタイプ: {po_library}、デフォルトを使用します"
@@ -289,3 +289,15 @@ class SgpoFactory(POFileFactory):
         file_path_str = str(file_path)
         pofile = sgpo.pofile(file_path_str)
         return SgpoFile(pofile)
+
+
+class FastSgpoFactory(SgpoFactory):
+    """高速パーサーで読み込むsgpoのPOFileファクトリ
+
+    読み込み結果はSgpoFactoryと同じです。
+    """
+
+    def load_file(self, file_path: Union[str, Path]) -> POFile:
+        """POファイルを読み込む"""
+        pofile = sgpo.fast_pofile(str(file_path))
+        return SgpoFile(pofile)
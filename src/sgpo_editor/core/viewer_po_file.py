@@ -84,19 +84,17 @@ class ViewerPOFile:
             cache_manager: キャッシュマネージャのインスタンス（省略時は内部で生成）
         """
         # DBとキャッシュの共有インスタンスを作成
-        self.db_accessor = db_accessor
         self.cache_manager = cache_manager or EntryCacheManager()
 
         # 各コンポーネントの初期化
         self.base = POFileBaseComponent(
             library_type=library_type,
-            db_accessor=self.db_accessor,
+            db_accessor=db_accessor,
             cache_manager=self.cache_manager,
         )
 
-        # データベースアクセサが指定されていない場合は、BaseComponentから取得
-        if not self.db_accessor:
-            self.db_accessor = self.base.db_accessor
+        # データベースアクセサが指定されていない場合は、BaseComponentが生成したものを使う
+        self.db_accessor: DatabaseAccessor = self.base.db_accessor
 
         # 各コンポーネントの初期化
         self.retriever = EntryRetrieverComponent(
@@ -164,7 +164,7 @@ class ViewerPOFileBase:
                 logger.debug(f"データベース一括追加処理開始: {len(entries_to_add)}件")
                 if entries_to_add:
                     await asyncio.to_thread(
-                        self.db_accessor.add_entries_bulk, entries_to_add
+                        self.db_accessor.bulk_load, entries_to_add
                     )
                 logger.debug("データベース一括追加処理完了")
             except Exception as e:
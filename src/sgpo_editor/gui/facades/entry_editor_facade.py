@@ -294,8 +294,9 @@ class EntryEditorFacade(QObject):
 
             if result:
                 # 成功メッセージとシグナル発行
-                self._show_status(f"エントリ {entry.position} を更新しました", 3000)
-                self.entry_applied.emit(entry.position)
+                self._show_status(f"エントリ {entry.key} を更新しました", 3000)
+                if entry.entry_number is not None:
+                    self.entry_applied.emit(entry.entry_number)
                 return True
             else:
                 self._show_status("エントリの更新に失敗しました", 3000)
@@ -285,15 +285,15 @@ class EntryListFacade(QObject):
 
         try:
             entry = current_po.get_entry_by_key(key)
-            if entry and hasattr(entry, "position"):
+            if entry and entry.entry_number is not None:
                 logger.debug(
-                    f"EntryListFacade._on_cell_clicked: エントリ位置={entry.position}のシグナルを発行"
+                    f"EntryListFacade._on_cell_clicked: エントリ番号={entry.entry_number}のシグナルを発行"
                 )
-                self.entry_selected.emit(entry.position)
+                self.entry_selected.emit(entry.entry_number)
                 logger.debug("EntryListFacade._on_cell_clicked: シグナル発行完了")
             else:
                 logger.debug(
-                    "EntryListFacade._on_cell_clicked: エントリが取得できないか、positionがない"
+                    "EntryListFacade._on_cell_clicked: エントリが取得できないか、エントリ番号がない"
                 )
         except Exception as e:
             logger.error(
@@ -15,6 +15,7 @@ from PySide6.QtCore import QSettings
 from PySide6.QtWidgets import QApplication, QFileDialog, QWidget
 
 from sgpo_editor.core import ViewerPOFile
+from sgpo_editor.models.query_stats import QueryStatsRecorder
 from sgpo_editor.types import StatsDict
 
 # 循環インポートを避けるために型アノテーションを文字列に変更
@@ -55,6 +56,8 @@ class FileHandler:
         self._update_table = update_table_callback
         self._show_status = status_callback
         self.recent_files = self._load_recent_files()
+        # SQL文の統計の集計先（記録していない場合はNone）
+        self.query_stats: Optional[QueryStatsRecorder] = None
         # テスト用: get_recent_files, clear_recent_filesをMagicMockでラップ
         from unittest.mock import MagicMock
 
@@ -148,6 +151,9 @@ class FileHandler:
 
             # ViewerPOFileを使用
             po_file = ViewerPOFile()
+            if self.query_stats is not None:
+                # 読み込み中のSQL文も統計に含める
+                po_file.db_accessor.db.enable_query_stats(self.query_stats)
             # 非同期で読み込み
             await po_file.load(filepath)
 
@@ -251,3 +257,60 @@ class FileHandler:
             logger.error(traceback.format_exc())
             self._show_status(f"ファイルを保存できませんでした: {e}", 3000)
             return False
+
+    def set_query_stats_enabled(self, enabled: bool) -> None:
+        """SQL文の統計の記録を開始・終了する
+
+        記録中に開いたPOファイルのデータベースにも、同じ集計先で記録します。
+
+        Args:
+            enabled: 記録するかどうか
+        """
+        store = self.po_file.db_accessor.db if self.po_file is not None else None
+        if enabled:
+            self.query_stats = QueryStatsRecorder()
+            if store is not None:
+                store.enable_query_stats(self.query_stats)
+            self._show_status("SQL文の統計の記録を開始しました", 3000)
+        else:
+            self.query_stats = None
+            if store is not None:
+                store.disable_query_stats()
+            self._show_status("SQL文の統計の記録を終了しました", 3000)
+
+    def export_query_stats(self) -> bool:
+        """記録したSQL文の統計をJSONファイルに保存する
+
+        Returns:
+            成功したかどうか
+        """
+        if self.query_stats is None:
+            self._show_status("SQL文の統計を記録していません", 3000)
+            return False
+
+        try:
+            filepath, _ = QFileDialog.getSaveFileName(
+                self.parent,
+                "SQL文の統計を保存",
+                "query_stats.json",
+                "JSONファイル (*.json);;すべてのファイル (*.*)",
+            )
+            if not filepath:
+                return False
+
+            store = self.po_file.db_accessor.db if self.po_file is not None else None
+            stats = store.get_query_stats() if store is not None else None
+            if stats is None:
+                # 実行計画は、統計を記録中のデータベースがある場合のみ取得できる
+                stats = self.query_stats.to_dict()
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(stats, f, ensure_ascii=False, indent=2)
+
+            self._show_status(f"SQL文の統計を保存しました: {filepath}", 3000)
+            return True
+
+        except Exception as e:
+            logger.error("SQL文の統計を保存する際にエラーが発生しました: %s", e)
+            logger.error(traceback.format_exc())
+            self._show_status(f"SQL文の統計を保存できませんでした: {e}", 3000)
+            return False
@@ -136,6 +136,8 @@ class MainWindow(QMainWindow):
                 "table_manager": self.table_manager,
                 "show_translation_evaluate": self._show_translation_evaluate_dialog,
                 "show_translation_evaluation_result": self._show_translation_evaluation_result_dialog,
+                "toggle_query_stats": self.file_handler.set_query_stats_enabled,
+                "export_query_stats": self.file_handler.export_query_stats,
             }
         )
 
@@ -866,16 +868,16 @@ class MainWindow(QMainWindow):
 
         # キーからエントリを取得
         entry = current_po.get_entry_by_key(entry_key)
-        if not entry or not hasattr(entry, "position"):
+        if not entry or entry.entry_number is None:
             logger.debug(
-                "MainWindow._get_selected_entry_number: エントリが取得できないか、positionがありません"
+                "MainWindow._get_selected_entry_number: エントリが取得できないか、エントリ番号がありません"
             )
             return None
 
         logger.debug(
-            f"MainWindow._get_selected_entry_number: エントリ番号={entry.position}を返します"
+            f"MainWindow._get_selected_entry_number: エントリ番号={entry.entry_number}を返します"
         )
-        return entry.position
+        return entry.entry_number
 
     def _on_clear_recent_files_triggered(self):
         """最近使ったファイルの履歴をクリアするアクションハンドラ"""
@@ -605,7 +605,12 @@ class TableManager:
             # 各行のデータを設定
             for row, entry in enumerate(entries):
                 # 各列のアイテムを作成・設定
-                item0 = QTableWidgetItem(str(entry.position))
+                # positionは並べ替え用の値で連番とは限らないため、エントリ番号を表示する
+                # （キーが番号でない場合はキーを表示する）
+                entry_number = entry.entry_number
+                item0 = QTableWidgetItem(
+                    str(entry_number) if entry_number is not None else entry.key
+                )
                 item0.setData(
                     Qt.ItemDataRole.UserRole, entry.key
                 )  # キーを行データとして保存
@@ -297,6 +297,24 @@ class UIManager:
             )
             tools_menu.addAction(translation_result_action)
 
+        # デバッグ: SQL文の統計（回数、所要時間、実行計画）の記録と保存
+        if "toggle_query_stats" in callbacks and "export_query_stats" in callbacks:
+            debug_menu = tools_menu.addMenu("デバッグ")
+            debug_menu.setObjectName("debug_menu")
+
+            query_stats_action = QAction("SQL文の統計を記録", self.main_window)
+            query_stats_action.setObjectName("query_stats_action")
+            query_stats_action.setCheckable(True)
+            query_stats_action.toggled.connect(callbacks["toggle_query_stats"])
+            debug_menu.addAction(query_stats_action)
+
+            export_query_stats_action = QAction(
+                "SQL文の統計をJSONで保存...", self.main_window
+            )
+            export_query_stats_action.setObjectName("export_query_stats_action")
+            export_query_stats_action.triggered.connect(callbacks["export_query_stats"])
+            debug_menu.addAction(export_query_stats_action)
+
     def _setup_column_visibility_menu(
         self, toggle_callback: Callable[[int], None], table_manager: Any
     ) -> None:
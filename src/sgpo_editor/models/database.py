@@ -1,9 +1,29 @@
+import json
 import logging
 import apsw
+import queue
 import threading
+from bisect import bisect_left
 from contextlib import contextmanager
-from typing import Any, Dict, Iterator, List, Optional, Union, cast
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
+from sgpo_editor.models.query_stats import TRACE_MASK, QueryStatsRecorder, query_plan
+from sgpo_editor.models.statements import in_list_chunks, statement
 from sgpo_editor.types import (
     EntryDict,
     EntryDictList,
@@ -16,6 +36,123 @@ from sgpo_editor.types import (
 
 logger = logging.getLogger(__name__)
 
+# reconcile_entriesで比較するentriesの列（エントリの辞書のキーと同じ名前）
+_RECONCILE_COLUMNS = (
+    "msgctxt",
+    "msgid",
+    "msgstr",
+    "fuzzy",
+    "obsolete",
+    "previous_msgid",
+    "previous_msgid_plural",
+    "previous_msgctxt",
+    "comment",
+    "tcomment",
+)
+
+# bulk_loadで読み込みの後に作成する索引（索引名と対象）
+_LOAD_INDEXES = {
+    "idx_msgid": "entries(msgid)",
+    "idx_key": "entries(key)",
+    "idx_display_order_position": "display_order(position)",
+    "idx_display_order_entry_id": "display_order(entry_id)",
+    "idx_entry_references": "entry_references(entry_id)",
+    "idx_entry_flags": "entry_flags(entry_id)",
+}
+
+# entry_countsテーブルで数える件数（列名とentriesの行の条件、rowは行の名前）
+_ENTRY_COUNTS = {
+    "total": "1",
+    "translated": "{row}.msgstr != ''",
+    "untranslated": "{row}.msgstr = ''",
+    "fuzzy": "{row}.fuzzy = 1",
+    "obsolete": "{row}.obsolete = 1",
+    # fuzzyでないエントリの翻訳状態
+    "translated_not_fuzzy": "{row}.fuzzy = 0 AND {row}.msgstr != ''",
+    "untranslated_not_fuzzy": "{row}.fuzzy = 0 AND {row}.msgstr = ''",
+}
+
+
+def _entry_count_changes(event: str) -> str:
+    """entriesの行の変更に合わせてentry_countsを更新するSET句
+
+    Args:
+        event: トリガーのイベント（INSERT、UPDATE、DELETE）
+    """
+    changes = []
+    for name, condition in _ENTRY_COUNTS.items():
+        added = f"({condition.format(row='new')})"
+        removed = f"({condition.format(row='old')})"
+        if event == "INSERT":
+            changes.append(f"{name} = {name} + {added}")
+        elif event == "DELETE":
+            changes.append(f"{name} = {name} - {removed}")
+        elif name != "total":
+            changes.append(f"{name} = {name} + {added} - {removed}")
+    return ", ".join(changes)
+
+
+# 行の追加時に全文検索テーブルと件数を更新するトリガー
+# （bulk_loadでは削除し、読み込んだ行の分をまとめて更新する）
+_LOAD_TRIGGERS = {
+    "entries_fts_insert": """
+        CREATE TRIGGER IF NOT EXISTS entries_fts_insert
+        AFTER INSERT ON entries BEGIN
+            INSERT INTO entries_fts (rowid, msgid, msgstr, tcomment, comment)
+            VALUES (new.id, new.msgid, new.msgstr, new.tcomment, new.comment);
+        END
+    """,
+    "entries_fts_reference_insert": """
+        CREATE TRIGGER IF NOT EXISTS entries_fts_reference_insert
+        AFTER INSERT ON entry_references BEGIN
+            UPDATE entries_fts
+            SET reference = (
+                SELECT GROUP_CONCAT(reference, ' ') FROM entry_references
+                WHERE entry_id = new.entry_id
+            )
+            WHERE rowid = new.entry_id;
+        END
+    """,
+    "entry_counts_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS entry_counts_insert
+        AFTER INSERT ON entries BEGIN
+            UPDATE entry_counts SET {_entry_count_changes("INSERT")};
+        END
+    """,
+    "flag_counts_insert": """
+        CREATE TRIGGER IF NOT EXISTS flag_counts_insert
+        AFTER INSERT ON entry_flags BEGIN
+            INSERT INTO flag_counts (flag, count) VALUES (new.flag, 1)
+            ON CONFLICT (flag) DO UPDATE SET count = count + 1;
+        END
+    """,
+}
+
+# 読み取り専用の接続の最大数
+_READER_POOL_SIZE = 4
+# 他の接続の書き込みの終了を待つ時間（ミリ秒）
+_BUSY_TIMEOUT_MS = 30_000
+# 接続の設定（書き込み用・読み取り専用の接続に共通）
+_CONNECTION_PRAGMAS = {
+    # ページキャッシュの大きさ（負の値はKiB単位、32MiB）
+    "cache_size": -32768,
+    # ソートや一時索引をファイルではなくメモリに作成する
+    "temp_store": "MEMORY",
+}
+# データベースファイルのページを直接参照する範囲（ページキャッシュへの複製を省く）
+_FILE_MMAP_SIZE = 256 << 20
+# 接続ごとに保持する準備済みの文の数（statementsのSQL文とIN句の要素数の組み合わせ）
+_STATEMENT_CACHE_SIZE = 256
+# SQL文の統計を集計するtrace_v2の登録名
+_QUERY_STATS_TRACE_ID = "sgpo_editor.query_stats"
+
+# 表示順を振り直す際の間隔（move_entriesなどは間の値を使い、他の行を更新しない）
+# そのためdisplay_order.positionは並べ替え用の値で、連番のインデックスとは限らない
+_POSITION_GAP = 1024
+
+# add_entries_bulkで一度に挿入するエントリ数
+_BULK_CHUNK_SIZE = 5000
+
 
 class InMemoryEntryStore:
     """In-memory store for PO entries."""
@@ -27,14 +164,36 @@ class InMemoryEntryStore:
         """
         self._conn.setupdatehook(callback)
 
-    def __init__(self):
-        """Initialize the in-memory SQLite database."""
-        logger.debug("Initializing in-memory database")
-        # Create an in-memory SQLite database
-        self._conn = apsw.Connection(":memory:")
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """Initialize the SQLite database.
+
+        Args:
+            path: データベースファイルのパス（省略時はインメモリデータベース）
+        """
+        logger.debug("Initializing database: %s", path or ":memory:")
+        self.path = str(path) if path is not None else None
+        # インメモリデータベースはWALモードにできず、書き込みと読み取り専用の接続が
+        # 互いをロックするため、すべての操作に書き込み用の接続を使う
+        self._uri = self.path if self.path is not None else ":memory:"
+        self._conn = self._connect(
+            apsw.SQLITE_OPEN_READWRITE | apsw.SQLITE_OPEN_CREATE
+        )
         self._conn.execute("PRAGMA foreign_keys = ON")
-        # Thread safety lock
+        if self.path is not None:
+            # 読み込み中の書き込みを妨げないよう、WALモードで開く
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        # 書き込み用の接続（self._conn）のロック
         self._lock = threading.RLock()
+        # 読み取り専用の接続（ファイルの場合のみ、必要になった時点で
+        # _READER_POOL_SIZEまで作成する）
+        self._readers: "queue.LifoQueue[apsw.Connection]" = queue.LifoQueue()
+        self._all_readers: List[apsw.Connection] = []
+        self._readers_lock = threading.Lock()
+        # スレッドごとの書き込みトランザクションの深さ
+        self._local = threading.local()
+        self._exec_trace: Optional[Any] = None
+        self._query_stats: Optional[QueryStatsRecorder] = None
         self._create_tables()
         logger.debug("Database initialization complete")
 
@@ -156,32 +315,257 @@ class InMemoryEntryStore:
             )
 
             # インデックス作成（テーブル作成後に実行）
-            cur.execute("CREATE INDEX IF NOT EXISTS idx_msgid ON entries(msgid)")
-            cur.execute("CREATE INDEX IF NOT EXISTS idx_key ON entries(key)")
+            for name, target in _LOAD_INDEXES.items():
+                cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
             cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_display_order_position ON display_order(position)"
+                "CREATE INDEX IF NOT EXISTS idx_review_comments_entry_id ON review_comments(entry_id)"
             )
             cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_display_order_entry_id ON display_order(entry_id)"
+                "CREATE INDEX IF NOT EXISTS idx_quality_scores_entry_id ON quality_scores(entry_id)"
             )
             cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_entry_references ON entry_references(entry_id)"
+                "CREATE INDEX IF NOT EXISTS idx_check_results_entry_id ON check_results(entry_id)"
             )
             cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_entry_flags ON entry_flags(entry_id)"
+                "CREATE INDEX IF NOT EXISTS idx_category_scores_quality_score_id ON category_scores(quality_score_id)"
             )
+
+            # 全文検索テーブル（rowidはentries.id、referenceは参照の空白区切り）
+            # 日本語や中国語の部分一致検索に使うため、trigramで分割する
             cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_review_comments_entry_id ON review_comments(entry_id)"
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                    msgid, msgstr, tcomment, comment, reference,
+                    tokenize = 'trigram'
+                )
+            """
             )
+
+            # 全文検索テーブルをentries/entry_referencesと同期するトリガー
+            for trigger in _LOAD_TRIGGERS.values():
+                cur.execute(trigger)
             cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_quality_scores_entry_id ON quality_scores(entry_id)"
+                """
+                CREATE TRIGGER IF NOT EXISTS entries_fts_update
+                AFTER UPDATE OF msgid, msgstr, tcomment, comment ON entries BEGIN
+                    UPDATE entries_fts
+                    SET msgid = new.msgid, msgstr = new.msgstr,
+                        tcomment = new.tcomment, comment = new.comment
+                    WHERE rowid = new.id;
+                END
+            """
             )
             cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_check_results_entry_id ON check_results(entry_id)"
+                """
+                CREATE TRIGGER IF NOT EXISTS entries_fts_delete
+                AFTER DELETE ON entries BEGIN
+                    DELETE FROM entries_fts WHERE rowid = old.id;
+                END
+            """
+            )
+            cur.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS entries_fts_reference_delete
+                AFTER DELETE ON entry_references BEGIN
+                    UPDATE entries_fts
+                    SET reference = (
+                        SELECT GROUP_CONCAT(reference, ' ') FROM entry_references
+                        WHERE entry_id = old.entry_id
+                    )
+                    WHERE rowid = old.entry_id;
+                END
+            """
             )
 
+            # エントリの件数（1行）とフラグごとの件数
+            # 統計の取得のたびにentriesを数えないよう、トリガーで更新する
+            created = (
+                cur.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'entry_counts'"
+                ).fetchone()
+                is None
+            )
+            columns = ", ".join(
+                f"{name} INTEGER NOT NULL DEFAULT 0" for name in _ENTRY_COUNTS
+            )
+            cur.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS entry_counts (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    {columns}
+                )
+            """
+            )
+            cur.execute("INSERT OR IGNORE INTO entry_counts (id) VALUES (1)")
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS flag_counts (
+                    flag TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL
+                ) WITHOUT ROWID
+            """
+            )
+            for event in ("UPDATE", "DELETE"):
+                of_columns = " OF msgstr, fuzzy, obsolete" if event == "UPDATE" else ""
+                cur.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS entry_counts_{event.lower()}
+                    AFTER {event}{of_columns} ON entries BEGIN
+                        UPDATE entry_counts SET {_entry_count_changes(event)};
+                    END
+                """
+                )
+            cur.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS flag_counts_delete
+                AFTER DELETE ON entry_flags BEGIN
+                    UPDATE flag_counts SET count = count - 1 WHERE flag = old.flag;
+                END
+            """
+            )
+            cur.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS flag_counts_update
+                AFTER UPDATE OF flag ON entry_flags BEGIN
+                    UPDATE flag_counts SET count = count - 1 WHERE flag = old.flag;
+                    INSERT INTO flag_counts (flag, count) VALUES (new.flag, 1)
+                    ON CONFLICT (flag) DO UPDATE SET count = count + 1;
+                END
+            """
+            )
+            if created:
+                # 件数のテーブルがない版で作成したデータベースファイルの場合
+                self._recount(cur)
+
+            # データベース自体の情報（名前と値）
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS store_info (
+                    name TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """
+            )
+            if self.path is not None:
+                # エントリが変更されたら、元のPOファイルとの対応を取り消す
+                for event in ("INSERT", "UPDATE", "DELETE"):
+                    cur.execute(
+                        f"""
+                        CREATE TRIGGER IF NOT EXISTS entries_source_{event.lower()}
+                        AFTER {event} ON entries BEGIN
+                            DELETE FROM store_info WHERE name = 'source_hash';
+                        END
+                    """
+                    )
+
         logger.debug("テーブル作成完了")
 
+    def close(self) -> None:
+        """データベースを閉じる"""
+        with self._lock:
+            with self._readers_lock:
+                for reader in self._all_readers:
+                    reader.close()
+                self._all_readers.clear()
+            self._conn.close()
+
+    def set_exec_trace(self, callback: Optional[Any]) -> None:
+        """すべての接続で実行されるSQLを受け取るコールバックを登録する
+
+        Args:
+            callback: (cursor, sql, bindings) を受け取り、Trueを返す関数（Noneで解除）
+        """
+        with self._readers_lock:
+            self._exec_trace = callback
+            self._conn.exec_trace = callback
+            for reader in self._all_readers:
+                reader.exec_trace = callback
+
+    @property
+    def query_stats(self) -> Optional[QueryStatsRecorder]:
+        """SQL文の統計の集計（enable_query_statsで有効にしていない場合はNone）"""
+        return self._query_stats
+
+    def enable_query_stats(
+        self, recorder: Optional[QueryStatsRecorder] = None
+    ) -> QueryStatsRecorder:
+        """すべての接続で実行されるSQL文の統計（回数、所要時間、行数）の集計を開始する
+
+        Args:
+            recorder: 集計先（省略時は新しく作成する。他のストアと共有する場合に指定）
+
+        Returns:
+            QueryStatsRecorder: 集計先
+        """
+        recorder = recorder or self._query_stats or QueryStatsRecorder()
+        with self._readers_lock:
+            self._query_stats = recorder
+            for conn in [self._conn, *self._all_readers]:
+                conn.trace_v2(TRACE_MASK, recorder.trace, id=_QUERY_STATS_TRACE_ID)
+        return recorder
+
+    def disable_query_stats(self) -> None:
+        """SQL文の統計の集計を終了する"""
+        with self._readers_lock:
+            self._query_stats = None
+            for conn in [self._conn, *self._all_readers]:
+                conn.trace_v2(0, None, id=_QUERY_STATS_TRACE_ID)
+
+    def get_query_stats(self) -> Optional[Dict[str, Any]]:
+        """SQL文の統計を取得する
+
+        まだ実行計画を取得していないSQL文は、EXPLAIN QUERY PLANで実行計画を取得します。
+
+        Returns:
+            Optional[Dict[str, Any]]: JSONに変換できる統計（集計していない場合はNone）
+        """
+        recorder = self._query_stats
+        if recorder is None:
+            return None
+        pending = recorder.unexplained()
+        if pending:
+            with self.read_transaction() as cur:
+                conn = cur.connection
+                for sql in pending:
+                    try:
+                        plan = query_plan(conn, sql)
+                    except apsw.Error as e:
+                        logger.debug("実行計画を取得できませんでした: %s: %s", sql, e)
+                        plan = []
+                    recorder.set_plan(sql, plan)
+        return cast(Dict[str, Any], recorder.to_dict())
+
+    def get_info(self, name: str) -> Optional[str]:
+        """store_infoテーブルの値を取得する
+
+        Args:
+            name: 値の名前
+
+        Returns:
+            Optional[str]: 値（設定されていない場合はNone）
+        """
+        with self.read_transaction() as cur:
+            row = cur.execute(
+                "SELECT value FROM store_info WHERE name = ?", (name,)
+            ).fetchone()
+            return str(row[0]) if row else None
+
+    def set_info(self, name: str, value: Optional[str]) -> None:
+        """store_infoテーブルに値を設定する
+
+        Args:
+            name: 値の名前
+            value: 値（Noneの場合は削除）
+        """
+        with self.transaction() as cur:
+            if value is None:
+                cur.execute("DELETE FROM store_info WHERE name = ?", (name,))
+            else:
+                cur.execute(
+                    "INSERT OR REPLACE INTO store_info (name, value) VALUES (?, ?)",
+                    (name, value),
+                )
+
     @contextmanager
     def transaction(self) -> Iterator[apsw.Cursor]:
         """トランザクションを開始
@@ -192,21 +576,183 @@ class InMemoryEntryStore:
         with self._lock:
             with self._conn:  # APSWのトランザクションコンテキスト
                 cur = self._conn.cursor()
+                self._local.write_depth = getattr(self._local, "write_depth", 0) + 1
                 try:
                     yield cur
                 except Exception as e:
                     logger.error("トランザクションエラー: %s", e, exc_info=True)
                     raise
+                finally:
+                    self._local.write_depth -= 1
+                    cur.close()
+
+    @contextmanager
+    def read_transaction(self) -> Iterator[apsw.Cursor]:
+        """読み取り用のトランザクションを開始
+
+        データベースファイルの場合は読み取り専用の接続を使うため、他のスレッドの
+        読み取りや書き込みと同時に実行できます。インメモリデータベースの場合と、
+        同じスレッドで書き込みのトランザクション中の場合（未確定の変更を参照する
+        ため）は、書き込み用の接続を使います。
+        """
+        if getattr(self._local, "write_depth", 0) or self.path is None:
+            with self.transaction() as cur:
+                yield cur
+            return
+
+        reader = self._acquire_reader()
+        try:
+            with reader:
+                cur = reader.cursor()
+                try:
+                    yield cur
                 finally:
                     cur.close()
+        finally:
+            self._readers.put(reader)
+
+    def _connect(self, flags: int) -> apsw.Connection:
+        """データベースに接続し、_CONNECTION_PRAGMASなどの設定を適用する
+
+        Args:
+            flags: 接続のフラグ（読み書き・読み取り専用）
+        """
+        conn = apsw.Connection(
+            self._uri,
+            flags=flags | apsw.SQLITE_OPEN_URI,
+            statementcachesize=_STATEMENT_CACHE_SIZE,
+        )
+        conn.setbusytimeout(_BUSY_TIMEOUT_MS)
+        for name, value in _CONNECTION_PRAGMAS.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        if self.path is not None:
+            conn.execute(f"PRAGMA mmap_size = {_FILE_MMAP_SIZE}")
+        return conn
+
+    def _acquire_reader(self) -> apsw.Connection:
+        """空いている読み取り専用の接続を取得する（すべて使用中の場合は待つ）"""
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if len(self._all_readers) < _READER_POOL_SIZE:
+                reader = self._connect(apsw.SQLITE_OPEN_READONLY)
+                reader.exec_trace = self._exec_trace
+                if self._query_stats is not None:
+                    reader.trace_v2(
+                        TRACE_MASK, self._query_stats.trace, id=_QUERY_STATS_TRACE_ID
+                    )
+                self._all_readers.append(reader)
+                return reader
+        return self._readers.get()
+
+    def add_entries_bulk(self, entries: Iterable[EntryDict]) -> None:
+        """バルクインサートでエントリを追加
 
-    def add_entries_bulk(self, entries: EntryDictList) -> None:
-        logger.debug(f"add_entries_bulk呼び出し: {len(entries)}件")
-        """バルクインサートでエントリを追加"""
-        logger.debug("バルクインサート開始（%d件）", len(entries))
+        Args:
+            entries: 追加するエントリ（ジェネレータも可）。
+                各エントリの辞書には、追加したエントリのIDが"id"として設定されます
+        """
+        logger.debug("バルクインサート開始")
+        count = 0
         with self.transaction() as cur:
-            # エントリ一括挿入
-            entry_data = [
+            # 一定件数ずつ挿入し、エントリ全体のリストを作らずに済ませる
+            iterator = iter(entries)
+            while True:
+                chunk = list(islice(iterator, _BULK_CHUNK_SIZE))
+                if not chunk:
+                    break
+                self._insert_entries(cur, chunk)
+                count += len(chunk)
+        logger.debug("バルクインサート完了（%d件）", count)
+
+    def bulk_load(self, entries: Iterable[EntryDict]) -> None:
+        """読み込み用の設定でエントリを一括追加
+
+        add_entries_bulkと同じ結果になりますが、大量のエントリを読み込む間は
+        以下の処理を省略し、読み込みの後にまとめて行います。
+        - 表示順・参照・フラグなどの索引の更新（読み込み後に作成）
+        - 全文検索テーブルへの1行ずつの追加（読み込み後にまとめて追加）
+        - entry_counts・flag_countsの1行ずつの更新（読み込み後に数え直す）
+        - 外部キーの確認とファイルへの同期（読み込み中のみ無効化）
+
+        Args:
+            entries: 追加するエントリ（ジェネレータも可）
+        """
+        with self._lock:
+            # 外部キーと同期の設定はトランザクションの外でのみ変更できる
+            synchronous = _fetch_value(self._conn, "PRAGMA synchronous")
+            self._conn.execute("PRAGMA foreign_keys = OFF")
+            self._conn.execute("PRAGMA synchronous = OFF")
+            try:
+                with self.transaction() as cur:
+                    last_id = _fetch_value(
+                        cur, "SELECT COALESCE(MAX(id), 0) FROM entries"
+                    )
+                    for name in _LOAD_TRIGGERS:
+                        cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+                    for name in _LOAD_INDEXES:
+                        cur.execute(f"DROP INDEX IF EXISTS {name}")
+
+                    self.add_entries_bulk(entries)
+
+                    for name, target in _LOAD_INDEXES.items():
+                        cur.execute(f"CREATE INDEX {name} ON {target}")
+                    # IDは自動採番のため、読み込んだエントリのIDはすべてlast_idより大きい
+                    cur.execute(
+                        """
+                        INSERT INTO entries_fts (
+                            rowid, msgid, msgstr, tcomment, comment, reference
+                        )
+                        SELECT
+                            e.id, e.msgid, e.msgstr, e.tcomment, e.comment,
+                            (
+                                SELECT GROUP_CONCAT(reference, ' ')
+                                FROM entry_references WHERE entry_id = e.id
+                            )
+                        FROM entries e
+                        WHERE e.id > ?
+                        """,
+                        (last_id,),
+                    )
+                    self._recount(cur)
+                    for trigger in _LOAD_TRIGGERS.values():
+                        cur.execute(trigger)
+            finally:
+                self._conn.execute("PRAGMA foreign_keys = ON")
+                self._conn.execute(f"PRAGMA synchronous = {int(synchronous)}")
+
+    def _recount(self, cur: apsw.Cursor) -> None:
+        """entry_countsとflag_countsをentriesとentry_flagsから数え直す"""
+        columns = ", ".join(_ENTRY_COUNTS)
+        sums = ", ".join(
+            f"COALESCE(SUM({condition.format(row='entries')}), 0)"
+            for condition in _ENTRY_COUNTS.values()
+        )
+        cur.execute(
+            f"UPDATE entry_counts SET ({columns}) = (SELECT {sums} FROM entries)"
+        )
+        cur.execute("DELETE FROM flag_counts")
+        cur.execute(
+            """
+            INSERT INTO flag_counts (flag, count)
+            SELECT flag, COUNT(*) FROM entry_flags GROUP BY flag
+            """
+        )
+
+    def _insert_entries(self, cur: apsw.Cursor, entries: EntryDictList) -> None:
+        """エントリと参照・フラグ・表示順を挿入し、エントリにIDを設定する"""
+        ids = cur.executemany(
+            """
+            INSERT INTO entries (
+                key, msgctxt, msgid, msgstr, fuzzy, obsolete,
+                previous_msgid, previous_msgid_plural, previous_msgctxt,
+                comment, tcomment
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            RETURNING id
+            """,
+            [
                 (
                     entry.get("key", ""),
                     entry.get("msgctxt"),
@@ -221,84 +767,164 @@ class InMemoryEntryStore:
                     entry.get("tcomment"),
                 )
                 for entry in entries
-            ]
-
+            ],
+        ).fetchall()
+        # RETURNINGの結果は挿入した順に返る
+        for entry, (entry_id,) in zip(entries, ids):
+            entry["id"] = cast(int, entry_id)
+
+        references = [
+            (entry["id"], ref)
+            for entry in entries
+            for ref in entry.get("references", []) or []
+        ]
+        if references:
             cur.executemany(
-                """
-                INSERT INTO entries (
-                    key, msgctxt, msgid, msgstr, fuzzy, obsolete,
-                    previous_msgid, previous_msgid_plural, previous_msgctxt,
-                    comment, tcomment
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                entry_data,
+                "INSERT INTO entry_references (entry_id, reference) VALUES (?, ?)",
+                references,
             )
-            # デバッグ: insert直後の件数確認
-            cur.execute("SELECT COUNT(*) FROM entries")
-            count = cur.fetchone()[0]
-            print(f"[DEBUG] INSERT直後の件数: {count}")
 
-            # 挿入されたエントリのIDを取得
-            # keyとidのマッピングを作成
-            cur.execute(
-                """
-                SELECT id, key FROM entries
-                WHERE key IN ({})
-            """.format(",".join(["?"] * len(entries))),
-                [entry.get("key", "") for entry in entries],
+        flags = [
+            (entry["id"], flag)
+            for entry in entries
+            for flag in entry.get("flags", []) or []
+        ]
+        if flags:
+            cur.executemany(
+                "INSERT INTO entry_flags (entry_id, flag) VALUES (?, ?)", flags
             )
 
-            # id_mapをdict型で返すため、fetchall()の結果を明示的に変換
-            id_map = {
-                key: id for id, key in cur.fetchall()
-            }  # ここは (id, key) のタプルなのでOK
+        cur.executemany(
+            "INSERT INTO display_order (entry_id, position) VALUES (?, ?)",
+            [(entry["id"], entry.get("position", 0)) for entry in entries],
+        )
 
-            # エントリにIDを直接設定（entries自体を書き換える）
-            for entry in entries:
-                entry["id"] = id_map.get(entry.get("key", ""))
+    def reconcile_entries(self, entries: EntryDictList) -> Dict[str, int]:
+        """データベースのエントリを指定したエントリに一致させる（差分のみ更新）
 
-            # リファレンス一括挿入
-            references = []
-            for entry in entries:
-                entry_id = entry.get("id")
-                if entry_id:
-                    references.extend(
-                        [(entry_id, ref) for ref in entry.get("references", []) or []]
-                    )
+        msgctxtとmsgidが同じエントリは同じエントリとみなし、IDを維持したまま
+        変更された値だけを更新します。そのため、エントリIDに関連付けられた
+        レビューや品質スコアのデータは引き継がれます。
 
-            if references:
-                cur.executemany(
-                    "INSERT INTO entry_references (entry_id, reference) VALUES (?, ?)",
-                    references,
-                )
+        Args:
+            entries: add_entries_bulkと同じ形式のエントリのリスト
 
-            # フラグ一括挿入
-            flags = []
-            for entry in entries:
-                entry_id = entry.get("id")
-                if entry_id:
-                    flags.extend(
-                        [(entry_id, flag) for flag in entry.get("flags", []) or []]
+        Returns:
+            Dict[str, int]: 追加・更新・削除したエントリの件数
+                （"added"、"updated"、"removed"）
+        """
+        with self.transaction() as cur:
+            columns = ", ".join(f"e.{column}" for column in _RECONCILE_COLUMNS)
+            rows: List[Tuple[Any, ...]] = cur.execute(
+                f"""
+                SELECT
+                    e.id, e.key, {columns}, d.position,
+                    (
+                        SELECT json_group_array(reference) FROM (
+                            SELECT reference FROM entry_references
+                            WHERE entry_id = e.id ORDER BY id
+                        )
+                    ),
+                    (
+                        SELECT json_group_array(flag) FROM (
+                            SELECT flag FROM entry_flags
+                            WHERE entry_id = e.id ORDER BY id
+                        )
                     )
+                FROM entries e
+                LEFT JOIN display_order d ON e.id = d.entry_id
+                ORDER BY d.position DESC, e.id DESC
+                """
+            ).fetchall()
+
+            # (msgctxt, msgid)ごとの既存エントリ（末尾から取り出すため逆順）
+            existing: Dict[Tuple[Optional[str], str], List[Tuple]] = {}
+            for row in rows:
+                existing.setdefault((row[2], row[3]), []).append(row)
 
-            if flags:
+            new_entries = []
+            renamed = []
+            updated = []
+            positions = []
+            for entry in entries:
+                bucket = existing.get((entry.get("msgctxt"), entry.get("msgid", "")))
+                if not bucket:
+                    new_entries.append(entry)
+                    continue
+                row = bucket.pop()
+                entry_id = row[0]
+                entry["id"] = cast(int, entry_id)
+                key = entry.get("key", "")
+                if row[1] != key:
+                    renamed.append((key, entry_id))
+                position = entry.get("position", 0)
+                if row[-3] != position:
+                    positions.append((entry_id, position, row[-3] is None))
+
+                values = _reconcile_values(entry)
+                references = list(entry.get("references", []) or [])
+                flags = list(entry.get("flags", []) or [])
+                if (
+                    values != _reconcile_values(dict(zip(_RECONCILE_COLUMNS, row[2:-3])))
+                    or references != json.loads(row[-2])
+                    or flags != json.loads(row[-1])
+                ):
+                    updated.append((entry_id, values, references, flags))
+
+            removed = [(row[0],) for bucket in existing.values() for row in bucket]
+            if removed:
+                cur.executemany("DELETE FROM entries WHERE id = ?", removed)
+
+            if renamed:
+                # キーは一意のため、一時的なキーを経由して付け替える
                 cur.executemany(
-                    "INSERT INTO entry_flags (entry_id, flag) VALUES (?, ?)", flags
+                    "UPDATE entries SET key = ? WHERE id = ?",
+                    [(f"\0{entry_id}", entry_id) for _, entry_id in renamed],
                 )
+                cur.executemany("UPDATE entries SET key = ? WHERE id = ?", renamed)
 
-            # 表示順一括挿入
-            display_orders = [
-                (entry.get("id"), entry.get("position", 0))
-                for entry in entries
-                if entry.get("id")
-            ]
-            if display_orders:
+            assignments = ", ".join(f"{column} = ?" for column in _RECONCILE_COLUMNS)
+            for entry_id, values, references, flags in updated:
+                cur.execute(
+                    f"""
+                    UPDATE entries
+                    SET {assignments}, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                    """,
+                    values + (entry_id,),
+                )
+                cur.execute(
+                    "DELETE FROM entry_references WHERE entry_id = ?", (entry_id,)
+                )
                 cur.executemany(
-                    "INSERT INTO display_order (entry_id, position) VALUES (?, ?)",
-                    display_orders,
+                    "INSERT INTO entry_references (entry_id, reference) VALUES (?, ?)",
+                    [(entry_id, reference) for reference in references],
+                )
+                cur.execute("DELETE FROM entry_flags WHERE entry_id = ?", (entry_id,))
+                cur.executemany(
+                    "INSERT INTO entry_flags (entry_id, flag) VALUES (?, ?)",
+                    [(entry_id, flag) for flag in flags],
                 )
 
-        logger.debug("バルクインサート完了（%d件）", len(entries))
+            for entry_id, position, missing in positions:
+                if missing:
+                    cur.execute(
+                        "INSERT INTO display_order (entry_id, position) VALUES (?, ?)",
+                        (entry_id, position),
+                    )
+                else:
+                    cur.execute(statement("update_position"), (position, entry_id))
+
+            if new_entries:
+                self.add_entries_bulk(new_entries)
+
+        result = {
+            "added": len(new_entries),
+            "updated": len(updated),
+            "removed": len(removed),
+        }
+        logger.debug("エントリの差分更新完了: %s", result)
+        return result
 
     def add_entry(self, entry: EntryDict) -> None:
         """エントリを追加"""
@@ -361,40 +987,20 @@ class InMemoryEntryStore:
     def get_entry(self, key: str) -> Optional[EntryDict]:
         """エントリを取得"""
         logger.debug("エントリ取得開始: %s", key)
-        with self.transaction() as cur:
-            cur.execute(
-                """
-                SELECT
-                    e.*,
-                    d.position
-                FROM entries e
-                LEFT JOIN display_order d ON e.id = d.entry_id
-                WHERE e.key = ?
-            """,
-                (key,),
-            )
+        with self.read_transaction() as cur:
+            cur.execute(statement("store_entry"), (key,))
             row = cur.fetchone()
             if row:
                 entry = self._row_to_dict_from_cursor(cur, row)
 
                 # リファレンスを取得
-                cur.execute(
-                    "SELECT reference FROM entry_references WHERE entry_id = ?",
-                    (entry["id"],),
-                )
-                rows = cur.fetchall()
-                entry["references"] = [
-                    self._row_to_dict_from_cursor(cur, row)["reference"] for row in rows
-                ]
+                cur.execute(statement("entry_references"), (entry["id"],))
+                # fetchall後のカーソルは列情報を返さないため、列の位置で取り出す
+                entry["references"] = [row[0] for row in cur.fetchall()]
 
                 # フラグを取得
-                cur.execute(
-                    "SELECT flag FROM entry_flags WHERE entry_id = ?", (entry["id"],)
-                )
-                rows = cur.fetchall()
-                entry["flags"] = [
-                    self._row_to_dict_from_cursor(cur, row)["flag"] for row in rows
-                ]
+                cur.execute(statement("entry_flags"), (entry["id"],))
+                entry["flags"] = [row[0] for row in cur.fetchall()]
 
                 # レビュー関連データを取得
                 entry["review_data"] = self._get_review_data(entry["id"])
@@ -441,7 +1047,7 @@ class InMemoryEntryStore:
                 rows_updated = self._conn.changes()
 
                 # キーからIDを取得
-                id_cur = cur.execute("SELECT id FROM entries WHERE key = ?", (key,))
+                id_cur = cur.execute(statement("entry_id_by_key"), (key,))
                 row = id_cur.fetchone()
                 if row:
                     # idのみ取得なのでタプルでOK
@@ -482,43 +1088,32 @@ class InMemoryEntryStore:
         logger.debug(
             f"InMemoryEntryStore.get_entries_by_keys: {len(keys)}件のエントリを一括取得"
         )
-        entries = []
-
-        with self.transaction() as cur:
-            placeholders = ", ".join(["?"] * len(keys))
+        entries: List[EntryDict] = []
 
-            cur.execute(
-                f"""
-                SELECT
-                    e.*,
-                    d.position
-                FROM entries e
-                LEFT JOIN display_order d ON e.id = d.entry_id
-                WHERE e.key IN ({placeholders})
-                """,
-                keys,
-            )
-
-            for row in cur.fetchall():
-                entry = self._row_to_dict_from_cursor(cur, row)
+        with self.read_transaction() as cur:
+            rows: List[Dict[str, Any]] = []
+            for chunk in in_list_chunks(keys):
+                cur.execute(statement("store_entries_by_keys", keys=len(chunk)), chunk)
+                try:
+                    columns = [desc[0] for desc in cur.description]
+                except apsw.ExecutionCompleteError:
+                    # 一致する行がない場合、apswは列情報を返さない
+                    continue
+                rows.extend(dict(zip(columns, row)) for row in cur.fetchall())
 
+            for entry in rows:
                 # リファレンスを取得
-                cur.execute(
-                    "SELECT reference FROM entry_references WHERE entry_id = ?",
-                    (entry["id"],),
-                )
+                cur.execute(statement("entry_references"), (entry["id"],))
                 entry["references"] = [r[0] for r in cur.fetchall()]
 
                 # フラグを取得
-                cur.execute(
-                    "SELECT flag FROM entry_flags WHERE entry_id = ?", (entry["id"],)
-                )
+                cur.execute(statement("entry_flags"), (entry["id"],))
                 entry["flags"] = [r[0] for r in cur.fetchall()]
 
                 # レビュー関連データを取得
                 entry["review_data"] = self._get_review_data(entry["id"])
 
-                entries.append(entry)
+                entries.append(cast(EntryDict, entry))
 
         return entries
 
@@ -560,39 +1155,41 @@ class InMemoryEntryStore:
             LEFT JOIN display_order d ON e.id = d.entry_id
         """
         conditions = []
-        params = []
+        params: List[Any] = []
 
         # フラグによるフィルタリング
         if flag_conditions:
             if "include_flags" in flag_conditions:
                 flags = flag_conditions["include_flags"]
-                placeholders = ", ".join("?" * len(flags))
+                flag_in, flag_params = _flag_in_condition(flags)
                 conditions.append(
                     f"""
                     e.id IN (
                         SELECT entry_id
                         FROM entry_flags
-                        WHERE flag IN ({placeholders})
+                        WHERE {flag_in}
                         GROUP BY entry_id
-                        HAVING COUNT(DISTINCT flag) = {len(flags)}
+                        HAVING COUNT(DISTINCT flag) = ?
                     )
                 """
                 )
-                params.extend(flags)
+                params.extend(flag_params)
+                params.append(len(flags))
 
             if "exclude_flags" in flag_conditions:
-                flags = flag_conditions["exclude_flags"]
-                placeholders = ", ".join("?" * len(flags))
+                flag_in, flag_params = _flag_in_condition(
+                    flag_conditions["exclude_flags"]
+                )
                 conditions.append(
                     f"""
                     e.id NOT IN (
                         SELECT entry_id
                         FROM entry_flags
-                        WHERE flag IN ({placeholders})
+                        WHERE {flag_in}
                     )
                 """
                 )
-                params.extend(flags)
+                params.extend(flag_params)
 
             if flag_conditions.get("only_fuzzy"):
                 conditions.append(
@@ -757,10 +1354,12 @@ class InMemoryEntryStore:
             logging.debug(f"SQLパラメータ: {params}")
 
             # クエリ実行
-            cursor = self._conn.execute(query, params)
-            entries = [
-                self._row_to_dict_from_cursor(cursor, row) for row in cursor.fetchall()
-            ]
+            with self.read_transaction() as cursor:
+                cursor.execute(query, params)
+                entries = [
+                    self._row_to_dict_from_cursor(cursor, row)
+                    for row in cursor.fetchall()
+                ]
             print(f"取得したエントリ数: {len(entries)}件")
 
             # キーワード検索の場合、最初の数件を表示
@@ -807,25 +1406,203 @@ class InMemoryEntryStore:
         return cast(EntryDictList, entries)
 
     def reorder_entries(self, entry_ids: List[int]) -> None:
-        """エントリの表示順序を変更"""
+        """エントリの表示順序を変更
+
+        現在の順序のまま残せる最長のエントリはそのままにし、それ以外の
+        エントリの表示順だけを前後のエントリの間の値に更新します。
+
+        Args:
+            entry_ids: 新しい表示順に並べたすべてのエントリのID
+
+        Note:
+            更新後のpositionは並べ替え用の値で、連番のインデックスではありません。
+            エントリ番号にはEntryModel.entry_numberを使います
+        """
         with self.transaction() as cur:
-            # 一時的に制約を無効化
-            cur.execute("PRAGMA foreign_keys = OFF")
+            current = dict(cur.execute("SELECT entry_id, position FROM display_order"))
+            positions: List[Optional[int]] = [current.get(i) for i in entry_ids]
+            kept = _increasing_subsequence(positions)
+
+            new_positions: Dict[int, int] = {}
+            run: List[int] = []
+            lower: Optional[int] = None
+            for index, entry_id in enumerate(entry_ids):
+                if index not in kept:
+                    run.append(entry_id)
+                    continue
+                upper = positions[index]
+                if run:
+                    spread = _spread_positions(lower, upper, len(run))
+                    if spread is None:
+                        break
+                    new_positions.update(zip(run, spread))
+                    run = []
+                lower = upper
+            else:
+                spread = _spread_positions(lower, None, len(run))
+                new_positions.update(zip(run, spread or []))
+                run = []
+
+            if run:
+                # 間に空きがない場合は、すべてのエントリを間隔を空けて振り直す
+                new_positions = {
+                    entry_id: (i + 1) * _POSITION_GAP
+                    for i, entry_id in enumerate(entry_ids)
+                }
 
-            try:
-                # 表示順序を更新
-                cur.execute("DELETE FROM display_order")
-                # enumerate関数は(index, value)のタプルを生成するため、
-                # SQLのVALUES句に合わせて(value, index)の順序に入れ替える
-                cur.executemany(
-                    "INSERT INTO display_order (entry_id, position) VALUES (?, ?)",
-                    [(entry_id, i) for i, entry_id in enumerate(entry_ids)],
+            cur.executemany(
+                statement("update_position"),
+                [
+                    (position, entry_id)
+                    for entry_id, position in new_positions.items()
+                    if entry_id in current and current[entry_id] != position
+                ],
+            )
+            cur.executemany(
+                "INSERT INTO display_order (entry_id, position) VALUES (?, ?)",
+                [
+                    (entry_id, position)
+                    for entry_id, position in new_positions.items()
+                    if entry_id not in current
+                ],
+            )
+
+    def move_entries(self, keys: List[str], before_key: Optional[str] = None) -> None:
+        """エントリを指定したエントリの前に移動する
+
+        移動するエントリの表示順だけを更新します。移動先の前後の表示順に
+        空きがない場合のみ、すべてのエントリの表示順を振り直します。
+        positionは前後のエントリの間の値になるため、連番ではなくなります。
+
+        Args:
+            keys: 移動するエントリのキー（この順に並ぶ）
+            before_key: このキーのエントリの前に移動（Noneの場合は末尾）
+
+        Raises:
+            KeyError: キーに対応するエントリが存在しない場合
+            ValueError: before_keyが移動するエントリに含まれる場合
+        """
+        if before_key is not None and before_key in keys:
+            raise ValueError(f"移動先のエントリは移動できません: {before_key}")
+        if not keys:
+            return
+
+        with self.transaction() as cur:
+            entry_ids = []
+            for key in keys:
+                entry_id = self._get_entry_id_by_key(cur, key)
+                if entry_id is None:
+                    raise KeyError(key)
+                entry_ids.append(entry_id)
+            positions = self._allocate_positions(cur, before_key, entry_ids)
+            cur.executemany(
+                statement("update_position"),
+                list(zip(positions, entry_ids)),
+            )
+
+    def insert_entry(self, entry: EntryDict, before_key: Optional[str] = None) -> None:
+        """エントリを追加し、指定したエントリの前に表示する
+
+        positionは前後のエントリの間の値になるため、連番ではなくなります。
+
+        Args:
+            entry: 追加するエントリ（positionは使わない）
+            before_key: このキーのエントリの前に追加（Noneの場合は末尾）
+
+        Raises:
+            KeyError: before_keyに対応するエントリが存在しない場合
+        """
+        with self.transaction() as cur:
+            position = self._allocate_positions(cur, before_key, [None])[0]
+            self.add_entry(cast(EntryDict, {**entry, "position": position}))
+
+    def delete_entry(self, key: str) -> bool:
+        """エントリを削除する（他のエントリの表示順は変更しない）
+
+        Args:
+            key: 削除するエントリのキー
+
+        Returns:
+            bool: 削除した場合はTrue、エントリが存在しない場合はFalse
+        """
+        with self.transaction() as cur:
+            cur.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return self._conn.changes() > 0
+
+    def _allocate_positions(
+        self,
+        cur: apsw.Cursor,
+        before_key: Optional[str],
+        entry_ids: Sequence[Optional[int]],
+    ) -> List[int]:
+        """before_keyのエントリの直前に並べる表示順の値を決める
+
+        Args:
+            cur: 書き込み用のカーソル
+            before_key: このキーのエントリの前に並べる（Noneの場合は末尾）
+            entry_ids: 並べるエントリのID（移動するエントリは前後の判定から除く）
+
+        Returns:
+            List[int]: entry_idsの順に増加する表示順の値
+        """
+        moving = {entry_id for entry_id in entry_ids if entry_id is not None}
+        for attempt in range(2):
+            upper = None
+            if before_key is not None:
+                row = cur.execute(
+                    statement("display_position_by_key"), (before_key,)
+                ).fetchone()
+                if row is None:
+                    raise KeyError(before_key)
+                upper, before_id = row
+                # 同じ表示順のエントリがある場合は、振り直してから決める
+                tied = any(
+                    entry_id != before_id and entry_id not in moving
+                    for (entry_id,) in cur.execute(
+                        statement("entries_at_position"), (upper,)
+                    )
                 )
-            except Exception as e:
-                print(f"エントリの表示順序を変更中にエラーが発生しました: {str(e)}")
-            finally:
-                # 制約を有効化
-                cur.execute("PRAGMA foreign_keys = ON")
+                if tied and attempt == 0:
+                    self._rebalance_positions(cur, len(entry_ids))
+                    continue
+
+            # 直前のエントリは表示順の索引を逆順にたどって探す
+            # （読み飛ばすのは移動するエントリだけのため、最大でも移動する件数+1行）
+            if upper is None:
+                rows = cur.execute(statement("positions_desc"))
+            else:
+                rows = cur.execute(statement("positions_before_desc"), (upper,))
+            lower = next(
+                (position for position, entry_id in rows if entry_id not in moving),
+                None,
+            )
+
+            positions = _spread_positions(lower, upper, len(entry_ids))
+            if positions is not None:
+                return positions
+            if attempt == 0:
+                self._rebalance_positions(cur, len(entry_ids))
+        raise RuntimeError("表示順を割り当てられませんでした")
+
+    def _rebalance_positions(self, cur: apsw.Cursor, count: int = 1) -> None:
+        """現在の順序のまま、すべての表示順を間隔を空けて振り直す
+
+        Args:
+            cur: 書き込み用のカーソル
+            count: エントリの間に入れられるようにするエントリ数
+        """
+        logger.debug("表示順を振り直します")
+        cur.execute(
+            """
+            UPDATE display_order SET position = ranked.rank * ?
+            FROM (
+                SELECT id, ROW_NUMBER() OVER (ORDER BY position, entry_id) AS rank
+                FROM display_order
+            ) AS ranked
+            WHERE display_order.id = ranked.id
+            """,
+            (max(_POSITION_GAP, count + 1),),
+        )
 
     def _row_to_dict_from_cursor(self, cur, row) -> dict:
         """apswの行を辞書に変換"""
@@ -855,9 +1632,88 @@ class InMemoryEntryStore:
             close_cur = True
 
         try:
-            cur.execute("SELECT id FROM entries WHERE key = ?", (key,))
+            cur.execute(statement("entry_id_by_key"), (key,))
             row = cur.fetchone()
             return row[0] if row else None
         finally:
             if close_cur:
                 cur.close()
+
+
+def _flag_in_condition(flags: List[str]) -> Tuple[str, List[str]]:
+    """flagがflagsのいずれかに一致する条件とパラメータを返す
+
+    IN句はin_list_chunksで分割し、分割した条件をORでつなぎます。
+    """
+    chunks = list(in_list_chunks(flags)) or [[]]
+    condition = " OR ".join(
+        f"flag IN ({', '.join('?' * len(chunk))})" for chunk in chunks
+    )
+    return f"({condition})", [flag for chunk in chunks for flag in chunk]
+
+
+def _fetch_value(
+    conn: Union[apsw.Connection, apsw.Cursor], sql: str
+) -> Any:
+    """1行を返すSQL文の最初の列の値を取得する（行がない場合はNone）"""
+    row = conn.execute(sql).fetchone()
+    return row[0] if row else None
+
+
+def _reconcile_values(entry: Mapping[str, Any]) -> Tuple[Any, ...]:
+    """reconcile_entriesで比較・更新するentriesの列の値"""
+    return tuple(
+        bool(entry.get(column))
+        if column in ("fuzzy", "obsolete")
+        else entry.get(column, "" if column in ("msgid", "msgstr") else None)
+        for column in _RECONCILE_COLUMNS
+    )
+
+
+def _spread_positions(
+    lower: Optional[int], upper: Optional[int], count: int
+) -> Optional[List[int]]:
+    """lowerとupperの間（両端を含まない）に等間隔でcount個の表示順を割り当てる
+
+    Args:
+        lower: 直前の表示順（Noneの場合は先頭で、0以上の値を使う）
+        upper: 直後の表示順（Noneの場合は末尾で、_POSITION_GAPの間隔で並べる）
+        count: 割り当てる数
+
+    Returns:
+        Optional[List[int]]: 増加する表示順の値（間に空きがない場合はNone）
+    """
+    if upper is None:
+        start = -_POSITION_GAP if lower is None else lower
+        return [start + (i + 1) * _POSITION_GAP for i in range(count)]
+    if lower is None:
+        lower = -1
+    if upper - lower <= count:
+        return None
+    return [lower + (upper - lower) * (i + 1) // (count + 1) for i in range(count)]
+
+
+def _increasing_subsequence(values: List[Optional[int]]) -> Set[int]:
+    """値が狭義単調増加となる最長の部分列のインデックスを返す（Noneは含めない）"""
+    tails: List[int] = []  # 長さごとの部分列の最後の値
+    tail_indexes: List[int] = []
+    previous: Dict[int, int] = {}
+    for index, value in enumerate(values):
+        if value is None:
+            continue
+        length = bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_indexes.append(index)
+        else:
+            tails[length] = value
+            tail_indexes[length] = index
+        if length:
+            previous[index] = tail_indexes[length - 1]
+
+    result: Set[int] = set()
+    current = tail_indexes[-1] if tail_indexes else None
+    while current is not None:
+        result.add(current)
+        current = previous.get(current)
+    return result
@@ -111,6 +111,18 @@ class EntryModel(BaseModel):
         elif not value and "fuzzy" in self.flags:
             self.flags.remove("fuzzy")
 
+    @property
+    def entry_number(self) -> Optional[int]:
+        """エントリ番号（POファイル内のインデックス）
+
+        キーはPOファイル読み込み時のインデックスのため、キーから求めます。
+        positionは表示順の並べ替えに使う値で、連番とは限りません。
+
+        Returns:
+            Optional[int]: エントリ番号（キーが番号でない場合はNone）
+        """
+        return int(self.key) if self.key.isdigit() else None
+
     @computed_field
     @property
     def is_translated(self) -> bool:
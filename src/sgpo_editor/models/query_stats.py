@@ -0,0 +1,189 @@
+"""エントリのデータベースで実行したSQL文の統計
+
+InMemoryEntryStore.enable_query_stats で有効にすると、apswのtrace_v2で
+各接続（書き込み用・読み取り専用）の文の開始・結果の行・終了を受け取り、
+SQL文ごとに次の値を集計します。
+1. 実行回数と返した行数
+2. 所要時間の合計・平均・95パーセンタイル・最大
+3. 全件走査の行数（SQLITE_STMTSTATUS_FULLSCAN_STEP）
+4. 実行計画（EXPLAIN QUERY PLAN）と、その中の全件走査（SCAN）
+
+所要時間は文の開始から終了（リセット）までの経過時間です。
+結果を少しずつ取得する問い合わせでは、呼び出し側の処理時間も含みます。
+トレースのコールバック内では同じ接続でSQLを実行できないため、実行計画は
+統計を取得する際に、まだ取得していないSQL文についてだけ一度取得します。
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import apsw
+import apsw.ext
+
+# 記録するSQL文の種類（トランザクションの開始・終了やPRAGMAは記録しない）
+_RECORDED_KEYWORDS = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+# 95パーセンタイルの計算に使う、SQL文ごとの所要時間の件数（新しいものを残す）
+_LATENCY_SAMPLES = 1000
+# 受け取るtrace_v2のイベント
+TRACE_MASK = apsw.SQLITE_TRACE_STMT | apsw.SQLITE_TRACE_ROW | apsw.SQLITE_TRACE_PROFILE
+
+
+def query_plan(conn: apsw.Connection, sql: str) -> List[str]:
+    """SQL文を実行せずにEXPLAIN QUERY PLANの結果を取得する
+
+    Args:
+        conn: SQL文を解析する接続
+        sql: SQL文（プレースホルダーの値は不要）
+
+    Returns:
+        List[str]: 実行計画の各行（階層は先頭の空白で表す）
+    """
+    lines: List[str] = []
+
+    def walk(nodes: Optional[List[Any]], depth: int) -> None:
+        for node in nodes or []:
+            lines.append("  " * depth + node.detail)
+            walk(node.sub, depth + 1)
+
+    plan = apsw.ext.query_info(conn, sql, explain_query_plan=True).query_plan
+    if plan is not None:
+        walk(plan.sub, 0)
+    return lines
+
+
+def _is_full_scan(line: str) -> bool:
+    """実行計画の行がテーブル（または索引）全体の走査かどうか
+
+    副問い合わせの結果（SCAN (subquery-N)）や定数の行の走査は除きます。
+    """
+    line = line.strip()
+    return (
+        line.startswith("SCAN ")
+        and not line.startswith("SCAN (")
+        and "CONSTANT ROW" not in line
+    )
+
+
+class _StatementStats:
+    """1種類のSQL文の集計値"""
+
+    __slots__ = ("sql", "count", "rows", "total_ns", "max_ns", "fullscan_steps",
+                 "samples", "plan")
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.count = 0
+        self.rows = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.fullscan_steps = 0
+        self.samples: Deque[int] = deque(maxlen=_LATENCY_SAMPLES)
+        # 実行計画の各行（取得前はNone、取得できなかった場合は空のリスト）
+        self.plan: Optional[List[str]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        samples = sorted(self.samples)
+        p95_ns = samples[math.ceil(len(samples) * 0.95) - 1] if samples else 0
+        full_scans = [line.strip() for line in self.plan or [] if _is_full_scan(line)]
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "rows": self.rows,
+            "total_ms": self.total_ns / 1e6,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "p95_ms": p95_ns / 1e6,
+            "max_ms": self.max_ns / 1e6,
+            "fullscan_steps": self.fullscan_steps,
+            "plan": self.plan,
+            "full_scans": full_scans,
+        }
+
+
+class QueryStatsRecorder:
+    """trace_v2のイベントからSQL文ごとの統計を集計する
+
+    複数の接続（スレッド）から同時に呼ばれるため、集計はロックで保護します。
+    SQL文は空白を詰めた文字列ごとに集計し、トリガー内の文は呼び出し元の文に含めます。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._statements: Dict[str, _StatementStats] = {}
+        # 実行中の文（trace_v2のid -> [集計先, 開始時刻, 行数]）
+        self._running: Dict[int, List[Any]] = {}
+        self.started_at = time.time()
+
+    def trace(self, event: Dict[str, Any]) -> None:
+        """trace_v2のコールバック（InMemoryEntryStoreが各接続に登録する）"""
+        code = event["code"]
+        if code == apsw.SQLITE_TRACE_ROW:
+            running = self._running.get(event["id"])
+            if running is not None:
+                running[2] += 1
+            return
+
+        now = time.perf_counter_ns()
+        if code == apsw.SQLITE_TRACE_STMT:
+            if event.get("trigger") or event.get("explain"):
+                return
+            sql = event["sql"]
+            if not sql.lstrip().upper().startswith(_RECORDED_KEYWORDS):
+                return
+            key = " ".join(sql.split())
+            with self._lock:
+                stats = self._statements.get(key)
+                if stats is None:
+                    stats = self._statements[key] = _StatementStats(key)
+                self._running[event["id"]] = [stats, now, 0]
+        elif code == apsw.SQLITE_TRACE_PROFILE:
+            with self._lock:
+                running = self._running.pop(event["id"], None)
+                if running is None:
+                    return
+                stats, start, rows = running
+                elapsed = now - start
+                stats.count += 1
+                stats.rows += rows
+                stats.total_ns += elapsed
+                stats.max_ns = max(stats.max_ns, elapsed)
+                stats.samples.append(elapsed)
+                stats.fullscan_steps += event.get("stmt_status", {}).get(
+                    "SQLITE_STMTSTATUS_FULLSCAN_STEP", 0
+                )
+
+    def unexplained(self) -> List[str]:
+        """実行計画をまだ取得していないSQL文の一覧を返す"""
+        with self._lock:
+            return [sql for sql, stats in self._statements.items() if stats.plan is None]
+
+    def set_plan(self, sql: str, plan: List[str]) -> None:
+        """SQL文の実行計画を設定する
+
+        Args:
+            sql: unexplainedが返したSQL文
+            plan: EXPLAIN QUERY PLANの各行（階層は先頭の空白で表す）
+        """
+        with self._lock:
+            stats = self._statements.get(sql)
+            if stats is not None:
+                stats.plan = plan
+
+    def reset(self) -> None:
+        """集計値を消去する（取得済みの実行計画も消去する）"""
+        with self._lock:
+            self._statements.clear()
+            self.started_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """集計値を所要時間の合計の降順で返す（JSONに変換できる形式）"""
+        with self._lock:
+            statements = [stats.to_dict() for stats in self._statements.values()]
+        statements.sort(key=lambda stats: stats["total_ms"], reverse=True)
+        return {
+            "started_at": self.started_at,
+            "elapsed_seconds": time.time() - self.started_at,
+            "statements": statements,
+        }
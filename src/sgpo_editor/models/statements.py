@@ -0,0 +1,157 @@
+"""エントリのデータベースで実行するSQL文
+
+apswは接続ごとに準備済みの文（prepared statement）をSQLの文字列でキャッシュします。
+値を埋め込んだSQLや、要素数の異なるIN句のSQLは毎回別の文字列になるため、
+キャッシュが効かず、実行のたびにSQLの解析と実行計画の作成が行われます。
+
+このモジュールは、問い合わせの種類ごとに同じ文字列のSQLを使うための仕組みを提供します。
+1. statement: 名前を付けて登録したSQL文を返す（作成した文字列は再利用する）
+2. in_list_chunks: IN句の値を、要素数がIN_LIST_BUCKETSのいずれかになるよう分割・補完する
+3. ENTRY_DETAIL_COLUMNS: エントリのフラグ・参照・品質スコアをまとめて取得する列
+"""
+
+from functools import lru_cache
+from typing import Any, Iterator, List, Sequence
+
+# IN句の要素数（値の個数はこのいずれかに揃え、SQLの文字列の種類を抑える）
+IN_LIST_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+MAX_IN_LIST_SIZE = IN_LIST_BUCKETS[-1]
+
+# エントリに付随する値（フラグ、参照、品質スコア）をJSONとしてまとめて取得する列。
+# エントリを取得するSELECTに加えることで、行ごとに追加のクエリを実行せずに済む
+ENTRY_DETAIL_COLUMNS = """
+    (
+        SELECT json_group_array(flag) FROM (
+            SELECT flag FROM entry_flags WHERE entry_id = e.id ORDER BY id
+        )
+    ) AS flags_json,
+    (
+        SELECT json_group_array(reference) FROM (
+            SELECT reference FROM entry_references WHERE entry_id = e.id ORDER BY id
+        )
+    ) AS references_json,
+    (
+        SELECT json_array(
+            qs.overall_score,
+            json((
+                SELECT json_group_object(category, score) FROM (
+                    SELECT category, score FROM category_scores
+                    WHERE quality_score_id = qs.id ORDER BY id
+                )
+            ))
+        )
+        FROM quality_scores qs
+        WHERE qs.entry_id = e.id
+        ORDER BY qs.id
+        LIMIT 1
+    ) AS quality_json
+"""
+
+# 名前とSQL文（{名前}はIN句のプレースホルダーに置き換える）
+_STATEMENTS = {
+    "entry_by_key": "SELECT * FROM entries WHERE key = ?",
+    "entry_id_by_key": "SELECT id FROM entries WHERE key = ?",
+    "entries_by_keys": f"""
+        SELECT e.*, d.position, {ENTRY_DETAIL_COLUMNS}
+        FROM entries e
+        LEFT JOIN display_order d ON e.id = d.entry_id
+        WHERE e.key IN ({{keys}})
+    """,
+    "entry_ids_by_keys": "SELECT id, key FROM entries WHERE key IN ({keys})",
+    "all_entries": "SELECT * FROM entries",
+    "all_entries_basic_info": """
+        SELECT key, msgid, msgstr, fuzzy, obsolete FROM entries
+    """,
+    "entry_basic_info": """
+        SELECT e.key, e.msgid, e.msgstr, e.fuzzy, e.obsolete
+        FROM entries e
+        WHERE e.key = ?
+    """,
+    "store_entry": """
+        SELECT e.*, d.position
+        FROM entries e
+        LEFT JOIN display_order d ON e.id = d.entry_id
+        WHERE e.key = ?
+    """,
+    "store_entries_by_keys": """
+        SELECT e.*, d.position
+        FROM entries e
+        LEFT JOIN display_order d ON e.id = d.entry_id
+        WHERE e.key IN ({keys})
+    """,
+    "entry_references": "SELECT reference FROM entry_references WHERE entry_id = ?",
+    "entry_flags": "SELECT flag FROM entry_flags WHERE entry_id = ?",
+    "entry_counts": "SELECT * FROM entry_counts",
+    "total_count": "SELECT total FROM entry_counts",
+    "fuzzy_count": "SELECT fuzzy FROM entry_counts",
+    "flag_counts": "SELECT flag, count FROM flag_counts WHERE count > 0",
+    "flag_count": "SELECT count FROM flag_counts WHERE flag = ?",
+    "unique_msgid_count": "SELECT COUNT(DISTINCT msgid) AS count FROM entries",
+    "display_position_by_key": """
+        SELECT d.position, d.entry_id FROM display_order d
+        JOIN entries e ON e.id = d.entry_id
+        WHERE e.key = ?
+    """,
+    # 表示順の索引を逆順にたどる（直前のエントリを探す）
+    "positions_desc": """
+        SELECT position, entry_id FROM display_order ORDER BY position DESC
+    """,
+    "positions_before_desc": """
+        SELECT position, entry_id FROM display_order
+        WHERE position < ?
+        ORDER BY position DESC
+    """,
+    "entries_at_position": "SELECT entry_id FROM display_order WHERE position = ?",
+    "update_position": "UPDATE display_order SET position = ? WHERE entry_id = ?",
+}
+
+
+@lru_cache(maxsize=None)
+def statement(name: str, **in_sizes: int) -> str:
+    """登録したSQL文を返す
+
+    Args:
+        name: SQL文の名前
+        **in_sizes: IN句の名前と要素数（in_list_chunksで揃えた値の個数）
+
+    Returns:
+        str: SQL文（同じ引数には同じ文字列のオブジェクトを返す）
+
+    Raises:
+        KeyError: 登録されていない名前の場合
+    """
+    template = _STATEMENTS[name]
+    if not in_sizes:
+        return template
+    return template.format(
+        **{key: ", ".join("?" * size) for key, size in in_sizes.items()}
+    )
+
+
+def bucket_size(count: int) -> int:
+    """count個の値を入れるIN句の要素数を返す
+
+    Raises:
+        ValueError: countがMAX_IN_LIST_SIZEを超える場合
+    """
+    for size in IN_LIST_BUCKETS:
+        if count <= size:
+            return size
+    raise ValueError(f"IN句の値が多すぎます: {count}")
+
+
+def in_list_chunks(values: Sequence[Any]) -> Iterator[List[Any]]:
+    """IN句の値をMAX_IN_LIST_SIZE個ずつに分け、要素数をバケットに揃えて返す
+
+    足りない分は最後の値を繰り返すため、IN・NOT INの結果は変わりません。
+
+    Args:
+        values: IN句の値
+
+    Yields:
+        List[Any]: 要素数がIN_LIST_BUCKETSのいずれかの値のリスト
+    """
+    for start in range(0, len(values), MAX_IN_LIST_SIZE):
+        chunk = list(values[start : start + MAX_IN_LIST_SIZE])
+        chunk.extend(chunk[-1:] * (bucket_size(len(chunk)) - len(chunk)))
+        yield chunk
@@ -178,3 +178,27 @@ def reset_qt_mocks():
     yield
     # テスト後にガベージコレクションを実行
     gc.collect()
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolate_parse_cache(tmp_path_factory):
+    """解析結果キャッシュを一時ディレクトリに保存するフィクスチャ
+
+    POファイルを読み込むテスト（モジュール単位のフィクスチャを含む）が、
+    ユーザーのキャッシュディレクトリにキャッシュファイルを作成しないようにします。
+    """
+    from sgpo_editor.config import get_config
+    from sgpo_editor.core import parse_cache
+
+    config = get_config()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setitem(
+            config._config,
+            "parse_cache",
+            {
+                **config.get("parse_cache", {}),
+                "directory": str(tmp_path_factory.mktemp("parse_cache")),
+            },
+        )
+        monkeypatch.setattr(parse_cache, "_parse_cache_instance", None)
+        yield
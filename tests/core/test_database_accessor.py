@@ -1,3 +1,5 @@
+import threading
+
 import pytest
 from sgpo_editor.core.database_accessor import DatabaseAccessor
 from sgpo_editor.models.database import InMemoryEntryStore
@@ -214,3 +216,419 @@ def test_update_hook_called_on_insert_update_delete(db_store):
     assert any(op in op_types for op in (1, 18))  # 1:INSERT, 18:REPLACE
     assert any(op in op_types for op in (2, 9))  # 2:DELETE, 9:TRUNCATE
     assert any(op in op_types for op in (23, 18))  # 23:UPDATE, 18:REPLACE
+
+
+def test_fts5_index_follows_updates(db_accessor, db_store):
+    db_store.add_entries_bulk(
+        [
+            {
+                "key": "k1",
+                "msgid": "Open file",
+                "msgstr": "",
+                "references": ["src/open.py:10"],
+                "position": 1,
+            },
+            {
+                "key": "k2",
+                "msgid": "Close",
+                "msgstr": "Open later",
+                "position": 0,
+            },
+        ]
+    )
+
+    # 並び順は全文検索を使ってもsort_columnに従う
+    results = db_accessor.advanced_search(search_text="open")
+    assert [r["key"] for r in results] == ["k2", "k1"]
+    results = db_accessor.advanced_search(search_text="open", search_fields=["msgid"])
+    assert [r["key"] for r in results] == ["k1"]
+    results = db_accessor.advanced_search(
+        search_text="open.py", search_fields=["reference"]
+    )
+    assert [r["key"] for r in results] == ["k1"]
+
+    # 更新・削除が全文検索テーブルに反映されること
+    db_store.update_entry("k2", {"msgid": "Close", "msgstr": "閉じる"})
+    results = db_accessor.advanced_search(search_text="open")
+    assert [r["key"] for r in results] == ["k1"]
+    with db_store.transaction() as cur:
+        cur.execute("DELETE FROM entries WHERE key = 'k1'")
+    assert db_accessor.advanced_search(search_text="open") == []
+
+
+def test_fts5_trigram_substring_search(db_accessor, db_store):
+    db_store.add_entries_bulk(
+        [
+            {"key": "k1", "msgid": "Open File", "msgstr": "ファイルを開きます"},
+            {"key": "k2", "msgid": "Wait...", "msgstr": "お待ちください"},
+            {"key": "k3", "msgid": "Profile", "msgstr": "プロファイル"},
+        ]
+    )
+
+    def search(text, **kwargs):
+        results = db_accessor.advanced_search(search_text=text, **kwargs)
+        return sorted(r["key"] for r in results)
+
+    # 単語の途中や日本語の文中でも、LIKE '%x%'と同じく部分一致する
+    assert search("ファイル") == ["k1", "k3"]
+    assert search("を開き") == ["k1"]
+    assert search("FILE") == ["k1", "k3"]
+    assert search("FILE", case_sensitive=True) == []
+    assert search("n f") == ["k1"]
+    assert search("...") == ["k2"]
+    # 3文字未満は全件の走査で検索する
+    assert search("開き") == ["k1"]
+    assert search("le") == ["k1", "k3"]
+
+
+def test_entry_details_fetched_without_extra_queries(db_accessor, db_store):
+    db_store.add_entries_bulk(
+        [
+            {
+                "key": "k1",
+                "msgid": "Open",
+                "msgstr": "開く",
+                "flags": ["fuzzy", "java-format"],
+                "references": ["a.java:1", "b.java:2"],
+                "position": 0,
+            },
+            {"key": "k2", "msgid": "Close", "msgstr": "", "position": 1},
+        ]
+    )
+    with db_store.transaction() as cur:
+        cur.execute(
+            "INSERT INTO quality_scores (entry_id, overall_score) "
+            "SELECT id, 80 FROM entries WHERE key = 'k1'"
+        )
+        quality_score_id = db_store._conn.last_insert_rowid()
+        cur.executemany(
+            "INSERT INTO category_scores (quality_score_id, category, score) "
+            "VALUES (?, ?, ?)",
+            [(quality_score_id, "accuracy", 90), (quality_score_id, "fluency", 70)],
+        )
+
+    # 取得1回につき実行されるSELECT文は1つだけ（トランザクションの開始・終了を除く）
+    statements = []
+
+    def trace(cursor, sql, bindings):
+        if "SELECT" in sql:
+            statements.append(sql)
+        return True
+
+    db_store.set_exec_trace(trace)
+    try:
+        results = db_accessor.advanced_search(search_text="o")
+        by_keys = db_accessor.get_entries_by_keys(["k1", "k2"])
+    finally:
+        db_store.set_exec_trace(None)
+    assert len(statements) == 2
+
+    assert [r["key"] for r in results] == ["k1", "k2"]
+    entry = by_keys["k1"]
+    assert entry == results[0]
+    assert entry["flags"] == ["fuzzy", "java-format"]
+    assert entry["references"] == ["a.java:1", "b.java:2"]
+    assert entry["overall_quality_score"] == 80
+    assert entry["category_quality_scores"] == {"accuracy": 90, "fluency": 70}
+    assert "flags" not in by_keys["k2"]
+    assert "overall_quality_score" not in by_keys["k2"]
+    assert db_accessor.get_entries_by_keys(["missing"]) == {}
+
+
+def test_advanced_search_page_follows_cursor(db_accessor, db_store):
+    db_store.add_entries_bulk(
+        [
+            {
+                "key": f"k{i}",
+                "msgid": f"item {i % 3}",
+                "msgstr": "" if i % 4 == 0 else "訳",
+                "position": i,
+            }
+            for i in range(10)
+        ]
+    )
+
+    def collect(**kwargs):
+        keys, cursor = [], None
+        while True:
+            page = db_accessor.advanced_search_page(
+                page_size=3, cursor=cursor, **kwargs
+            )
+            assert len(page.entries) <= 3
+            keys.extend(entry["key"] for entry in page.entries)
+            cursor = page.next_cursor
+            if cursor is None:
+                return keys
+
+    # ページをつなげるとadvanced_searchと同じ結果になる
+    for kwargs in (
+        {},
+        {"sort_column": "msgid", "sort_order": "desc"},
+        {"sort_column": "score"},
+        {"search_text": "item 1", "translation_status": "translated"},
+    ):
+        expected = [r["key"] for r in db_accessor.advanced_search(**kwargs)]
+        assert collect(**kwargs) == expected
+
+    # 途中でエントリが追加されても、取得済みのエントリは重複しない
+    page = db_accessor.advanced_search_page(page_size=5)
+    db_store.add_entry({"key": "new", "msgid": "new", "msgstr": "", "position": -1})
+    rest = db_accessor.advanced_search_page(page_size=10, cursor=page.next_cursor)
+    assert [e["key"] for e in rest.entries] == [f"k{i}" for i in range(5, 10)]
+    assert rest.next_cursor is None
+
+    with pytest.raises(ValueError):
+        db_accessor.advanced_search_page(sort_column="msgid", cursor=page.next_cursor)
+    with pytest.raises(ValueError):
+        db_accessor.advanced_search_page(cursor="invalid")
+    assert db_accessor.advanced_search_page(search_text="missing").entries == []
+
+
+def test_advanced_search_breaks_ties_by_position(db_accessor, db_store):
+    # 表示順をIDの順と逆にして、同じmsgidのエントリを並べる
+    db_store.add_entries_bulk(
+        [
+            {"key": f"k{i}", "msgid": "same", "msgstr": "", "position": 10 - i}
+            for i in range(4)
+        ]
+    )
+
+    for sort_order, expected in (
+        ("asc", ["k3", "k2", "k1", "k0"]),
+        ("desc", ["k0", "k1", "k2", "k3"]),
+    ):
+        kwargs = {"sort_column": "msgid", "sort_order": sort_order}
+        results = db_accessor.advanced_search(**kwargs)
+        assert [r["key"] for r in results] == expected
+        page = db_accessor.advanced_search_page(page_size=10, **kwargs)
+        assert [e["key"] for e in page.entries] == expected
+
+
+def test_bulk_load_matches_add_entries_bulk(db_accessor, db_store):
+    def generate(count):
+        for i in range(count):
+            yield {
+                "key": str(i),
+                "msgid": f"Message {i}",
+                "msgstr": "",
+                "references": [f"src/file{i}.py:1"],
+                "flags": ["fuzzy"] if i == 7 else [],
+                "position": i,
+            }
+
+    # SQLiteの変数の上限（32766）を超える件数もジェネレータから読み込める
+    db_accessor.bulk_load(generate(40000))
+
+    assert db_accessor.count_entries() == 40000
+    entry = db_accessor.get_entries_by_keys(["7"])["7"]
+    assert entry["flags"] == ["fuzzy"]
+    assert entry["references"] == ["src/file7.py:1"]
+    # 読み込み後に作成した全文検索テーブルと索引が使われる
+    results = db_accessor.advanced_search(
+        search_text="file39999.py", search_fields=["reference"]
+    )
+    assert [r["key"] for r in results] == ["39999"]
+    with db_store.transaction() as cur:
+        names = {row[0] for row in cur.execute("SELECT name FROM sqlite_master")}
+        assert cur.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert {"idx_entry_references", "entries_fts_insert"} <= names
+
+    # 読み込み後の追加はトリガーで全文検索テーブルに反映される
+    db_store.add_entries_bulk(
+        [{"key": "new", "msgid": "Appended", "msgstr": "", "references": ["x.py"]}]
+    )
+    results = db_accessor.advanced_search(search_text="x.py", search_fields=["reference"])
+    assert [r["key"] for r in results] == ["new"]
+
+
+def test_reads_run_concurrently_with_other_reads(tmp_path):
+    # 読み取り専用の接続を使うのはデータベースファイルの場合のみ
+    db_store = InMemoryEntryStore(tmp_path / "entries.db")
+    db_accessor = DatabaseAccessor(db_store)
+    db_store.add_entries_bulk(
+        [{"key": "k1", "msgid": "Open", "msgstr": "", "position": 0}]
+    )
+    counts = []
+
+    with db_store.read_transaction() as cur:
+        assert cur.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 1
+        # 別のスレッドの読み取りは、このトランザクションの終了を待たない
+        worker = threading.Thread(
+            target=lambda: counts.append(db_accessor.count_entries())
+        )
+        worker.start()
+        worker.join(timeout=5)
+        assert counts == [1]
+
+    # 書き込みのトランザクション中の読み取りは未確定の変更を参照する
+    with db_store.transaction() as cur:
+        cur.execute("UPDATE entries SET msgstr = '開く' WHERE key = 'k1'")
+        assert db_accessor.get_entry_by_key("k1")["msgstr"] == "開く"
+    assert db_accessor.get_entries_by_keys(["k1"])["k1"]["msgstr"] == "開く"
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_writes_succeed_while_other_threads_read(tmp_path, in_memory):
+    db_store = InMemoryEntryStore(None if in_memory else tmp_path / "entries.db")
+    db_accessor = DatabaseAccessor(db_store)
+    db_store.add_entries_bulk(
+        [
+            {"key": f"k{i}", "msgid": f"m{i}", "msgstr": "", "position": i}
+            for i in range(2000)
+        ]
+    )
+    done = threading.Event()
+    updated = []
+    errors = []
+
+    def write():
+        try:
+            for i in range(100):
+                updated.append(db_store.update_entry(f"k{i}", {"msgstr": f"s{i}"}))
+        finally:
+            done.set()
+
+    def read():
+        try:
+            while not done.is_set():
+                db_accessor.advanced_search(search_text="m1")
+                db_accessor.count_entries()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read, daemon=True) for _ in range(6)]
+    threads.append(threading.Thread(target=write, daemon=True))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=20)
+
+    # 読み取りが書き込みをロックしたままにせず、すべての更新が反映される
+    assert not any(thread.is_alive() for thread in threads)
+    assert errors == []
+    assert updated == [True] * 100
+    assert db_accessor.get_entry_by_key("k99")["msgstr"] == "s99"
+
+
+def test_entry_counts_follow_changes(db_accessor, db_store):
+    def expected_counts():
+        with db_store.transaction() as cur:
+            total, translated, fuzzy, obsolete = cur.execute(
+                "SELECT COUNT(*), SUM(msgstr != ''), SUM(fuzzy), SUM(obsolete)"
+                " FROM entries"
+            ).fetchone()
+            flags = dict(
+                cur.execute("SELECT flag, COUNT(*) FROM entry_flags GROUP BY flag")
+            )
+        return (total, translated or 0, fuzzy or 0, obsolete or 0), flags
+
+    def actual_counts():
+        counts = db_accessor.get_entry_counts()
+        assert counts["translated"] + counts["untranslated"] == counts["total"]
+        flags = db_accessor.get_flag_counts()
+        flags.pop("fuzzy", None)
+        return (
+            counts["total"],
+            counts["translated"],
+            counts["fuzzy"],
+            counts["obsolete"],
+        ), flags
+
+    db_accessor.bulk_load(
+        {
+            "key": str(i),
+            "msgid": f"Message {i}",
+            "msgstr": "訳" if i % 3 == 0 else "",
+            "fuzzy": i % 5 == 0,
+            "obsolete": i == 4,
+            "flags": ["python-format"] if i % 2 == 0 else [],
+            "position": i,
+        }
+        for i in range(10)
+    )
+    assert actual_counts() == expected_counts()
+    assert actual_counts()[1] == {"python-format": 5}
+
+    db_store.add_entries_bulk(
+        [{"key": "10", "msgid": "New", "msgstr": "", "flags": ["c-format"]}]
+    )
+    db_store.update_entry(
+        "1", {"msgid": "Message 1", "msgstr": "訳", "fuzzy": True, "flags": []}
+    )
+    db_store.reconcile_entries(
+        [{"key": str(i), "msgid": f"Message {i}", "msgstr": ""} for i in range(3)]
+    )
+    assert actual_counts() == expected_counts()
+    assert db_accessor.get_entry_counts_by_status() == (3, 0, 0, 3)
+    assert db_accessor.count_entries_with_flag("c-format") == 0
+
+    db_store.clear()
+    assert actual_counts() == ((0, 0, 0, 0), {})
+
+
+def test_move_entries_updates_only_moved_positions(db_accessor, db_store):
+    db_accessor.bulk_load(
+        {"key": str(i), "msgid": f"Message {i}", "msgstr": "", "position": i}
+        for i in range(6)
+    )
+
+    def order():
+        page = db_accessor.advanced_search_page(page_size=100)
+        return [entry["key"] for entry in page.entries]
+
+    def positions():
+        with db_store.transaction() as cur:
+            return dict(
+                cur.execute(
+                    "SELECT e.key, d.position FROM entries e"
+                    " JOIN display_order d ON d.entry_id = e.id"
+                )
+            )
+
+    # 読み込み直後は間に空きがないため、最初の移動で振り直す
+    db_accessor.move_entries(["4"], before_key="1")
+    assert order() == ["0", "4", "1", "2", "3", "5"]
+
+    # 以降の移動・追加・削除は対象のエントリの表示順だけを変更する
+    before = positions()
+    db_accessor.move_entries(["0", "2"], before_key=None)
+    db_accessor.insert_entry({"key": "new", "msgid": "New", "msgstr": ""}, "3")
+    assert db_accessor.delete_entry("5")
+    after = positions()
+    assert {key for key in before if before[key] != after.get(key)} == {"0", "2", "5"}
+    assert order() == ["4", "1", "new", "3", "0", "2"]
+
+    with pytest.raises(KeyError):
+        db_accessor.move_entries(["missing"])
+    with pytest.raises(ValueError):
+        db_accessor.move_entries(["1"], before_key="1")
+
+    # reorder_entriesは順序が変わるエントリだけを更新する
+    ids = {}
+    with db_store.transaction() as cur:
+        ids = dict(cur.execute("SELECT key, id FROM entries"))
+    before = positions()
+    db_store.reorder_entries([ids[key] for key in ["4", "new", "1", "3", "0", "2"]])
+    after = positions()
+    assert order() == ["4", "new", "1", "3", "0", "2"]
+    assert [key for key in before if before[key] != after[key]] == ["new"]
+
+
+def test_flag_condition_binds_every_flag(db_store):
+    from sgpo_editor.models.database import _flag_in_condition
+    from sgpo_editor.models.statements import MAX_IN_LIST_SIZE
+
+    db_store.add_entry({"key": "a", "msgid": "a", "msgstr": "", "flags": ["target"]})
+    db_store.add_entry({"key": "b", "msgid": "b", "msgstr": "", "flags": ["other"]})
+    flags = [f"unused{i}" for i in range(MAX_IN_LIST_SIZE)] + ["target"]
+
+    condition, params = _flag_in_condition(flags)
+    with db_store.read_transaction() as cur:
+        excluded = cur.execute(
+            f"""
+            SELECT key FROM entries
+            WHERE id NOT IN (SELECT entry_id FROM entry_flags WHERE {condition})
+            """,
+            params,
+        ).fetchall()
+    assert excluded == [("b",)]
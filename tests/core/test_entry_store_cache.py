@@ -0,0 +1,141 @@
+import asyncio
+
+from sgpo_editor.core import po_components
+from sgpo_editor.core.entry_store_cache import EntryStoreCache
+from sgpo_editor.core.parse_cache import hash_file
+from sgpo_editor.core.po_components.base import POFileBaseComponent
+from sgpo_editor.core.po_factory import POLibraryType
+from sgpo_editor.models.database import InMemoryEntryStore
+
+PO_TEXT = """msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+"Language: ja\\n"
+
+#: src/main.py:10
+msgctxt "menu:"
+msgid "Open"
+msgstr "開く"
+
+msgid "Close"
+msgstr "閉じる"
+
+msgid "Save"
+msgstr "保存"
+"""
+
+
+def make_entries(*items):
+    return [
+        {
+            "key": str(i),
+            "position": i,
+            "msgid": msgid,
+            "msgstr": msgstr,
+            "references": [f"src/{msgid}.py:1"],
+        }
+        for i, (msgid, msgstr) in enumerate(items)
+    ]
+
+
+def entry_ids(store):
+    with store.transaction() as cur:
+        rows = cur.execute("SELECT msgid, id FROM entries").fetchall()
+    return dict(rows)
+
+
+def test_reconcile_entries_keeps_ids():
+    store = InMemoryEntryStore()
+    store.add_entries_bulk(make_entries(("Open", "開く"), ("Close", ""), ("Save", "")))
+    ids = entry_ids(store)
+    with store.transaction() as cur:
+        cur.execute(
+            "INSERT INTO quality_scores (entry_id, overall_score) VALUES (?, 80)",
+            (ids["Close"],),
+        )
+
+    # 先頭に追加、Closeを翻訳、Saveを削除
+    result = store.reconcile_entries(
+        make_entries(("New", ""), ("Open", "開く"), ("Close", "閉じる"))
+    )
+
+    assert result == {"added": 1, "updated": 1, "removed": 1}
+    new_ids = entry_ids(store)
+    assert new_ids["Open"] == ids["Open"] and new_ids["Close"] == ids["Close"]
+    assert "Save" not in new_ids
+    entry = store.get_entry("2")
+    assert entry["msgid"] == "Close" and entry["msgstr"] == "閉じる"
+    assert entry["position"] == 2
+    assert store.get_entry("0")["msgid"] == "New"
+    # エントリIDに関連付けられたデータは引き継がれる
+    with store.transaction() as cur:
+        row = cur.execute("SELECT entry_id FROM quality_scores").fetchone()
+    assert row[0] == ids["Close"]
+
+    # 変更がなければ何も更新しない
+    assert store.reconcile_entries(
+        make_entries(("New", ""), ("Open", "開く"), ("Close", "閉じる"))
+    ) == {"added": 0, "updated": 0, "removed": 0}
+
+
+def test_store_is_reused_until_file_changes(tmp_path):
+    cache = EntryStoreCache(tmp_path / "stores")
+    po_path = tmp_path / "a.po"
+    po_path.write_text(PO_TEXT, encoding="utf-8")
+    content_hash = hash_file(po_path)
+
+    store = cache.open(po_path, "sgpo")
+    assert cache.get_metadata(store, content_hash) is None
+    cache.reconcile(
+        store, content_hash, {"Language": "ja"}, make_entries(("Open", "開く"))
+    )
+    store.close()
+
+    store = cache.open(po_path, "sgpo")
+    assert cache.get_metadata(store, content_hash) == {"Language": "ja"}
+    assert store.get_entry("0")["msgstr"] == "開く"
+    # 作業データベースのエントリを編集すると、POファイルとの対応は取り消される
+    store.update_entry("0", {"msgid": "Open", "msgstr": "開け"})
+    assert cache.get_metadata(store, content_hash) is None
+    store.close()
+
+    # ライブラリの種類が異なる場合は別のデータベース
+    other = cache.open(po_path, "polib")
+    assert other.get_entry("0") is None
+    other.close()
+
+
+def test_load_attaches_unchanged_file(tmp_path, monkeypatch):
+    cache = EntryStoreCache(tmp_path / "stores")
+    monkeypatch.setattr(po_components.base, "get_entry_store_cache", lambda: cache)
+    po_path = tmp_path / "a.po"
+    po_path.write_text(PO_TEXT, encoding="utf-8")
+
+    component = POFileBaseComponent(library_type=POLibraryType.SGPO)
+    asyncio.run(component.load(po_path))
+    assert component.db.path is not None
+    assert component.db_accessor.db is component.db
+    close_id = entry_ids(component.db)["Close"]
+
+    # 変更されていないファイルは解析しない
+    reopened = POFileBaseComponent(library_type=POLibraryType.SGPO)
+    parsed = []
+    load_parse_result = reopened._load_parse_result
+    monkeypatch.setattr(
+        reopened,
+        "_load_parse_result",
+        lambda path: parsed.append(path) or load_parse_result(path),
+    )
+    asyncio.run(reopened.load(po_path))
+    assert parsed == []
+    assert reopened.metadata["Language"] == "ja"
+    assert reopened.db_accessor.get_entry_by_key("1")["msgstr"] == "閉じる"
+    component.db.close()
+
+    # 変更されたファイルは差分更新する
+    po_path.write_text(PO_TEXT.replace('msgstr "閉じる"', 'msgstr "終了"'), "utf-8")
+    asyncio.run(reopened.load(po_path))
+    assert parsed == [po_path]
+    assert reopened.db_accessor.get_entry_by_key("1")["msgstr"] == "終了"
+    assert entry_ids(reopened.db)["Close"] == close_id
+    reopened.db.close()
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from sgpo_editor.core.parse_cache import ParseCache, ParseResult, snapshot_entries
+import sgpo
+
+PO_TEXT = """msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+#: src/main.py:10
+#, fuzzy
+msgctxt "menu:"
+msgid "Open"
+msgstr "開く"
+
+msgid "Close"
+msgstr "閉じる"
+"""
+
+
+def write_po(path, text=PO_TEXT):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def parse(path):
+    pofile = sgpo.pofile(str(path))
+    return ParseResult(dict(pofile.metadata), snapshot_entries(pofile))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path / "cache")
+
+
+def test_hit_after_store(cache, tmp_path):
+    po_path = write_po(tmp_path / "a.po")
+    assert cache.load(po_path, "sgpo") is None
+
+    result = parse(po_path)
+    cache.store(po_path, result, "sgpo")
+    cached = cache.load(po_path, "sgpo")
+
+    assert cached == result
+    assert cached.entries[0].msgctxt == "menu:"
+    assert cached.entries[0].flags == ["fuzzy"]
+    assert cached.entries[0].occurrences == [("src/main.py", "10")]
+    # ライブラリの種類が異なる場合は別のキャッシュ
+    assert cache.load(po_path, "polib") is None
+
+
+def test_invalidated_when_file_changes(cache, tmp_path):
+    po_path = write_po(tmp_path / "a.po")
+    cache.store(po_path, parse(po_path), "sgpo")
+
+    # サイズが同じで更新時刻だけが異なる場合も内容のハッシュで検証する
+    stat = po_path.stat()
+    write_po(po_path, PO_TEXT.replace("開く", "開け"))
+    os.utime(po_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.load(po_path, "sgpo") is None
+
+    write_po(po_path, PO_TEXT + '\nmsgid "New"\nmsgstr ""\n')
+    assert cache.load(po_path, "sgpo") is None
+
+
+def test_header_taken_before_parse(cache, tmp_path):
+    po_path = write_po(tmp_path / "a.po")
+    header = cache.file_header(po_path, "sgpo")
+    result = parse(po_path)
+
+    # 解析中にファイルが保存された場合、古い解析結果は次回以降使用しない
+    write_po(po_path, PO_TEXT.replace("開く", "開ける"))
+    cache.store(po_path, result, "sgpo", header)
+
+    assert cache.load(po_path, "sgpo") is None
+
+
+def test_corrupted_cache_is_miss(cache, tmp_path):
+    po_path = write_po(tmp_path / "a.po")
+    cache.store(po_path, parse(po_path), "sgpo")
+    cache_file = next(cache.directory.glob("*.bin"))
+    cache_file.write_bytes(cache_file.read_bytes()[:20])
+
+    assert cache.load(po_path, "sgpo") is None
+
+
+def test_lru_eviction(tmp_path):
+    paths = [write_po(tmp_path / f"{i}.po") for i in range(3)]
+    cache = ParseCache(tmp_path / "cache")
+    cache.store(paths[0], parse(paths[0]))
+    entry_size = next(cache.directory.glob("*.bin")).stat().st_size
+    cache.max_size_bytes = entry_size * 2
+
+    cache.store(paths[1], parse(paths[1]))
+    # 0番目を使用して、1番目を最も古くする
+    os.utime(cache._cache_path(paths[1], ""), ns=(0, 0))
+    assert cache.load(paths[0]) is not None
+    cache.store(paths[2], parse(paths[2]))
+
+    assert len(list(cache.directory.glob("*.bin"))) == 2
+    assert cache.load(paths[0]) is not None
+    assert cache.load(paths[1]) is None
+    assert cache.load(paths[2]) is not None
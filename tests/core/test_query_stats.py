@@ -0,0 +1,63 @@
+import json
+
+from sgpo_editor.core.database_accessor import DatabaseAccessor
+from sgpo_editor.models.database import InMemoryEntryStore
+from sgpo_editor.models.query_stats import QueryStatsRecorder
+
+
+def _entries(count):
+    return [
+        {"key": str(i), "msgid": f"msgid {i}", "msgstr": "", "position": i}
+        for i in range(count)
+    ]
+
+
+def test_query_stats_record_counts_rows_and_plans():
+    store = InMemoryEntryStore()
+    store.add_entries_bulk(_entries(10))
+    assert store.get_query_stats() is None
+
+    store.enable_query_stats()
+    for i in range(3):
+        store.get_entry(str(i))
+    DatabaseAccessor(store).get_all_entries()
+    stats = store.get_query_stats()
+    json.dumps(stats)
+
+    by_sql = {item["sql"]: item for item in stats["statements"]}
+    lookup = by_sql["SELECT e.*, d.position FROM entries e LEFT JOIN display_order d "
+                    "ON e.id = d.entry_id WHERE e.key = ?"]
+    assert lookup["count"] == 3
+    assert lookup["rows"] == 3
+    assert lookup["p95_ms"] <= lookup["max_ms"] <= lookup["total_ms"]
+    assert any(line.startswith("SEARCH") for line in lookup["plan"])
+    assert lookup["full_scans"] == []
+
+    scan = by_sql["SELECT * FROM entries"]
+    assert scan["rows"] == 10
+    assert scan["full_scans"] == ["SCAN entries"]
+    assert not any(sql.startswith(("BEGIN", "PRAGMA")) for sql in by_sql)
+
+    store.disable_query_stats()
+    assert store.get_query_stats() is None
+    store.close()
+
+
+def test_query_stats_recorder_can_be_shared_between_stores():
+    recorder = QueryStatsRecorder()
+    first = InMemoryEntryStore()
+    second = InMemoryEntryStore()
+    first.enable_query_stats(recorder)
+    second.enable_query_stats(recorder)
+
+    first.add_entries_bulk(_entries(2))
+    second.add_entries_bulk(_entries(3))
+
+    stats = second.get_query_stats()
+    inserts = [
+        item for item in stats["statements"]
+        if item["sql"].startswith("INSERT INTO display_order")
+    ]
+    assert inserts[0]["count"] == 5
+    first.close()
+    second.close()
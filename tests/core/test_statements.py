@@ -0,0 +1,28 @@
+import pytest
+
+from sgpo_editor.models.statements import (
+    MAX_IN_LIST_SIZE,
+    bucket_size,
+    in_list_chunks,
+    statement,
+)
+
+
+def test_in_list_chunks_pad_to_bucket_size():
+    assert list(in_list_chunks([])) == []
+    assert list(in_list_chunks(["a"])) == [["a"]]
+    assert list(in_list_chunks(["a", "b", "c"])) == [["a", "b", "c", "c"]]
+
+    chunks = list(in_list_chunks([str(i) for i in range(MAX_IN_LIST_SIZE + 3)]))
+    assert [len(chunk) for chunk in chunks] == [MAX_IN_LIST_SIZE, 4]
+    assert chunks[1] == [str(MAX_IN_LIST_SIZE + i) for i in (0, 1, 2, 2)]
+
+    with pytest.raises(ValueError):
+        bucket_size(MAX_IN_LIST_SIZE + 1)
+
+
+def test_statement_returns_same_text_per_shape():
+    sql = statement("entries_by_keys", keys=4)
+    assert sql is statement("entries_by_keys", keys=4)
+    assert sql.count("?") == 4
+    assert statement("entry_by_key") == "SELECT * FROM entries WHERE key = ?"
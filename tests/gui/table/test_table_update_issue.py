@@ -32,6 +32,7 @@ class TestTableUpdateIssue:
         self.mock_entry = MagicMock()
         self.mock_entry.position = 0
         self.mock_entry.key = "entry1"
+        self.mock_entry.entry_number = 1
         self.mock_entry.msgctxt = "context1"
         self.mock_entry.msgid = "source1"
         self.mock_entry.msgstr = "target1"
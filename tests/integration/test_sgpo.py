@@ -1,9 +1,34 @@
 from __future__ import annotations
 
+import contextlib
+import gettext
+import io
+import os
+import pickle
+import shutil
+import subprocess
+import tempfile
 import unittest
 from pathlib import Path
 
-from sgpo.core import KeyTuple, SGPOFile, pofile, pofile_from_text
+import polib
+
+from sgpo import fast_parser
+from sgpo.batch import load_entry_batches, summarize_files
+from sgpo.compact import CompactEntry
+from sgpo.fingerprint import get_fingerprint, peek_fingerprint
+from sgpo.mo_writer import _hash_string
+from sgpo.core import (
+    DiffRecord,
+    DiffStatus,
+    DiffSummary,
+    ImportRecord,
+    KeyTuple,
+    MergeConflict,
+    SGPOFile,
+    pofile,
+    pofile_from_text,
+)
 
 
 def get_test_data_dir() -> Path:
@@ -65,6 +90,187 @@ class TestSgpo(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertEqual(expected_msgstr, result.msgstr)
 
+    def test_find_by_key_after_append_and_remove(self) -> None:
+        po = pofile_from_text(get_key_list_test_data)
+        entry = polib.POEntry(msgctxt="new_key", msgid="new_msgid", msgstr="new")
+
+        po.append(entry)
+        self.assertIs(entry, po.find_by_key("new_key", ""))
+
+        po.remove(entry)
+        self.assertIsNone(po.find_by_key("new_key", ""))
+
+        removed = po.pop(0)
+        self.assertIsNone(po.find_by_key(removed.msgctxt, removed.msgid))
+
+    def test_find_by_key_after_in_place_edit(self) -> None:
+        po = pofile_from_text(get_key_list_test_data)
+        entry = po.find_by_key("context:", "msgid_1")
+
+        entry.msgid = "renamed_msgid"
+        self.assertIsNone(po.find_by_key("context:", "msgid_1"))
+        self.assertIs(entry, po.find_by_key("context:", "renamed_msgid"))
+
+        entry.msgctxt = "unique_key_3"
+        self.assertIsNone(po.find_by_key("context:", "renamed_msgid"))
+        self.assertIs(entry, po.find_by_key("unique_key_3", "any_msgid"))
+
+    def test_find_by_key_returns_first_entry_after_sort(self) -> None:
+        po = pofile_from_text(get_key_list_test_data)
+        po.check_for_duplicates = False
+        po.append(polib.POEntry(msgctxt="unique_key_1", msgid="other"))
+
+        po.sort(reverse=True)
+        expected = next(e for e in po if e.msgctxt == "unique_key_1")
+        self.assertIs(expected, po.find_by_key("unique_key_1", ""))
+
+    def test_find_by_expanded_key(self) -> None:
+        po = pofile_from_text(get_key_list_test_data)
+        grouped = polib.POEntry(msgctxt="dlg.(a|b(c|d)).(title|label)", msgid="T")
+        po.append(grouped)
+
+        self.assertIs(grouped, po.find_by_expanded_key("dlg.a.title"))
+        self.assertIs(grouped, po.find_by_expanded_key("dlg.bd.label"))
+        self.assertIsNone(po.find_by_expanded_key("dlg.b.title"))
+        self.assertIs(
+            po.find_by_key("context:", "msgid_1"),
+            po.find_by_expanded_key("context:", "msgid_1"),
+        )
+
+        # 編集、挿入、削除が展開キーの索引に反映されること
+        grouped.msgctxt = "wnd(Log|Std).:"
+        self.assertIsNone(po.find_by_expanded_key("dlg.a.title"))
+        self.assertIs(grouped, po.find_by_expanded_key("wndStd.:", "T"))
+
+        inserted = polib.POEntry(msgctxt="dlg.(a|e).title", msgid="T")
+        po.insert(0, inserted)
+        self.assertIs(inserted, po.find_by_expanded_key("dlg.e.title"))
+
+        po.remove(grouped)
+        self.assertIsNone(po.find_by_expanded_key("wndLog.:", "T"))
+        self.assertIs(inserted, po.find_by_expanded_key("dlg.a.title"))
+
+    def test_append_duplicate_raises(self) -> None:
+        po = pofile_from_text(get_key_list_test_data)
+
+        with self.assertRaises(ValueError):
+            po.append(polib.POEntry(msgctxt="context:", msgid="msgid_1"))
+
+    def test_fast_parser_matches_from_file(self) -> None:
+        for po_file in sorted(get_test_data_dir().rglob("*.po*")):
+            with self.subTest(po_file=po_file.name):
+                expected = SGPOFile.from_file(str(po_file))
+                actual = fast_parser.parse_file(str(po_file))
+                self.assertEqual(expected.header, actual.header)
+                self.assertEqual(expected.metadata, actual.metadata)
+                self.assertEqual(
+                    [e.__unicode__() for e in expected],
+                    [e.__unicode__() for e in actual],
+                )
+                self.assertEqual(
+                    [e.linenum for e in expected], [e.linenum for e in actual]
+                )
+                self.assertEqual(expected.__unicode__(), actual.__unicode__())
+
+    def test_fast_parser_find_by_key(self) -> None:
+        po = fast_parser.parse_text(get_key_list_test_data)
+
+        self.assertEqual(expected_key_list, po.get_key_list())
+        self.assertEqual("msgstr_2", po.find_by_key("context:", "msgid_2").msgstr)
+
+    def test_fast_parser_falls_back_to_polib(self) -> None:
+        # UTF-8以外の文字コードはpolibで読み込む
+        text = (
+            'msgid ""\nmsgstr ""\n"Content-Type: text/plain; charset=ISO-8859-1\\n"\n\n'
+            'msgctxt "a"\nmsgid "b"\nmsgstr "c"\n'
+        )
+        expected = SGPOFile.from_text(text)
+        actual = fast_parser.parse_text(text)
+        self.assertEqual("ISO-8859-1", actual.encoding)
+        self.assertEqual(expected.__unicode__(), actual.__unicode__())
+
+    def test_fast_parser_duplicate_raises(self) -> None:
+        entry_text = 'msgctxt "a"\nmsgid "b"\nmsgstr ""\n'
+        text = entry_text + "\n" + entry_text
+        with self.assertRaises(ValueError):
+            fast_parser.parse_text(text)
+
+    def test_compact_entries(self) -> None:
+        for po_file in sorted(get_test_data_dir().rglob("*.po*")):
+            with self.subTest(po_file=po_file.name):
+                expected = SGPOFile.from_file(str(po_file))
+                actual = fast_parser.parse_file(str(po_file), compact=True)
+                self.assertTrue(all(type(e) is CompactEntry for e in actual))
+                self.assertEqual(expected.__unicode__(), actual.__unicode__())
+                self.assertEqual(
+                    expected.content_fingerprint(), actual.content_fingerprint()
+                )
+
+                expected.compact()
+                self.assertTrue(all(type(e) is CompactEntry for e in expected))
+                self.assertEqual(actual.__unicode__(), expected.__unicode__())
+
+        po = fast_parser.parse_text(get_key_list_test_data, compact=True)
+        entry = po.find_by_key("unique_key_1", "")
+        original = get_fingerprint(entry)
+        entry.msgctxt = "renamed_key"
+        self.assertIs(entry, po.find_by_key("renamed_key", ""))
+        self.assertIsNone(po.find_by_key("unique_key_1", ""))
+        self.assertNotEqual(original, get_fingerprint(entry))
+
+        restored = pickle.loads(pickle.dumps(po))
+        self.assertEqual(po.__unicode__(), restored.__unicode__())
+        self.assertIs(restored[0], restored.find(restored[0].msgid))
+
+    def test_mo_hash_string(self) -> None:
+        # GNU gettextのhash_string（32ビット）で計算した値
+        self.assertEqual(0, _hash_string(b""))
+        self.assertEqual(7258927, _hash_string(b"hello"))
+        self.assertEqual(145775342, _hash_string(b"menu:\x04Open"))
+        # 32ビットを超える桁上がりが発生する入力
+        self.assertEqual(239, _hash_string(b"\x0f" * 7 + b"\xff"))
+        self.assertEqual(1005443, _hash_string(b"\x0f" * 7 + b"\xffabc"))
+
+    def test_save_mo(self) -> None:
+        po = pofile(str(get_test_data_path("common", "language.po")))
+        po.append(
+            polib.POEntry(
+                msgctxt="plural:",
+                msgid="file",
+                msgid_plural="files",
+                msgstr_plural={0: "ファイル"},
+            )
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            mo_path = os.path.join(tmp_dir, "language.mo")
+            # ハッシュ表を除けばpolibと同じ出力
+            po.save_mo(mo_path, hash_table=False)
+            self.assertEqual(po.to_binary(), Path(mo_path).read_bytes())
+
+            po.save_mo(mo_path)
+            with open(mo_path, "rb") as f:
+                translations = gettext.GNUTranslations(f)
+            for entry in po.translated_entries():
+                if entry.msgid_plural:
+                    actual = translations.npgettext(
+                        entry.msgctxt, entry.msgid, entry.msgid_plural, 1
+                    )
+                    self.assertEqual(entry.msgstr_plural[0], actual)
+                elif entry.msgctxt is not None:
+                    actual = translations.pgettext(entry.msgctxt, entry.msgid)
+                    self.assertEqual(entry.msgstr, actual)
+
+            msgfmt = shutil.which("msgfmt")
+            if msgfmt is not None:
+                po_path = os.path.join(tmp_dir, "language.po")
+                expected_path = os.path.join(tmp_dir, "expected.mo")
+                po.save(po_path)
+                subprocess.run([msgfmt, "-o", expected_path, po_path], check=True)
+                self.assertEqual(
+                    Path(expected_path).read_bytes(), Path(mo_path).read_bytes()
+                )
+
     def test_sort_sgpo(self) -> None:
         normal_po_file = get_test_data_path("sort", "normal_order.po")
         reverse_po_file = get_test_data_path("sort", "reverse_order.po")
@@ -103,6 +309,32 @@ class TestSgpo(unittest.TestCase):
         print(po.get_key_list())
         self.assertEqual(reverse_order_po.get_key_list(), po.get_key_list())
 
+    def test_sort_key_is_recomputed_after_edit(self) -> None:
+        po = pofile_from_text(get_key_list_test_data)
+        po.sort()
+        entry = po.find_by_key("unique_key_2", "")
+
+        entry.msgctxt = "*unique_key_2"
+        po.sort()
+        self.assertIs(entry, po[0])
+
+    def test_insert_sorted_matches_sort(self) -> None:
+        reverse_po_file = get_test_data_path("sort", "reverse_order.po")
+        source = SGPOFile.from_file(str(reverse_po_file))
+        expected = SGPOFile.from_file(str(reverse_po_file))
+        expected.sort()
+
+        po = SGPOFile.from_file(str(reverse_po_file))
+        po.clear()
+        for entry in source:
+            po.insert_sorted(entry)
+
+        self.assertEqual(
+            [e.__unicode__() for e in expected], [e.__unicode__() for e in po]
+        )
+        for entry in po:
+            self.assertIs(entry, po.find_by_key(entry.msgctxt, entry.msgid))
+
     def test_format_sgpo_with_no_header_po(self) -> None:
         po_file = get_test_data_path("format", "formatted.po")
         po_header_less_file = get_test_data_path("format", "header_less.po")
@@ -145,6 +377,34 @@ class TestSgpo(unittest.TestCase):
 
         self.assertEqual(po.__unicode__(), abnormal_order_header_po.__unicode__())
 
+    def test_save_matches_polib_output(self) -> None:
+        po = SGPOFile.from_file(str(get_test_data_path("common", "language.po")))
+        po[1].obsolete = True
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fpath = os.path.join(tmp_dir, "saved.po")
+            po.save(fpath)
+
+            with open(fpath, "rb") as f:
+                self.assertEqual(po.__unicode__().encode("utf-8"), f.read())
+            self.assertEqual(["saved.po"], os.listdir(tmp_dir))
+
+    def test_save_failure_keeps_original_file(self) -> None:
+        po = pofile_from_text(get_key_list_test_data)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fpath = os.path.join(tmp_dir, "saved.po")
+            with open(fpath, "w", encoding="utf-8") as f:
+                f.write("original")
+            po.append(BrokenEntry(msgctxt="broken", msgid="broken"))
+
+            with self.assertRaises(RuntimeError):
+                po.save(fpath)
+
+            with open(fpath, encoding="utf-8") as f:
+                self.assertEqual("original", f.read())
+            self.assertEqual(["saved.po"], os.listdir(tmp_dir))
+
     def test_get_key_list_sgpo(self) -> None:
         pot = pofile_from_text(get_key_list_test_data)
         result = pot.get_key_list()
@@ -297,6 +557,64 @@ class TestSgpo(unittest.TestCase):
 
         self.assertEqual(expected_result.__unicode__(), po.__unicode__())
 
+    def test_import_pot_duplicate_keys(self) -> None:
+        """
+        The pot contains two entries with the same key
+        """
+        pot = pofile_from_text(
+            'msgctxt "dup_key"\nmsgid "first"\nmsgstr ""\n\n'
+            'msgctxt "dup_key"\nmsgid "second"\nmsgstr ""\n'
+        )
+        po = pofile_from_text('msgctxt "other_key"\nmsgid "other"\nmsgstr ""\n')
+
+        report = po.import_pot(pot, verbose=False)
+
+        self.assertEqual([ImportRecord("dup_key", "first")], report.added)
+        self.assertEqual(
+            ["first"], [entry.msgid for entry in po if entry.msgctxt == "dup_key"]
+        )
+
+    def test_import_report(self) -> None:
+        pot = pofile(str(get_test_data_path("import_pot", "case_3_messages.pot")))
+        po = pofile(str(get_test_data_path("import_pot", "case_3_language.po")))
+        po_key_set = set(po.get_key_list())
+        pot_key_set = set(pot.get_key_list())
+
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            report = po.import_pot(pot, verbose=False)
+        self.assertEqual("", stdout.getvalue())
+
+        self.assertEqual(
+            sorted(pot_key_set - po_key_set, key=lambda k: (k.msgctxt, k.msgid)),
+            sorted(
+                (po._po_entry_to_key_tuple(r) for r in report.added),
+                key=lambda k: (k.msgctxt, k.msgid),
+            ),
+        )
+        self.assertEqual(
+            po_key_set - pot_key_set,
+            {po._po_entry_to_key_tuple(r) for r in report.obsoleted},
+        )
+        self.assertEqual(len(report.added), report.counts["added"])
+
+        unknown = pofile_from_text(
+            'msgctxt "unique_key_1"\nmsgid "changed"\nmsgstr ""\n\n'
+            'msgctxt "new_key:"\nmsgid "new"\nmsgstr ""\n'
+        )
+        po = pofile_from_text(get_key_list_test_data)
+        report = po.import_unknown(unknown, verbose=False)
+        original_msgid = po.find_by_key("unique_key_1", "").msgid
+        self.assertEqual(
+            [ImportRecord("unique_key_1", "changed", original_msgid)], report.skipped
+        )
+        self.assertEqual([ImportRecord("new_key:", "new")], report.added)
+
+        stdout = io.StringIO()
+        report.write(stdout)
+        self.assertEqual(report.format(), stdout.getvalue())
+        self.assertIn("1 entries added.", stdout.getvalue())
+
     def test_delete_extracted_comments(self) -> None:
         pot_file = get_test_data_path("delete_extracted_comments", "messages.pot")
         expected_result_file = get_test_data_path(
@@ -397,6 +715,268 @@ msgstr "ハロー"'''
         assert not diff_result.new_entries
         assert not diff_result.removed_entries
 
+    def test_iter_diff_compares_selected_fields(self) -> None:
+        po1 = pofile_from_text(get_key_list_test_data)
+        po2 = pofile_from_text(get_key_list_test_data)
+        po2.find_by_key("context:", "msgid_1").msgstr = "changed"
+        po2.find_by_key("unique_key_1", "").flags = ["fuzzy"]
+        po2.remove(po2.find_by_key("unique_key_2", ""))
+        po2.append(polib.POEntry(msgctxt="new_key", msgid="new", msgstr="new_str"))
+
+        self.assertEqual(
+            [
+                DiffRecord(
+                    DiffStatus.MODIFIED,
+                    "context:",
+                    "msgid_1",
+                    "msgstr_1",
+                    "changed",
+                    ("msgstr",),
+                ),
+                DiffRecord(
+                    DiffStatus.MODIFIED,
+                    "unique_key_1",
+                    "unique_msgid_1",
+                    "unique_msgstr_1",
+                    "unique_msgstr_1",
+                    ("flags",),
+                ),
+                DiffRecord(
+                    DiffStatus.REMOVED,
+                    "unique_key_2",
+                    "unique_msgid_2",
+                    old_value="unique_msgstr_2",
+                ),
+                DiffRecord(DiffStatus.NEW, "new_key", "new", new_value="new_str"),
+            ],
+            list(po1.iter_diff(po2, fields=("msgstr", "flags"))),
+        )
+        self.assertEqual(
+            DiffSummary(new=1, removed=1, modified=1), po1.diff_summary(po2)
+        )
+        self.assertEqual(
+            DiffSummary(new=1, removed=1, modified=2),
+            po1.diff_summary(po2, fields=("msgstr", "flags")),
+        )
+
+        diff_result = po1.diff(po2)
+        self.assertEqual(["new_key"], [e.key.msgctxt for e in diff_result.new_entries])
+        self.assertEqual(
+            ["unique_key_2"], [e.key.msgctxt for e in diff_result.removed_entries]
+        )
+        self.assertEqual(
+            ["context:"], [e.key.msgctxt for e in diff_result.modified_entries]
+        )
+
+    def test_iter_diff_rejects_unknown_field(self) -> None:
+        po = pofile_from_text(get_key_list_test_data)
+
+        with self.assertRaises(ValueError):
+            list(po.iter_diff(po, fields=("msgid",)))
+
+    def test_merge3_resolves_one_sided_changes(self) -> None:
+        base = pofile_from_text(get_key_list_test_data)
+        ours = pofile_from_text(get_key_list_test_data)
+        theirs = pofile_from_text(get_key_list_test_data)
+
+        ours.find_by_key("context:", "msgid_1").msgstr = "ours_1"
+        theirs.find_by_key("context:", "msgid_2").msgstr = "theirs_2"
+        theirs.find_by_key("context:", "msgid_2").flags = ["fuzzy"]
+        ours.find_by_key("unique_key_1", "").flags = ["c-format"]
+        theirs.find_by_key("unique_key_1", "").flags = ["fuzzy"]
+        theirs.remove(theirs.find_by_key("unique_key_2", ""))
+        theirs.append(polib.POEntry(msgctxt="new_key", msgid="new", msgstr="new"))
+
+        merged, conflicts = SGPOFile.merge3(base, ours, theirs)
+
+        self.assertEqual([], conflicts)
+        self.assertEqual(
+            [
+                KeyTuple(msgctxt="context:", msgid="msgid_1"),
+                KeyTuple(msgctxt="context:", msgid="msgid_2"),
+                KeyTuple(msgctxt="unique_key_1", msgid=""),
+                KeyTuple(msgctxt="new_key", msgid=""),
+            ],
+            merged.get_key_list(),
+        )
+        self.assertEqual("ours_1", merged.find_by_key("context:", "msgid_1").msgstr)
+        msgid_2 = merged.find_by_key("context:", "msgid_2")
+        self.assertEqual(("theirs_2", ["fuzzy"]), (msgid_2.msgstr, msgid_2.flags))
+        self.assertEqual(
+            ["c-format", "fuzzy"], merged.find_by_key("unique_key_1", "").flags
+        )
+        # 入力のPOファイルは変更されない
+        self.assertEqual([], ours.find_by_key("context:", "msgid_2").flags)
+
+    def test_merge3_reports_conflicts(self) -> None:
+        base = pofile_from_text(get_key_list_test_data)
+        ours = pofile_from_text(get_key_list_test_data)
+        theirs = pofile_from_text(get_key_list_test_data)
+
+        ours.find_by_key("context:", "msgid_1").msgstr = "ours_1"
+        theirs.find_by_key("context:", "msgid_1").msgstr = "theirs_1"
+        ours.find_by_key("unique_key_2", "").msgstr = "ours_2"
+        theirs.remove(theirs.find_by_key("unique_key_2", ""))
+
+        merged, conflicts = SGPOFile.merge3(base, ours, theirs)
+
+        self.assertEqual(
+            [
+                MergeConflict(
+                    "content",
+                    "context:",
+                    "msgid_1",
+                    "msgstr",
+                    "msgstr_1",
+                    "ours_1",
+                    "theirs_1",
+                ),
+                MergeConflict(
+                    "deleted_in_theirs",
+                    "unique_key_2",
+                    "unique_msgid_2",
+                    None,
+                    "unique_msgstr_2",
+                    "ours_2",
+                    None,
+                ),
+            ],
+            conflicts,
+        )
+        self.assertEqual("ours_1", merged.find_by_key("context:", "msgid_1").msgstr)
+        self.assertEqual("ours_2", merged.find_by_key("unique_key_2", "").msgstr)
+
+    def test_merge3_merges_occurrences_and_previous_msgid_plural(self) -> None:
+        base = pofile_from_text(get_key_list_test_data)
+        ours = pofile_from_text(get_key_list_test_data)
+        theirs = pofile_from_text(get_key_list_test_data)
+        for po in (base, ours):
+            po.find_by_key("context:", "msgid_1").occurrences = [("f.c", "1")]
+
+        entry = theirs.find_by_key("context:", "msgid_1")
+        entry.occurrences = [("f.c", "2")]
+        entry.previous_msgid_plural = "old_plural"
+
+        merged, conflicts = SGPOFile.merge3(base, ours, theirs)
+
+        self.assertEqual([], conflicts)
+        merged_entry = merged.find_by_key("context:", "msgid_1")
+        self.assertEqual([("f.c", "2")], merged_entry.occurrences)
+        self.assertEqual("old_plural", merged_entry.previous_msgid_plural)
+
+    def test_merge3_reports_occurrences_change_deleted_in_theirs(self) -> None:
+        base = pofile_from_text(get_key_list_test_data)
+        ours = pofile_from_text(get_key_list_test_data)
+        theirs = pofile_from_text(get_key_list_test_data)
+
+        ours.find_by_key("unique_key_2", "").occurrences = [("f.c", "1")]
+        theirs.remove(theirs.find_by_key("unique_key_2", ""))
+
+        merged, conflicts = SGPOFile.merge3(base, ours, theirs)
+
+        self.assertEqual(
+            [
+                MergeConflict(
+                    "deleted_in_theirs",
+                    "unique_key_2",
+                    "unique_msgid_2",
+                    None,
+                    "unique_msgstr_2",
+                    "unique_msgstr_2",
+                    None,
+                )
+            ],
+            conflicts,
+        )
+        self.assertEqual(
+            [("f.c", "1")], merged.find_by_key("unique_key_2", "").occurrences
+        )
+
+    def test_fingerprint_tracks_entry_changes(self) -> None:
+        po = pofile_from_text(get_key_list_test_data)
+        entry = po.find_by_key("context:", "msgid_1")
+        original = get_fingerprint(entry)
+        self.assertEqual(original, peek_fingerprint(entry))
+
+        entry.msgstr = "changed"
+        self.assertIsNone(peek_fingerprint(entry))
+        changed = get_fingerprint(entry)
+        self.assertNotEqual(original, changed)
+
+        entry.flags.append("fuzzy")
+        self.assertIsNone(peek_fingerprint(entry))
+        self.assertNotEqual(changed, get_fingerprint(entry))
+
+        entry.msgstr = "msgstr_1"
+        entry.flags.remove("fuzzy")
+        self.assertEqual(original, get_fingerprint(entry))
+
+    def test_content_fingerprint_and_changed_entries(self) -> None:
+        po1 = pofile_from_text(get_key_list_test_data)
+        po2 = fast_parser.parse_text(get_key_list_test_data)
+        self.assertEqual(po1.content_fingerprint(), po2.content_fingerprint())
+        self.assertEqual([], po1.changed_entries(po2))
+
+        po2.find_by_key("unique_key_1", "").tcomment = "comment"
+        self.assertNotEqual(po1.content_fingerprint(), po2.content_fingerprint())
+        self.assertEqual(
+            [po2.find_by_key("unique_key_1", "")], po2.changed_entries(po1)
+        )
+
+        po2.metadata["Language"] = "en"
+        po2.find_by_key("unique_key_1", "").tcomment = ""
+        self.assertNotEqual(po1.content_fingerprint(), po2.content_fingerprint())
+
+    def test_summarize_files(self) -> None:
+        po_files = [
+            get_test_data_path("format", "formatted.po"),
+            get_test_data_path("format", "header_less.po"),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            broken = Path(tmpdir, "broken.po")
+            broken.write_text('msgid "a"\nmsgid "b"\n', encoding="utf-8")
+            summaries = list(summarize_files(po_files + [broken], max_workers=2))
+
+        self.assertEqual(
+            [str(p) for p in po_files + [broken]], [s.path for s in summaries]
+        )
+        for po_file, summary in zip(po_files, summaries):
+            po = pofile(str(po_file))
+            self.assertIsNone(summary.error)
+            self.assertEqual(len(po), summary.total)
+            self.assertEqual(len(po.translated_entries()), summary.translated)
+            self.assertEqual(len(po.untranslated_entries()), summary.untranslated)
+            self.assertEqual(len(po.fuzzy_entries()), summary.fuzzy)
+            self.assertEqual(po.percent_translated(), summary.percent_translated)
+            self.assertEqual(tuple(po.check_duplicates()), summary.duplicates)
+            self.assertEqual(po.content_fingerprint(), summary.fingerprint)
+        self.assertFalse(summaries[0].needs_format)
+        self.assertTrue(summaries[1].needs_format)
+        self.assertIsNotNone(summaries[2].error)
+
+    def test_load_entry_batches(self) -> None:
+        po_files = sorted(get_test_data_path("sort").glob("*.po"))
+        batches = list(load_entry_batches(po_files, batch_size=2, max_workers=2))
+
+        for po_file in po_files:
+            with self.subTest(po_file=po_file.name):
+                po = pofile(str(po_file))
+                file_batches = [b for b in batches if b.path == str(po_file)]
+                self.assertTrue(all(len(b.entries) <= 2 for b in file_batches))
+                self.assertEqual(
+                    list(range(0, len(po), 2)), [b.start for b in file_batches]
+                )
+                records = [r for b in file_batches for r in b.entries]
+                self.assertEqual(
+                    [e.__unicode__() for e in po],
+                    [r.to_poentry().__unicode__() for r in records],
+                )
+
+
+class BrokenEntry(polib.POEntry):
+    def __unicode__(self, wrapwidth=78):
+        raise RuntimeError("serialization failed")
+
 
 # ====== Test data ====
 get_key_list_test_data = '''#
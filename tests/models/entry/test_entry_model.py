@@ -48,6 +48,12 @@ class TestEntryModel(unittest.TestCase):
         self.assertEqual(entry.position, 1)
         self.assertFalse(entry.obsolete)
 
+    def test_entry_number(self):
+        # エントリ番号はキーから求め、並べ替え用のpositionには依存しない
+        entry = EntryModel(key="3", msgid="test", position=4096)
+        self.assertEqual(entry.entry_number, 3)
+        self.assertIsNone(EntryModel(key="context\x04test", msgid="test").entry_number)
+
     def test_is_translated_property(self):
         # is_translatedプロパティのテスト
         entry1 = EntryModel(msgid="test", msgstr="")
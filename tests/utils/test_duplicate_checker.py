@@ -77,3 +77,72 @@ def test_expand_msgctxt():
 
     expanded = _expand_msgctxt("wnd(Log|Project|Std|).:")
     assert set(expanded) == {"wndLog.:", "wndProject.:", "wndStd.:"}
+
+    # 複数のグループと入れ子のグループ
+    assert _expand_msgctxt("(a|b).(c|d)") == ["a.c", "a.d", "b.c", "b.d"]
+    assert _expand_msgctxt("x(a|b(c|d))y") == ["xay", "xbcy", "xbdy"]
+    # 括弧の対応が取れていない場合は展開しない
+    assert _expand_msgctxt("wnd(Log.:") == ["wnd(Log.:"]
+
+
+def test_check_duplicates_matches_pairwise_comparison():
+    """転置インデックスによる検出結果が総当たりの結果と一致すること"""
+    from sgpo.duplicate_checker import _has_msgctxt_overlap
+
+    po_text = """
+msgctxt "wnd(Log|Project|).:"
+msgid "Continue"
+msgstr "続ける"
+
+msgctxt "wndProject.:"
+msgid "Continue"
+msgstr "続ける"
+
+msgctxt "wnd(Std|Log).:"
+msgid "Continue"
+msgstr "続ける"
+
+msgctxt "wndLog.:"
+msgid "Abort"
+msgstr "中止"
+
+msgctxt "wnd(Log|Std).:"
+msgid "Abort"
+msgstr "中止"
+"""
+    po = pofile_from_text(po_text)
+    expected = [
+        (entry1.msgctxt, entry2.msgctxt, entry1.msgid)
+        for i, entry1 in enumerate(po)
+        for j, entry2 in enumerate(po)
+        if i < j
+        and entry1.msgid == entry2.msgid
+        and _has_msgctxt_overlap(entry1.msgctxt, entry2.msgctxt)
+    ]
+
+    duplicates = po.check_duplicates()
+
+    assert [(d.msgctxt1, d.msgctxt2, d.msgid) for d in duplicates] == expected
+
+
+def test_iter_duplicates_yields_same_duplicates():
+    """ストリーミング版が同じ重複を返すこと"""
+    po_text = """
+msgctxt "wnd(Log|Project|).:"
+msgid "Continue"
+msgstr "続ける"
+
+msgctxt "wndLog.:"
+msgid "Continue"
+msgstr "続ける"
+
+msgctxt "wnd(Project|Std).:"
+msgid "Continue"
+msgstr "続ける"
+"""
+    po = pofile_from_text(po_text)
+
+    streamed = list(po.iter_duplicates())
+
+    assert len(streamed) == 2
+    assert set(streamed) == set(po.check_duplicates())